@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, desc, and_
 from typing import List, Optional
 from datetime import datetime, timedelta
 import time
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.models.analytics_event import AnalyticsEvent
+from app.repositories import AnalyticsEventRepository
 from app.schemas.analytics import (
     AnalyticsEventCreate, 
     AnalyticsEventBatch, 
@@ -14,10 +16,16 @@ from app.schemas.analytics import (
     BatchProcessResponse,
     AnalyticsStatsResponse
 )
-from app.api.websocket import manager
+from app.api.websocket import manager, live_event_fields, record_live_event
+from app.core.live_aggregates import live_aggregator, load_dashboard_aggregates
+from shared.repositories.repository_factory import AsyncRepositoryFactory
 
 router = APIRouter(prefix="/api/v1/analytics", tags=["analytics"])
 
+def get_event_repository(db: AsyncSession = Depends(get_async_db)) -> AnalyticsEventRepository:
+    """Async event repository on a request-scoped AsyncSession"""
+    return AsyncRepositoryFactory(db).create_repository(AnalyticsEventRepository, AnalyticsEvent)
+
 @router.post("/batch", response_model=BatchProcessResponse)
 async def process_event_batch(
     batch: AnalyticsEventBatch,
@@ -28,6 +36,7 @@ async def process_event_batch(
     start_time = time.time()
     processed_events = 0
     failed_events = 0
+    ingested_events = []
     
     try:
         for event_data in batch.events:
@@ -53,6 +62,7 @@ async def process_event_batch(
                 )
                 
                 db.add(db_event)
+                ingested_events.append(live_event_fields(db_event))
                 processed_events += 1
                 
             except Exception as e:
@@ -62,6 +72,10 @@ async def process_event_batch(
         # Commit all events in the batch
         db.commit()
         
+        # Update live dashboard counters
+        for live_event in ingested_events:
+            record_live_event(live_event)
+        
         processing_time_ms = int((time.time() - start_time) * 1000)
         
         # Notify connected clients about batch processing (background task)
@@ -88,11 +102,11 @@ async def process_event_batch(
 @router.post("/events", response_model=AnalyticsEventResponse)
 async def create_event(
     event: AnalyticsEventCreate,
-    db: Session = Depends(get_db)
+    events: AnalyticsEventRepository = Depends(get_event_repository)
 ):
     """Create a single analytics event"""
     try:
-        db_event = AnalyticsEvent(
+        db_event = await events.create(dict(
             event_id=event.event_id,
             tenant_id=event.tenant_id,
             user_id=event.user_id,
@@ -108,16 +122,15 @@ async def create_event(
             correlation_id=event.correlation_id,
             created_at=datetime.utcnow(),
             processed_at=datetime.utcnow()
-        )
+        ))
         
-        db.add(db_event)
-        db.commit()
-        db.refresh(db_event)
+        # Async sessions do not expire on commit, so the instance is still loaded
+        record_live_event(live_event_fields(db_event))
         
         return AnalyticsEventResponse.from_orm(db_event)
         
     except Exception as e:
-        db.rollback()
+        await events.db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create event: {str(e)}")
 
 @router.get("/events", response_model=List[AnalyticsEventResponse])
@@ -130,32 +143,22 @@ async def get_events(
     end_date: Optional[datetime] = Query(None, description="End date filter"),
     limit: int = Query(100, ge=1, le=1000, description="Number of events to return"),
     offset: int = Query(0, ge=0, description="Number of events to skip"),
-    db: Session = Depends(get_db)
+    events: AnalyticsEventRepository = Depends(get_event_repository)
 ):
     """Get analytics events with filtering"""
     try:
-        query = db.query(AnalyticsEvent).filter(AnalyticsEvent.tenant_id == tenant_id)
-        
-        # Apply filters
-        if user_id:
-            query = query.filter(AnalyticsEvent.user_id == user_id)
-        
-        if event_name:
-            query = query.filter(AnalyticsEvent.event_name == event_name)
-            
-        if event_category:
-            query = query.filter(AnalyticsEvent.event_category == event_category)
-            
-        if start_date:
-            query = query.filter(AnalyticsEvent.timestamp >= start_date)
-            
-        if end_date:
-            query = query.filter(AnalyticsEvent.timestamp <= end_date)
-        
-        # Order by timestamp (newest first) and apply pagination
-        events = query.order_by(desc(AnalyticsEvent.timestamp)).offset(offset).limit(limit).all()
+        db_events = await events.list_events(
+            tenant_id,
+            user_id=user_id,
+            event_name=event_name,
+            event_category=event_category,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            offset=offset
+        )
         
-        return [AnalyticsEventResponse.from_orm(event) for event in events]
+        return [AnalyticsEventResponse.from_orm(event) for event in db_events]
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve events: {str(e)}")
@@ -251,73 +254,21 @@ async def get_dashboard_data(
 ):
     """Get comprehensive dashboard data"""
     try:
-        # Get various time periods
         now = datetime.utcnow()
-        last_24h = now - timedelta(hours=24)
-        last_7d = now - timedelta(days=7)
-        last_30d = now - timedelta(days=30)
-        
-        # Events by day (last 7 days)
-        daily_events = db.query(
-            func.date(AnalyticsEvent.timestamp).label('date'),
-            func.count(AnalyticsEvent.id).label('count')
-        ).filter(
-            and_(
-                AnalyticsEvent.tenant_id == tenant_id,
-                AnalyticsEvent.timestamp >= last_7d
-            )
-        ).group_by(func.date(AnalyticsEvent.timestamp)).order_by('date').all()
-        
-        # Events by category (last 30 days)
-        category_events = db.query(
-            AnalyticsEvent.event_category,
-            func.count(AnalyticsEvent.id).label('count')
-        ).filter(
-            and_(
-                AnalyticsEvent.tenant_id == tenant_id,
-                AnalyticsEvent.timestamp >= last_30d
-            )
-        ).group_by(AnalyticsEvent.event_category).order_by(desc('count')).all()
-        
-        # Device types (last 30 days)
-        device_types = db.query(
-            func.json_extract_path_text(AnalyticsEvent.device_info, 'device_type').label('device_type'),
-            func.count(AnalyticsEvent.id).label('count')
-        ).filter(
-            and_(
-                AnalyticsEvent.tenant_id == tenant_id,
-                AnalyticsEvent.timestamp >= last_30d
-            )
-        ).group_by('device_type').order_by(desc('count')).all()
-        
-        # Active users (last 24h)
-        active_users_24h = db.query(func.count(func.distinct(AnalyticsEvent.user_id))).filter(
-            and_(
-                AnalyticsEvent.tenant_id == tenant_id,
-                AnalyticsEvent.timestamp >= last_24h
-            )
-        ).scalar() or 0
+        dashboard = load_dashboard_aggregates(db, tenant_id, now)
+        live_aggregator.hydrate(tenant_id, dashboard)
         
         return {
             "tenant_id": tenant_id,
             "generated_at": now.isoformat(),
             "summary": {
-                "active_users_24h": active_users_24h,
-                "total_events_7d": sum(row.count for row in daily_events),
+                "active_users_24h": dashboard["active_users_24h"],
+                "total_events_7d": sum(row["count"] for row in dashboard["daily_events"]),
                 "websocket_connections": manager.get_active_connections_count(tenant_id)
             },
-            "daily_events": [
-                {"date": row.date.isoformat(), "count": row.count}
-                for row in daily_events
-            ],
-            "category_breakdown": [
-                {"category": row.event_category or "uncategorized", "count": row.count}
-                for row in category_events
-            ],
-            "device_breakdown": [
-                {"device_type": row.device_type or "unknown", "count": row.count}
-                for row in device_types
-            ]
+            "daily_events": dashboard["daily_events"],
+            "category_breakdown": dashboard["category_breakdown"],
+            "device_breakdown": dashboard["device_breakdown"]
         }
         
     except Exception as e:
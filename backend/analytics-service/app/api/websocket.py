@@ -9,6 +9,7 @@ from datetime import datetime
 from app.core.database import get_db
 from app.models.analytics_event import AnalyticsEvent
 from app.schemas.analytics import AnalyticsEventCreate, WebSocketMessage, HeartbeatMessage
+from app.core.live_aggregates import live_aggregator, load_dashboard_aggregates
 
 class ConnectionManager:
     def __init__(self):
@@ -16,6 +17,8 @@ class ConnectionManager:
         self.active_connections: Dict[str, Dict[str, WebSocket]] = {}
         # Connection metadata: {connection_id: {tenant_id, user_id, connected_at}}
         self.connection_metadata: Dict[str, Dict] = {}
+        # Live dashboard subscribers: {tenant_id: {connection_id}}
+        self.dashboard_subscribers: Dict[str, Set[str]] = {}
 
     async def connect(self, websocket: WebSocket, tenant_id: str, user_id: str = None):
         """Accept WebSocket connection and register it"""
@@ -62,6 +65,8 @@ class ConnectionManager:
                 if not self.active_connections[tenant_id]:
                     del self.active_connections[tenant_id]
             
+            self.unsubscribe_dashboard(connection_id)
+            
             # Remove metadata
             del self.connection_metadata[connection_id]
             
@@ -97,6 +102,40 @@ class ConnectionManager:
             for connection_id in disconnected_connections:
                 self.disconnect(connection_id)
 
+    def subscribe_dashboard(self, connection_id: str):
+        """Register a connection for live dashboard deltas"""
+        if connection_id in self.connection_metadata:
+            tenant_id = self.connection_metadata[connection_id]["tenant_id"]
+            self.dashboard_subscribers.setdefault(tenant_id, set()).add(connection_id)
+
+    def unsubscribe_dashboard(self, connection_id: str):
+        """Stop sending live dashboard deltas to a connection"""
+        if connection_id in self.connection_metadata:
+            tenant_id = self.connection_metadata[connection_id]["tenant_id"]
+            subscribers = self.dashboard_subscribers.get(tenant_id)
+            if subscribers is not None:
+                subscribers.discard(connection_id)
+                if not subscribers:
+                    del self.dashboard_subscribers[tenant_id]
+
+    async def send_to_dashboard_subscribers(self, message: dict, tenant_id: str):
+        """Send message to the dashboard subscribers of a tenant"""
+        payload = json.dumps(message)
+        disconnected_connections = []
+        
+        for connection_id in list(self.dashboard_subscribers.get(tenant_id, ())):
+            websocket = self.active_connections.get(tenant_id, {}).get(connection_id)
+            if websocket is None:
+                continue
+            try:
+                await websocket.send_text(payload)
+            except Exception as e:
+                print(f"Failed to send message to {connection_id}: {e}")
+                disconnected_connections.append(connection_id)
+        
+        for connection_id in disconnected_connections:
+            self.disconnect(connection_id)
+
     async def broadcast(self, message: dict):
         """Send message to all active connections"""
         for tenant_id in list(self.active_connections.keys()):
@@ -120,12 +159,47 @@ class ConnectionManager:
         return {
             "total_connections": total_connections,
             "tenant_connections": tenant_stats,
-            "active_tenants": len(self.active_connections)
+            "active_tenants": len(self.active_connections),
+            "dashboard_subscribers": sum(len(s) for s in self.dashboard_subscribers.values())
         }
 
 # Global connection manager
 manager = ConnectionManager()
 
+def live_event_fields(db_event: AnalyticsEvent) -> dict:
+    """Fields the live counters need, read before commit expires the instance"""
+    return {
+        "tenant_id": str(db_event.tenant_id),
+        "timestamp": db_event.timestamp,
+        "event_category": db_event.event_category,
+        "device_info": db_event.device_info,
+        "user_id": db_event.user_id
+    }
+
+def record_live_event(event: dict):
+    """Feed a persisted event (see live_event_fields) into the live dashboard counters"""
+    try:
+        live_aggregator.record_event(**event)
+    except Exception as e:
+        print(f"Failed to update live aggregates: {e}")
+
+async def subscribe_dashboard(connection_id: str, tenant_id: str, db: Session):
+    """Subscribe a connection to live dashboard deltas and send the current snapshot"""
+    if not live_aggregator.is_hydrated(tenant_id):
+        dashboard = load_dashboard_aggregates(db, tenant_id, datetime.utcnow())
+        live_aggregator.hydrate(tenant_id, dashboard)
+    
+    # Deliver pending changes to existing subscribers first so the new
+    # snapshot and the next delta never count the same events twice
+    delta = live_aggregator.flush(tenant_id)
+    if delta:
+        await manager.send_to_dashboard_subscribers(delta, tenant_id)
+    
+    manager.subscribe_dashboard(connection_id)
+    snapshot = live_aggregator.snapshot(tenant_id)
+    snapshot["summary"]["websocket_connections"] = manager.get_active_connections_count(tenant_id)
+    await manager.send_personal_message(snapshot, connection_id)
+
 async def process_analytics_event(event_data: dict, db: Session, connection_id: str):
     """Process analytics event received via WebSocket"""
     try:
@@ -150,10 +224,13 @@ async def process_analytics_event(event_data: dict, db: Session, connection_id:
             created_at=datetime.utcnow()
         )
         
+        live_event = live_event_fields(db_event)
         db.add(db_event)
         db.commit()
         db.refresh(db_event)
         
+        record_live_event(live_event)
+        
         # Send acknowledgment
         await manager.send_personal_message({
             "type": "event_processed",
@@ -206,6 +283,12 @@ async def websocket_endpoint(websocket: WebSocket, tenant_id: str, user_id: str
                     event_data = message.get("data", {})
                     await process_analytics_event(event_data, db, connection_id)
                     
+                elif message_type == "subscribe_dashboard":
+                    await subscribe_dashboard(connection_id, tenant_id, db)
+                    
+                elif message_type == "unsubscribe_dashboard":
+                    manager.unsubscribe_dashboard(connection_id)
+                    
                 elif message_type == "ping":
                     await manager.send_personal_message({
                         "type": "pong",
@@ -253,3 +336,24 @@ async def cleanup_stale_connections():
         
         # Run cleanup every 60 seconds
         await asyncio.sleep(60)
+
+# Background task to push live dashboard deltas
+async def push_dashboard_deltas():
+    """Push throttled dashboard deltas to subscribed connections"""
+    last_expiry = datetime.utcnow()
+    
+    while True:
+        try:
+            deltas = live_aggregator.collect_deltas(list(manager.dashboard_subscribers.keys()))
+            for tenant_id, delta in deltas.items():
+                await manager.send_to_dashboard_subscribers(delta, tenant_id)
+            
+            # Expire windows of tenants nobody is watching
+            if (datetime.utcnow() - last_expiry).total_seconds() >= 60:
+                live_aggregator.expire_all()
+                last_expiry = datetime.utcnow()
+                
+        except Exception as e:
+            print(f"Error in dashboard push task: {e}")
+        
+        await asyncio.sleep(live_aggregator.push_interval / 2)
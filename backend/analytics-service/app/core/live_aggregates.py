@@ -0,0 +1,396 @@
+from collections import Counter, deque
+from datetime import date, datetime, timedelta
+from typing import Any, Deque, Dict, Optional, Tuple
+import os
+import time
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from app.models.analytics_event import AnalyticsEvent
+
+# Sliding window configuration (mirrors the ranges used by /dashboard)
+MINUTE_WINDOW = int(os.getenv("LIVE_AGGREGATES_MINUTE_WINDOW", "60"))
+DAILY_WINDOW_DAYS = 7
+BREAKDOWN_WINDOW_DAYS = 30
+ACTIVE_USER_WINDOW = timedelta(hours=24)
+
+# Minimum interval between two pushes to the same tenant
+PUSH_INTERVAL_SECONDS = float(os.getenv("LIVE_AGGREGATES_PUSH_INTERVAL", "2.0"))
+
+
+class TenantAggregates:
+    """Sliding-window counters for a single tenant.
+
+    Counters are bucketed per minute (recent activity) and per day
+    (daily totals, category and device breakdowns). Running totals are kept
+    for the 30 day breakdowns so that ingesting an event and expiring a day
+    are both O(1) with respect to the number of stored events.
+    """
+
+    def __init__(self, tenant_id: str):
+        self.tenant_id = tenant_id
+        self.minute_buckets: Deque[Tuple[int, int]] = deque()
+        self.daily_counts: Dict[date, int] = {}
+        self.category_by_day: Dict[date, Counter] = {}
+        self.device_by_day: Dict[date, Counter] = {}
+        self.category_totals: Counter = Counter()
+        self.device_totals: Counter = Counter()
+        self.user_last_seen: Dict[str, datetime] = {}
+        self.hydrated = False
+        self.last_expired_minute = 0
+
+        # Changes accumulated since the last push
+        self.pending: Counter = Counter()
+        self.pending_categories: Counter = Counter()
+        self.pending_devices: Counter = Counter()
+        self.pending_days: Counter = Counter()
+        self.pending_minutes: Counter = Counter()
+        self.last_push = 0.0
+
+    def record(self, timestamp: datetime, category: Optional[str], device_type: Optional[str],
+               user_id: Optional[str], now: datetime) -> bool:
+        """Apply a single event to the counters; returns False if it falls outside the window"""
+        day = timestamp.date()
+        if day <= (now - timedelta(days=BREAKDOWN_WINDOW_DAYS)).date():
+            return False
+
+        category = category or "uncategorized"
+        device_type = device_type or "unknown"
+
+        self.category_by_day.setdefault(day, Counter())[category] += 1
+        self.device_by_day.setdefault(day, Counter())[device_type] += 1
+        self.category_totals[category] += 1
+        self.device_totals[device_type] += 1
+        self.pending_categories[category] += 1
+        self.pending_devices[device_type] += 1
+
+        if day > (now - timedelta(days=DAILY_WINDOW_DAYS)).date():
+            self.daily_counts[day] = self.daily_counts.get(day, 0) + 1
+            self.pending_days[day] += 1
+
+        minute = int(timestamp.timestamp() // 60)
+        if minute > int(now.timestamp() // 60) - MINUTE_WINDOW:
+            self._add_minute(minute)
+            self.pending_minutes[minute] += 1
+
+        if user_id and now - timestamp <= ACTIVE_USER_WINDOW:
+            last_seen = self.user_last_seen.get(user_id)
+            if last_seen is None or timestamp > last_seen:
+                self.user_last_seen[user_id] = timestamp
+
+        self.pending["events"] += 1
+        return True
+
+    def _add_minute(self, minute: int):
+        """Increment a minute bucket, keeping buckets ordered by minute"""
+        if self.minute_buckets and self.minute_buckets[-1][0] == minute:
+            bucket_minute, count = self.minute_buckets.pop()
+            self.minute_buckets.append((bucket_minute, count + 1))
+        elif not self.minute_buckets or self.minute_buckets[-1][0] < minute:
+            self.minute_buckets.append((minute, 1))
+        else:
+            # Late event: rebuild in order (rare, bounded by MINUTE_WINDOW)
+            buckets = dict(self.minute_buckets)
+            buckets[minute] = buckets.get(minute, 0) + 1
+            self.minute_buckets = deque(sorted(buckets.items()))
+
+    def expire(self, now: datetime):
+        """Drop buckets that slid out of their windows (at most once per minute)"""
+        current_minute = int(now.timestamp() // 60)
+        if current_minute == self.last_expired_minute:
+            return
+        self.last_expired_minute = current_minute
+
+        oldest_minute = current_minute - MINUTE_WINDOW
+        while self.minute_buckets and self.minute_buckets[0][0] <= oldest_minute:
+            self.minute_buckets.popleft()
+        # Pending changes are only drained by take_delta, which never runs
+        # for tenants without subscribers, so they slide out here as well
+        for minute in [m for m in self.pending_minutes if m <= oldest_minute]:
+            del self.pending_minutes[minute]
+
+        daily_cutoff = (now - timedelta(days=DAILY_WINDOW_DAYS)).date()
+        for day in [d for d in self.daily_counts if d <= daily_cutoff]:
+            del self.daily_counts[day]
+        for day in [d for d in self.pending_days if d <= daily_cutoff]:
+            del self.pending_days[day]
+
+        breakdown_cutoff = (now - timedelta(days=BREAKDOWN_WINDOW_DAYS)).date()
+        for day in [d for d in self.category_by_day if d <= breakdown_cutoff]:
+            self.category_totals -= self.category_by_day.pop(day)
+        for day in [d for d in self.device_by_day if d <= breakdown_cutoff]:
+            self.device_totals -= self.device_by_day.pop(day)
+
+        user_cutoff = now - ACTIVE_USER_WINDOW
+        if self.user_last_seen:
+            self.user_last_seen = {
+                user_id: last_seen
+                for user_id, last_seen in self.user_last_seen.items()
+                if last_seen >= user_cutoff
+            }
+
+    def has_pending(self) -> bool:
+        return bool(self.pending)
+
+    def take_delta(self, now: datetime) -> Dict[str, Any]:
+        """Return and reset the changes accumulated since the last push"""
+        delta = {
+            "type": "dashboard_delta",
+            "tenant_id": self.tenant_id,
+            "events": self.pending["events"],
+            "daily_events": [
+                {"date": day.isoformat(), "count": count}
+                for day, count in sorted(self.pending_days.items())
+            ],
+            "category_breakdown": [
+                {"category": category, "count": count}
+                for category, count in self.pending_categories.items()
+            ],
+            "device_breakdown": [
+                {"device_type": device_type, "count": count}
+                for device_type, count in self.pending_devices.items()
+            ],
+            "per_minute": [
+                {"minute": minute * 60 * 1000, "count": count}
+                for minute, count in sorted(self.pending_minutes.items())
+            ],
+            "active_users_24h": len(self.user_last_seen),
+            "timestamp": int(now.timestamp() * 1000)
+        }
+
+        self.pending = Counter()
+        self.pending_categories = Counter()
+        self.pending_devices = Counter()
+        self.pending_days = Counter()
+        self.pending_minutes = Counter()
+        self.last_push = time.monotonic()
+        return delta
+
+    def snapshot(self, now: datetime) -> Dict[str, Any]:
+        """Full dashboard view, shaped like the /dashboard response"""
+        return {
+            "type": "dashboard_snapshot",
+            "tenant_id": self.tenant_id,
+            "generated_at": now.isoformat(),
+            "summary": {
+                "active_users_24h": len(self.user_last_seen),
+                "total_events_7d": sum(self.daily_counts.values())
+            },
+            "daily_events": [
+                {"date": day.isoformat(), "count": count}
+                for day, count in sorted(self.daily_counts.items())
+            ],
+            "category_breakdown": [
+                {"category": category, "count": count}
+                for category, count in self.category_totals.most_common()
+            ],
+            "device_breakdown": [
+                {"device_type": device_type, "count": count}
+                for device_type, count in self.device_totals.most_common()
+            ],
+            "per_minute": [
+                {"minute": minute * 60 * 1000, "count": count}
+                for minute, count in self.minute_buckets
+            ],
+            "timestamp": int(now.timestamp() * 1000)
+        }
+
+
+class LiveAggregator:
+    """In-memory, per-tenant dashboard aggregates updated on ingestion
+
+    The counters live in this process only. With several workers each one
+    sees just the events it ingested, so snapshots and deltas undercount;
+    run the analytics service with a single worker while it serves live
+    dashboards.
+    """
+
+    def __init__(self, push_interval: float = PUSH_INTERVAL_SECONDS):
+        self.push_interval = push_interval
+        self.tenants: Dict[str, TenantAggregates] = {}
+
+    def get_tenant(self, tenant_id: str) -> TenantAggregates:
+        tenant_id = str(tenant_id)
+        aggregates = self.tenants.get(tenant_id)
+        if aggregates is None:
+            aggregates = TenantAggregates(tenant_id)
+            self.tenants[tenant_id] = aggregates
+        return aggregates
+
+    def record_event(self, tenant_id: str, timestamp: datetime, event_category: Optional[str],
+                     device_info: Optional[dict], user_id: Optional[str] = None) -> bool:
+        """Record an ingested event in the tenant's sliding windows"""
+        device_type = (device_info or {}).get("device_type")
+        user_id = str(user_id) if user_id else None
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.replace(tzinfo=None)
+        return self.get_tenant(tenant_id).record(
+            timestamp, event_category, device_type, user_id, datetime.utcnow()
+        )
+
+    def hydrate(self, tenant_id: str, dashboard: Dict[str, Any]):
+        """Seed a tenant's day-level counters from a /dashboard computation
+
+        The database result replaces whatever was counted before hydration.
+        Minute buckets and active users are not restored; they fill up from
+        live traffic after a restart.
+        """
+        aggregates = self.get_tenant(tenant_id)
+        if aggregates.hydrated:
+            return
+
+        aggregates.daily_counts = {
+            date.fromisoformat(row["date"]): row["count"]
+            for row in dashboard.get("daily_events", [])
+        }
+
+        # Breakdowns are seeded per day, so each day's counts leave the
+        # totals when that day slides out of the window
+        aggregates.category_by_day = {}
+        for row in dashboard.get("category_by_day", []):
+            aggregates.category_by_day.setdefault(date.fromisoformat(row["date"]), Counter())[row["category"]] += row["count"]
+        aggregates.device_by_day = {}
+        for row in dashboard.get("device_by_day", []):
+            aggregates.device_by_day.setdefault(date.fromisoformat(row["date"]), Counter())[row["device_type"]] += row["count"]
+        aggregates.category_totals = sum(aggregates.category_by_day.values(), Counter())
+        aggregates.device_totals = sum(aggregates.device_by_day.values(), Counter())
+
+        aggregates.take_delta(datetime.utcnow())
+        aggregates.hydrated = True
+
+    def is_hydrated(self, tenant_id: str) -> bool:
+        aggregates = self.tenants.get(str(tenant_id))
+        return aggregates is not None and aggregates.hydrated
+
+    def snapshot(self, tenant_id: str) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        aggregates = self.get_tenant(tenant_id)
+        aggregates.expire(now)
+        return aggregates.snapshot(now)
+
+    def flush(self, tenant_id: str) -> Optional[Dict[str, Any]]:
+        """Take a tenant's pending delta immediately, ignoring the throttle"""
+        aggregates = self.tenants.get(str(tenant_id))
+        if aggregates is None or not aggregates.has_pending():
+            return None
+        now = datetime.utcnow()
+        aggregates.expire(now)
+        return aggregates.take_delta(now)
+
+    def collect_deltas(self, tenant_ids) -> Dict[str, Dict[str, Any]]:
+        """Collect throttled deltas for the given tenants"""
+        now = datetime.utcnow()
+        current = time.monotonic()
+        deltas = {}
+
+        for tenant_id in tenant_ids:
+            aggregates = self.tenants.get(tenant_id)
+            if aggregates is None or not aggregates.has_pending():
+                continue
+            if current - aggregates.last_push < self.push_interval:
+                continue
+            aggregates.expire(now)
+            deltas[tenant_id] = aggregates.take_delta(now)
+
+        return deltas
+
+    def expire_all(self):
+        """Expire old buckets for every tenant"""
+        now = datetime.utcnow()
+        for aggregates in self.tenants.values():
+            aggregates.expire(now)
+
+    def get_stats(self) -> dict:
+        return {
+            "tenants": len(self.tenants),
+            "hydrated_tenants": sum(1 for a in self.tenants.values() if a.hydrated),
+            "push_interval_seconds": self.push_interval
+        }
+
+
+def load_dashboard_aggregates(db: Session, tenant_id: str, now: datetime) -> Dict[str, Any]:
+    """Compute dashboard aggregates from raw rows (cold path)"""
+    last_24h = now - timedelta(hours=24)
+    last_7d = now - timedelta(days=DAILY_WINDOW_DAYS)
+    last_30d = now - timedelta(days=BREAKDOWN_WINDOW_DAYS)
+
+    # Events by day (last 7 days)
+    daily_events = db.query(
+        func.date(AnalyticsEvent.timestamp).label('date'),
+        func.count(AnalyticsEvent.id).label('count')
+    ).filter(
+        and_(
+            AnalyticsEvent.tenant_id == tenant_id,
+            AnalyticsEvent.timestamp >= last_7d
+        )
+    ).group_by(func.date(AnalyticsEvent.timestamp)).order_by('date').all()
+
+    # Events by category per day (last 30 days); the live counters expire them day by day
+    category_events = db.query(
+        func.date(AnalyticsEvent.timestamp).label('date'),
+        AnalyticsEvent.event_category,
+        func.count(AnalyticsEvent.id).label('count')
+    ).filter(
+        and_(
+            AnalyticsEvent.tenant_id == tenant_id,
+            AnalyticsEvent.timestamp >= last_30d
+        )
+    ).group_by(func.date(AnalyticsEvent.timestamp), AnalyticsEvent.event_category).all()
+
+    # Device types per day (last 30 days)
+    device_types = db.query(
+        func.date(AnalyticsEvent.timestamp).label('date'),
+        func.json_extract_path_text(AnalyticsEvent.device_info, 'device_type').label('device_type'),
+        func.count(AnalyticsEvent.id).label('count')
+    ).filter(
+        and_(
+            AnalyticsEvent.tenant_id == tenant_id,
+            AnalyticsEvent.timestamp >= last_30d
+        )
+    ).group_by(func.date(AnalyticsEvent.timestamp), 'device_type').all()
+
+    category_by_day = [
+        {"date": row.date.isoformat(), "category": row.event_category or "uncategorized", "count": row.count}
+        for row in category_events
+    ]
+    device_by_day = [
+        {"date": row.date.isoformat(), "device_type": row.device_type or "unknown", "count": row.count}
+        for row in device_types
+    ]
+    category_totals = Counter()
+    for row in category_by_day:
+        category_totals[row["category"]] += row["count"]
+    device_totals = Counter()
+    for row in device_by_day:
+        device_totals[row["device_type"]] += row["count"]
+
+    # Active users (last 24h)
+    active_users_24h = db.query(func.count(func.distinct(AnalyticsEvent.user_id))).filter(
+        and_(
+            AnalyticsEvent.tenant_id == tenant_id,
+            AnalyticsEvent.timestamp >= last_24h
+        )
+    ).scalar() or 0
+
+    return {
+        "active_users_24h": active_users_24h,
+        "daily_events": [
+            {"date": row.date.isoformat(), "count": row.count}
+            for row in daily_events
+        ],
+        "category_breakdown": [
+            {"category": category, "count": count}
+            for category, count in category_totals.most_common()
+        ],
+        "device_breakdown": [
+            {"device_type": device_type, "count": count}
+            for device_type, count in device_totals.most_common()
+        ],
+        "category_by_day": category_by_day,
+        "device_by_day": device_by_day
+    }
+
+
+# Global live aggregator
+live_aggregator = LiveAggregator()
@@ -0,0 +1,3 @@
+from .analytics_event_repository import AnalyticsEventRepository
+
+__all__ = ["AnalyticsEventRepository"]
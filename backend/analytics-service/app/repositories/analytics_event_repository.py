@@ -0,0 +1,49 @@
+"""
+Analytics event repository on AsyncSession
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
+
+from shared.repositories.async_base_repository import AsyncBaseRepository
+from app.models.analytics_event import AnalyticsEvent
+from sqlalchemy import select, desc
+from typing import List, Optional
+from datetime import datetime
+
+
+class AnalyticsEventRepository(AsyncBaseRepository[AnalyticsEvent]):
+    """Async queries for analytics events"""
+
+    async def list_events(
+        self,
+        tenant_id: str,
+        user_id: Optional[str] = None,
+        event_name: Optional[str] = None,
+        event_category: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[AnalyticsEvent]:
+        """Get a tenant's events, newest first, with optional filters"""
+        stmt = select(AnalyticsEvent).where(AnalyticsEvent.tenant_id == tenant_id)
+
+        if user_id:
+            stmt = stmt.where(AnalyticsEvent.user_id == user_id)
+
+        if event_name:
+            stmt = stmt.where(AnalyticsEvent.event_name == event_name)
+
+        if event_category:
+            stmt = stmt.where(AnalyticsEvent.event_category == event_category)
+
+        if start_date:
+            stmt = stmt.where(AnalyticsEvent.timestamp >= start_date)
+
+        if end_date:
+            stmt = stmt.where(AnalyticsEvent.timestamp <= end_date)
+
+        stmt = stmt.order_by(desc(AnalyticsEvent.timestamp)).offset(offset).limit(limit)
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
@@ -9,7 +9,9 @@ from datetime import datetime
 
 from app.core.database import get_db, create_tables, check_database_health
 from app.api.analytics import router as analytics_router
-from app.api.websocket import websocket_endpoint, cleanup_stale_connections, manager
+from app.api.websocket import websocket_endpoint, cleanup_stale_connections, push_dashboard_deltas, manager
+from app.core.live_aggregates import live_aggregator
+from shared.utils.database_engine import get_database_metrics
 
 # Basic configuration
 SERVICE_NAME = "analytics-service"
@@ -73,14 +75,18 @@ async def health_check():
         "status": "healthy" if db_healthy else "degraded",
         "timestamp": datetime.utcnow().isoformat(),
         "database": "connected" if db_healthy else "disconnected",
+        "database_pools": get_database_metrics(),
         "websocket": {
             "total_connections": connection_stats["total_connections"],
-            "active_tenants": connection_stats["active_tenants"]
+            "active_tenants": connection_stats["active_tenants"],
+            "dashboard_subscribers": connection_stats["dashboard_subscribers"]
         },
+        "live_aggregates": live_aggregator.get_stats(),
         "features": {
             "real_time_analytics": True,
             "batch_processing": True,
             "websocket_streaming": True,
+            "live_dashboard": True,
             "tenant_isolation": True,
             "offline_support": True
         }
@@ -118,6 +124,9 @@ async def startup_event():
         # Start background cleanup task
         asyncio.create_task(cleanup_stale_connections())
         
+        # Start live dashboard push task
+        asyncio.create_task(push_dashboard_deltas())
+        
         print(f"🚀 {SERVICE_NAME} v{VERSION} started successfully")
         print(f"📊 Analytics API: http://localhost:8002/api/v1/analytics")
         print(f"🔌 WebSocket: ws://localhost:8002/ws/analytics")
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request
 from app.services.auth_service import AuthService
 from app.schemas.auth import LoginRequest, RegisterRequest, TokenResponse
 from app.dependencies import get_auth_service
+from app.core.password_hasher import HashingOverloadedError
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -16,6 +17,8 @@ async def login(request: LoginRequest, req: Request, auth_service: AuthService =
         )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+    except HashingOverloadedError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
 
 @router.post("/register", response_model=TokenResponse)
 async def register(request: RegisterRequest, auth_service: AuthService = Depends(get_auth_service)):
@@ -23,6 +26,8 @@ async def register(request: RegisterRequest, auth_service: AuthService = Depends
         return await auth_service.register(request.email, request.password, request.name, request.type or "individual")
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except HashingOverloadedError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
 
 @router.post("/refresh")
 async def refresh_token(user_id: str, tenant_id: str, auth_service: AuthService = Depends(get_auth_service)):
@@ -0,0 +1,39 @@
+"""
+JWT signing key management CLI commands
+"""
+import click
+import sys
+import os
+
+# Add the app directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from app.core.security import signing_key_ring
+
+@click.group()
+def keys_group():
+    """JWT signing key commands"""
+    pass
+
+def _require_key_ring():
+    if signing_key_ring is None:
+        click.echo("❌ JWT algorithm is HS256; there are no signing keys to manage")
+        sys.exit(1)
+    return signing_key_ring
+
+@keys_group.command()
+def rotate():
+    """Generate a new active signing key (running workers pick it up within seconds)"""
+    try:
+        key = _require_key_ring().rotate()
+        click.echo(f"✅ New active signing key: {key.kid}")
+    except Exception as e:
+        click.echo(f"❌ Failed to rotate signing key: {e}")
+        sys.exit(1)
+
+@keys_group.command(name="list")
+def list_keys():
+    """List signing keys, newest (active) first"""
+    key_ring = _require_key_ring()
+    for i, key in enumerate(key_ring.jwks()["keys"]):
+        click.echo(f"  {'🟢 active  ' if i == 0 else '   previous'} {key['kid']} ({key['alg']})")
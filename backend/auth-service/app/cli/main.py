@@ -22,11 +22,12 @@ def cli(verbose):
 
 # Import and add command groups
 try:
-    from app.cli.commands import users, tenants, services, roles
+    from app.cli.commands import users, tenants, services, roles, keys
     cli.add_command(users.users_group)
     cli.add_command(tenants.tenants_group)
     cli.add_command(services.services_group)
     cli.add_command(roles.roles_group)
+    cli.add_command(keys.keys_group)
 except ImportError as e:
     click.echo(f"⚠️  Warning: Some commands may not be available: {e}")
 
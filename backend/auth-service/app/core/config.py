@@ -46,12 +46,44 @@ print(f"✅ Config loaded successfully")
 print(f"✅ Database URL: {settings.get('database.url')}")
 print(f"✅ Service name: {settings.get('service.name')}")
 
+def _env_flag(value) -> bool:
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
 # Simple service registry placeholder
 class ServiceRegistry:
     def __init__(self):
         self.services = {}
         self.permissions = {}
-        self.redis_config = {}
+        self.redis_config = self._load_redis_config()
         print("⚠️ Service registry disabled for now")
+    
+    @staticmethod
+    def _load_redis_config() -> dict:
+        """Redis settings from config.yaml's redis section; REDIS_* environment variables win"""
+        redis = settings.get("redis", {}) or {}
+        cluster = redis.get("cluster", {}) or {}
+        nodes = os.getenv("REDIS_CLUSTER_NODES") or cluster.get("nodes") or []
+        if isinstance(nodes, str):
+            nodes = [
+                {"host": host, "port": int(port)}
+                for host, port in (node.rsplit(":", 1) for node in nodes.split(",") if node)
+            ]
+        return {
+            "host": os.getenv("REDIS_HOST", redis.get("host", "localhost")),
+            "port": int(os.getenv("REDIS_PORT", redis.get("port", 6379))),
+            "password": os.getenv("REDIS_PASSWORD", redis.get("password")) or None,
+            "db": int(os.getenv("REDIS_DB", redis.get("db", 0))),
+            "ssl": _env_flag(os.getenv("REDIS_SSL", redis.get("ssl", False))),
+            "max_connections": int(os.getenv("REDIS_MAX_CONNECTIONS", redis.get("max_connections", 10))),
+            "cluster": {
+                "enabled": _env_flag(os.getenv("REDIS_CLUSTER_ENABLED", cluster.get("enabled", False))),
+                "nodes": nodes,
+                "max_redirects": int(os.getenv("REDIS_MAX_REDIRECTS", cluster.get("max_redirects", 3)))
+            }
+        }
+    
+    def get_redis_config(self) -> dict:
+        """Connection settings for RedisClient"""
+        return self.redis_config
 
 service_registry = ServiceRegistry()
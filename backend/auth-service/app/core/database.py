@@ -1,19 +1,19 @@
-from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from .config import settings
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
+from shared.utils.database_engine import create_service_database
 
-# Database engine
-engine = create_engine(
-    settings.get("database.url"),
-    echo=settings.get("service.debug", False),
-    pool_pre_ping=True,
-    pool_recycle=300
+# Database engine and session factory (pool sizing from shared database config)
+engine, SessionLocal = create_service_database(
+    "auth",
+    url=settings.get("database.url"),
+    # Auth has always recycled connections after 5 minutes, not the shared hour
+    pool={"pool_recycle": 300},
+    echo=settings.get("service.debug", False)
 )
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 # Base class for models
 Base = declarative_base()
 
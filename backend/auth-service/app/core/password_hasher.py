@@ -0,0 +1,117 @@
+"""
+Bounded worker pool for bcrypt hashing and verification
+
+bcrypt is deliberately slow (~100-300 ms per call), so running it inline in
+an async handler freezes the event loop for every login. Work is handed to
+a dedicated thread pool (the bcrypt backend releases the GIL while hashing)
+with admission control: once `max_pending` operations are queued or running,
+new requests are rejected instead of piling up behind a login burst.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+import asyncio
+import os
+import time
+
+from passlib.context import CryptContext
+
+
+class HashingOverloadedError(Exception):
+    """Raised when the hashing queue is full and a request is rejected"""
+    pass
+
+
+class PasswordHasher:
+    """Runs passlib operations on a bounded thread pool and records latency metrics"""
+
+    def __init__(self, context: CryptContext, max_workers: int = None, max_pending: int = 64):
+        self.context = context
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        self._pending = 0
+        self._metrics = {
+            "operations": 0,
+            "rejected": 0,
+            "rehashed": 0,
+            "queue_wait_ms_total": 0.0,
+            "queue_wait_ms_max": 0.0,
+            "hash_ms_total": 0.0,
+            "hash_ms_max": 0.0
+        }
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        """Run a hashing call on the pool, applying admission control"""
+        # _pending is only touched from the event loop thread
+        if self._pending >= self.max_pending:
+            self._metrics["rejected"] += 1
+            raise HashingOverloadedError("Password hashing queue is full")
+
+        self._pending += 1
+        submitted_at = time.perf_counter()
+
+        def job():
+            started_at = time.perf_counter()
+            result = fn(*args)
+            return result, started_at, time.perf_counter()
+
+        try:
+            loop = asyncio.get_running_loop()
+            result, started_at, finished_at = await loop.run_in_executor(self._executor, job)
+        finally:
+            self._pending -= 1
+
+        self._record(
+            queue_wait_ms=(started_at - submitted_at) * 1000,
+            hash_ms=(finished_at - started_at) * 1000
+        )
+        return result
+
+    def _record(self, queue_wait_ms: float, hash_ms: float):
+        metrics = self._metrics
+        metrics["operations"] += 1
+        metrics["queue_wait_ms_total"] += queue_wait_ms
+        metrics["queue_wait_ms_max"] = max(metrics["queue_wait_ms_max"], queue_wait_ms)
+        metrics["hash_ms_total"] += hash_ms
+        metrics["hash_ms_max"] = max(metrics["hash_ms_max"], hash_ms)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the context's current cost factor"""
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash"""
+        return await self._run(self.context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and return a replacement hash if the stored one is outdated
+
+        The replacement is produced when the configured cost factor was raised
+        (or the scheme deprecated) since the hash was created.
+        """
+        valid, new_hash = await self._run(self.context.verify_and_update, password, hashed_password)
+        if new_hash:
+            self._metrics["rehashed"] += 1
+        return valid, new_hash
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue and latency metrics for health endpoints"""
+        metrics = self._metrics
+        operations = metrics["operations"]
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "operations": operations,
+            "rejected": metrics["rejected"],
+            "rehashed": metrics["rehashed"],
+            "avg_queue_wait_ms": round(metrics["queue_wait_ms_total"] / operations, 2) if operations else 0.0,
+            "max_queue_wait_ms": round(metrics["queue_wait_ms_max"], 2),
+            "avg_hash_ms": round(metrics["hash_ms_total"] / operations, 2) if operations else 0.0,
+            "max_hash_ms": round(metrics["hash_ms_max"], 2)
+        }
+
+    def shutdown(self):
+        """Stop the worker pool, letting in-flight operations finish"""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,222 @@
+"""
+Permission decision cache for compiled per-role permission sets
+"""
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Any, Tuple
+import threading
+import time
+
+from .config import settings
+from .redis_client import redis_client
+from .abac import compile_grant
+
+
+class RoleSnapshot:
+    """
+    Compiled permission set of a single role
+
+    `grants` maps (resource, action) to the ABAC condition dicts of the
+    matching active permissions. An empty list means the pair is granted
+    without ABAC conditions; a missing key means it is not granted at all.
+    `compiled` holds the same grants compiled into ABAC evaluators.
+    """
+
+    def __init__(self, role_id: str, tenant_id: str, is_active: bool,
+                 grants: Dict[Tuple[str, str], List[Dict[str, Any]]]):
+        self.role_id = role_id
+        self.tenant_id = tenant_id
+        self.is_active = is_active
+        self.grants = grants
+        self.compiled = {
+            key: compile_grant(conditions_list)
+            for key, conditions_list in grants.items()
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialise for the Redis tier"""
+        return {
+            "role_id": self.role_id,
+            "tenant_id": self.tenant_id,
+            "is_active": self.is_active,
+            "grants": [
+                {"resource": resource, "action": action, "conditions": conditions}
+                for (resource, action), conditions in self.grants.items()
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RoleSnapshot":
+        return cls(
+            role_id=data["role_id"],
+            tenant_id=data["tenant_id"],
+            is_active=data["is_active"],
+            grants={
+                (grant["resource"], grant["action"]): grant["conditions"]
+                for grant in data["grants"]
+            }
+        )
+
+
+class PermissionCache:
+    """
+    Two-tier cache of role snapshots, tenant OPA flags and user project sets
+
+    The in-process tier is an LRU (at most `max_entries` per kind) with a
+    short TTL so that writes made by other processes (CLI, other replicas)
+    become visible without explicit cross-process messaging. The optional
+    Redis tier is shared and is invalidated explicitly on
+    role/permission/policy writes.
+
+    Loads race with invalidations: a value read from the database just
+    before a write could be stored just after the write invalidated it.
+    Callers therefore take `generation()` before loading and pass it to the
+    setter; a value whose generation is out of date is not stored. Locally
+    any invalidation bumps the generation. In Redis, each role has a
+    generation counter that is part of the snapshot key.
+    """
+
+    def __init__(self, ttl_seconds: int = 60, redis_ttl_seconds: int = 3600, use_redis: bool = True,
+                 max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.use_redis = use_redis
+        self.max_entries = max_entries
+        self._roles: "OrderedDict[str, Tuple[float, RoleSnapshot]]" = OrderedDict()
+        self._tenant_opa: "OrderedDict[str, Tuple[float, bool]]" = OrderedDict()
+        self._user_projects: "OrderedDict[str, Tuple[float, FrozenSet[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.stats = {"hits": 0, "redis_hits": 0, "misses": 0, "invalidations": 0, "stale_loads": 0}
+
+    def _get_local(self, cache: "OrderedDict[str, tuple]", key: str) -> Optional[Any]:
+        """Return a live local entry, refreshing its LRU position"""
+        with self._lock:
+            entry = cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del cache[key]
+                return None
+            cache.move_to_end(key)
+            return entry[1]
+
+    def _put_local(self, cache: "OrderedDict[str, tuple]", key: str, value: Any, generation: int) -> bool:
+        """Store a local entry loaded at `generation`, evicting the least recently used past max_entries"""
+        with self._lock:
+            if generation != self._generation:
+                # Invalidated while it was being loaded
+                self.stats["stale_loads"] += 1
+                return False
+            cache[key] = (time.monotonic() + self.ttl_seconds, value)
+            cache.move_to_end(key)
+            while len(cache) > self.max_entries:
+                cache.popitem(last=False)
+            return True
+
+    def _bump_generation(self):
+        """Make every load that started before now too old to be stored; callers hold the lock"""
+        self._generation += 1
+
+    def generation(self, role_id: Optional[str] = None) -> Tuple[int, Optional[int]]:
+        """
+        Invalidation counters to take before loading from the database
+
+        The second item is the role's Redis generation, or None without a
+        role or when the Redis tier is unavailable.
+        """
+        redis_generation = None
+        if role_id is not None and self.use_redis:
+            redis_generation = redis_client.get_permission_generation(str(role_id))
+        return self._generation, redis_generation
+
+    def get_role(self, role_id: str) -> Optional[RoleSnapshot]:
+        """Get a role snapshot from the local tier, then Redis"""
+        role_id = str(role_id)
+        snapshot = self._get_local(self._roles, role_id)
+        if snapshot is not None:
+            self.stats["hits"] += 1
+            return snapshot
+
+        if self.use_redis:
+            generation = self.generation(role_id)
+            if generation[1] is not None:
+                data = redis_client.get_permission_snapshot(role_id, generation[1])
+                if data:
+                    snapshot = RoleSnapshot.from_dict(data)
+                    self._put_local(self._roles, role_id, snapshot, generation[0])
+                    self.stats["redis_hits"] += 1
+                    return snapshot
+
+        self.stats["misses"] += 1
+        return None
+
+    def set_role(self, snapshot: RoleSnapshot, generation: Tuple[int, Optional[int]]):
+        """Store a role snapshot compiled after `generation(role_id)` was taken in both tiers"""
+        self._put_local(self._roles, snapshot.role_id, snapshot, generation[0])
+        if self.use_redis and generation[1] is not None:
+            redis_client.set_permission_snapshot(
+                snapshot.role_id, generation[1], snapshot.to_dict(), self.redis_ttl_seconds
+            )
+
+    def get_tenant_opa(self, tenant_id: str) -> Optional[bool]:
+        """Get whether a tenant has active OPA policies, if cached"""
+        return self._get_local(self._tenant_opa, str(tenant_id))
+
+    def set_tenant_opa(self, tenant_id: str, has_policies: bool, generation: Tuple[int, Optional[int]]):
+        self._put_local(self._tenant_opa, str(tenant_id), has_policies, generation[0])
+
+    def get_user_projects(self, user_id: str) -> Optional[FrozenSet[str]]:
+        """Get the cached project IDs a user is an active member of"""
+        return self._get_local(self._user_projects, str(user_id))
+
+    def set_user_projects(self, user_id: str, project_ids: FrozenSet[str], generation: Tuple[int, Optional[int]]):
+        self._put_local(self._user_projects, str(user_id), project_ids, generation[0])
+
+    def invalidate_user(self, user_id: str):
+        """Drop cached project memberships after a membership change"""
+        with self._lock:
+            self._user_projects.pop(str(user_id), None)
+            self._bump_generation()
+        self.stats["invalidations"] += 1
+
+    def invalidate_role(self, role_id: str):
+        """Drop a role snapshot after its role or permissions changed"""
+        role_id = str(role_id)
+        with self._lock:
+            self._roles.pop(role_id, None)
+            self._bump_generation()
+        if self.use_redis:
+            redis_client.invalidate_permission_snapshot(role_id)
+        self.stats["invalidations"] += 1
+
+    def invalidate_tenant(self, tenant_id: str):
+        """Drop the cached policy state of a tenant after a policy write"""
+        with self._lock:
+            self._tenant_opa.pop(str(tenant_id), None)
+            self._bump_generation()
+        self.stats["invalidations"] += 1
+
+    def clear(self):
+        """Drop the whole local tier"""
+        with self._lock:
+            self._bump_generation()
+            self._roles.clear()
+            self._tenant_opa.clear()
+            self._user_projects.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "cached_roles": len(self._roles),
+            "cached_tenants": len(self._tenant_opa),
+            "cached_users": len(self._user_projects)
+        }
+
+
+# Global permission cache instance
+permission_cache = PermissionCache(
+    ttl_seconds=settings.get("permissions.cache_ttl_seconds", 60),
+    redis_ttl_seconds=settings.get("permissions.redis_cache_ttl_seconds", 3600),
+    use_redis=settings.get("permissions.redis_cache_enabled", True),
+    max_entries=settings.get("permissions.local_cache_size", 10000)
+)
@@ -2,8 +2,10 @@
 Redis client for caching and distributed session management
 """
 import redis
+import redis.cluster
 import json
 import pickle
+import time
 from typing import Optional, Any, Dict
 from datetime import timedelta
 from .config import service_registry
@@ -11,20 +13,28 @@ from .config import service_registry
 class RedisClient:
     """Redis client for caching and distributed operations"""
     
+    # Minimum seconds between reconnection attempts while Redis is down
+    RECONNECT_INTERVAL = 5.0
+    
     def __init__(self):
         self.redis_client = None
         self.connected = False
+        self._last_connect_attempt = 0.0
         self.connect()
     
     def connect(self):
         """Connect to Redis"""
+        self._last_connect_attempt = time.monotonic()
         try:
             config = service_registry.get_redis_config()
             
             if config.get("cluster", {}).get("enabled"):
                 # Redis Cluster mode
                 self.redis_client = redis.RedisCluster(
-                    startup_nodes=config["cluster"]["nodes"],
+                    startup_nodes=[
+                        redis.cluster.ClusterNode(node["host"], int(node["port"]))
+                        for node in config["cluster"]["nodes"]
+                    ],
                     max_connections=config["max_connections"],
                     decode_responses=True,
                     max_redirects=config["cluster"]["max_redirects"]
@@ -52,16 +62,23 @@ class RedisClient:
             self.redis_client = None
     
     def is_connected(self) -> bool:
-        """Check if Redis is connected"""
-        if not self.connected or not self.redis_client:
-            return False
+        """
+        Check if Redis is connected, reconnecting (rate-limited) after a failure
         
-        try:
-            self.redis_client.ping()
+        This does not round-trip to Redis; a lost connection is detected by the
+        next real command failing, which marks the client disconnected.
+        """
+        if self.connected and self.redis_client:
             return True
-        except:
-            self.connected = False
+        if time.monotonic() - self._last_connect_attempt < self.RECONNECT_INTERVAL:
             return False
+        self.connect()
+        return self.connected
+    
+    def _handle_error(self, error: Exception):
+        """Mark the client disconnected when a command failed to reach Redis"""
+        if isinstance(error, (redis.ConnectionError, redis.TimeoutError)):
+            self.connected = False
     
     def set_service_token(self, service_id: str, token: str, ttl: int = 3600) -> bool:
         """Cache service authentication token"""
@@ -73,6 +90,7 @@ class RedisClient:
             self.redis_client.setex(key, ttl, token)
             return True
         except Exception as e:
+            self._handle_error(e)
             print(f"Failed to cache service token: {e}")
             return False
     
@@ -85,6 +103,7 @@ class RedisClient:
             key = f"service_token:{service_id}"
             return self.redis_client.get(key)
         except Exception as e:
+            self._handle_error(e)
             print(f"Failed to get cached service token: {e}")
             return None
     
@@ -98,6 +117,7 @@ class RedisClient:
             self.redis_client.delete(key)
             return True
         except Exception as e:
+            self._handle_error(e)
             print(f"Failed to invalidate service token: {e}")
             return False
     
@@ -111,6 +131,7 @@ class RedisClient:
             self.redis_client.setex(key, ttl, json.dumps(user_data))
             return True
         except Exception as e:
+            self._handle_error(e)
             print(f"Failed to cache user session: {e}")
             return False
     
@@ -124,9 +145,70 @@ class RedisClient:
             data = self.redis_client.get(key)
             return json.loads(data) if data else None
         except Exception as e:
+            self._handle_error(e)
             print(f"Failed to get cached user session: {e}")
             return None
     
+    def get_permission_generation(self, role_id: str) -> Optional[int]:
+        """Invalidation counter of a role's permission snapshots; None when Redis is unavailable"""
+        if not self.is_connected():
+            return None
+        
+        try:
+            data = self.redis_client.get(f"permission_generation:{role_id}")
+            return int(data) if data else 0
+        except Exception as e:
+            self._handle_error(e)
+            print(f"Failed to get permission snapshot generation: {e}")
+            return None
+    
+    def set_permission_snapshot(self, role_id: str, generation: int, snapshot: Dict[str, Any], ttl: int = 3600) -> bool:
+        """Cache compiled role permission set under the generation it was loaded at"""
+        if not self.is_connected():
+            return False
+        
+        try:
+            key = f"permission_snapshot:{role_id}:{generation}"
+            self.redis_client.setex(key, ttl, json.dumps(snapshot))
+            return True
+        except Exception as e:
+            self._handle_error(e)
+            print(f"Failed to cache permission snapshot: {e}")
+            return False
+    
+    def get_permission_snapshot(self, role_id: str, generation: int) -> Optional[Dict[str, Any]]:
+        """Get cached role permission set of the given generation"""
+        if not self.is_connected():
+            return None
+        
+        try:
+            key = f"permission_snapshot:{role_id}:{generation}"
+            data = self.redis_client.get(key)
+            return json.loads(data) if data else None
+        except Exception as e:
+            self._handle_error(e)
+            print(f"Failed to get cached permission snapshot: {e}")
+            return None
+    
+    def invalidate_permission_snapshot(self, role_id: str) -> bool:
+        """
+        Invalidate cached role permission set
+        
+        Bumping the generation makes every snapshot loaded before this call
+        unreachable, including one a concurrent reader is about to write back.
+        """
+        if not self.is_connected():
+            return False
+        
+        try:
+            generation = self.redis_client.incr(f"permission_generation:{role_id}")
+            self.redis_client.delete(f"permission_snapshot:{role_id}:{generation - 1}")
+            return True
+        except Exception as e:
+            self._handle_error(e)
+            print(f"Failed to invalidate permission snapshot: {e}")
+            return False
+    
     def set_rate_limit(self, key: str, count: int, ttl: int = 60) -> bool:
         """Set rate limiting counter"""
         if not self.is_connected():
@@ -137,6 +219,7 @@ class RedisClient:
             self.redis_client.setex(redis_key, ttl, count)
             return True
         except Exception as e:
+            self._handle_error(e)
             print(f"Failed to set rate limit: {e}")
             return False
     
@@ -155,6 +238,7 @@ class RedisClient:
             
             return count
         except Exception as e:
+            self._handle_error(e)
             print(f"Failed to increment rate limit: {e}")
             return None
     
@@ -168,6 +252,7 @@ class RedisClient:
             count = self.redis_client.get(redis_key)
             return int(count) if count else 0
         except Exception as e:
+            self._handle_error(e)
             print(f"Failed to get rate limit: {e}")
             return None
     
@@ -189,6 +274,7 @@ class RedisClient:
                 return {"status": "unhealthy", "error": "Redis operations failed"}
                 
         except Exception as e:
+            self._handle_error(e)
             return {"status": "error", "error": str(e)}
 
 # Global Redis client instance
@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import uuid
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -9,22 +9,48 @@ from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 import secrets
 import base64
 from .config import settings
+from .password_hasher import PasswordHasher
+from .signing_keys import ASYMMETRIC_ALGORITHMS, SigningKeyRing
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing; min_rounds makes hashes created with a lower cost factor
+# report as outdated so they are transparently rehashed on the next login
+BCRYPT_ROUNDS = settings.get("security.bcrypt_rounds", 12)
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS
+)
+
+# Bounded worker pool keeping bcrypt off the event loop
+password_hasher = PasswordHasher(
+    pwd_context,
+    max_workers=settings.get("security.hash_workers"),
+    max_pending=settings.get("security.hash_max_pending", 64)
+)
+
+# Asymmetric signing keys; None when tokens are signed with the shared secret
+JWT_ALGORITHM = settings.get("jwt.algorithm", "HS256")
+signing_key_ring = SigningKeyRing(
+    JWT_ALGORITHM,
+    keys_dir=settings.get("jwt.keys_dir"),
+    max_keys=settings.get("jwt.max_keys", 3)
+) if JWT_ALGORITHM in ASYMMETRIC_ALGORITHMS else None
 
 class SecurityManager:
     """
     Handles multi-tenant security operations including:
-    - JWT token management with tenant context
+    - JWT token management with tenant context (ES256/RS256 with kid-based
+      key rotation, or HS256 with the shared secret)
     - Password hashing and verification
     - Diffie-Hellman key exchange
     - Tenant-scoped session management
     """
     
     def __init__(self):
-        self.algorithm = settings.ALGORITHM
-        self.secret_key = settings.SECRET_KEY
+        self.algorithm = JWT_ALGORITHM
+        self.secret_key = settings.get("jwt.secret_key")
+        self.key_ring = signing_key_ring
         
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify password against hash"""
@@ -34,6 +60,19 @@ class SecurityManager:
         """Hash password with bcrypt"""
         return pwd_context.hash(password)
     
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify password on the hashing pool without blocking the event loop
+        
+        Returns the verification result and, when the stored hash uses an
+        outdated cost factor, a replacement hash to persist.
+        """
+        return await password_hasher.verify_and_update(plain_password, hashed_password)
+    
+    async def get_password_hash_async(self, password: str) -> str:
+        """Hash password with bcrypt on the hashing pool"""
+        return await password_hasher.hash(password)
+    
     def create_access_token(self, data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
         """
         Create JWT access token with tenant context
@@ -52,7 +91,7 @@ class SecurityManager:
             "type": "access"
         })
         
-        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        return self._encode(to_encode)
     
     def create_refresh_token(self, data: Dict[str, Any]) -> str:
         """
@@ -68,13 +107,33 @@ class SecurityManager:
             "type": "refresh"
         })
         
-        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        return self._encode(to_encode)
+    
+    def _encode(self, claims: Dict[str, Any]) -> str:
+        """Sign claims with the active key (and its kid) or the shared secret"""
+        if self.key_ring:
+            key = self.key_ring.active_key
+            return jwt.encode(claims, key.signing_key, algorithm=self.algorithm, headers={"kid": key.kid})
+        
+        return jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+    
+    def get_jwks(self) -> Dict[str, Any]:
+        """Public keys for offline token verification"""
+        if self.key_ring:
+            return self.key_ring.jwks()
+        return {"keys": []}
     
     def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
         """
         Verify JWT token and return payload with tenant context
         """
         try:
+            if self.key_ring:
+                key = self.key_ring.get(jwt.get_unverified_header(token).get("kid"))
+                if key is None:
+                    return None
+                return jwt.decode(token, key.verification_key, algorithms=[self.algorithm])
+            
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
             return payload
         except JWTError:
@@ -0,0 +1,276 @@
+"""
+Asymmetric JWT signing keys with rotation and JWKS publication
+
+Tokens are signed with the newest key and carry its `kid` header. Older keys
+stay in the ring (up to `max_keys`) so tokens issued before a rotation keep
+verifying until they expire. Other services verify offline using the public
+keys published at /.well-known/jwks.json.
+"""
+from typing import Any, Dict, Iterator, List, Optional
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+import base64
+import fcntl
+import hashlib
+import json
+import os
+import threading
+import time
+
+from cryptography.hazmat.primitives import serialization
+from jose import jwk
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+ASYMMETRIC_ALGORITHMS = ("ES256", "RS256")
+
+
+def _b64url_uint(value: int, length: int = None) -> str:
+    """Base64url-encode an unsigned integer as required by RFC 7518"""
+    length = length or max(1, (value.bit_length() + 7) // 8)
+    return base64.urlsafe_b64encode(value.to_bytes(length, "big")).rstrip(b"=").decode("ascii")
+
+
+class SigningKey:
+    """A single private signing key and its public JWK"""
+
+    def __init__(self, private_key, algorithm: str, created_at: datetime = None):
+        self.private_key = private_key
+        self.algorithm = algorithm
+        self.created_at = created_at or datetime.utcnow()
+        self.private_pem = private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption()
+        ).decode("ascii")
+        self.public_pem = private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode("ascii")
+        # Parsed once; signing and verifying with PEM strings would re-parse them per token
+        self.signing_key = jwk.construct(self.private_pem, algorithm)
+        self.verification_key = jwk.construct(self.public_pem, algorithm)
+        self.public_jwk = self._build_public_jwk()
+        self.kid = self._thumbprint(self.public_jwk)
+        self.public_jwk.update({"kid": self.kid, "use": "sig", "alg": algorithm})
+
+    @classmethod
+    def generate(cls, algorithm: str) -> "SigningKey":
+        if algorithm == "ES256":
+            return cls(ec.generate_private_key(ec.SECP256R1()), algorithm)
+        if algorithm == "RS256":
+            return cls(rsa.generate_private_key(public_exponent=65537, key_size=2048), algorithm)
+        raise ValueError(f"Unsupported signing algorithm: {algorithm}")
+
+    @classmethod
+    def from_pem(cls, pem: bytes, algorithm: str, created_at: datetime = None) -> "SigningKey":
+        return cls(serialization.load_pem_private_key(pem, password=None), algorithm, created_at)
+
+    def _build_public_jwk(self) -> Dict[str, Any]:
+        numbers = self.private_key.public_key().public_numbers()
+        if self.algorithm == "ES256":
+            return {
+                "kty": "EC",
+                "crv": "P-256",
+                "x": _b64url_uint(numbers.x, 32),
+                "y": _b64url_uint(numbers.y, 32)
+            }
+        return {
+            "kty": "RSA",
+            "n": _b64url_uint(numbers.n),
+            "e": _b64url_uint(numbers.e)
+        }
+
+    @staticmethod
+    def _thumbprint(jwk: Dict[str, Any]) -> str:
+        """RFC 7638 JWK thumbprint, used as the key ID"""
+        required = ("crv", "kty", "x", "y") if jwk["kty"] == "EC" else ("e", "kty", "n")
+        canonical = json.dumps({k: jwk[k] for k in required}, separators=(",", ":"), sort_keys=True)
+        digest = hashlib.sha256(canonical.encode("utf-8")).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+class SigningKeyRing:
+    """
+    Active signing key plus previous keys kept for verification
+
+    Without `keys_dir` an ephemeral key is generated per process, which is
+    only suitable for single-worker development. With a shared `keys_dir` the
+    directory is the source of truth and its newest PEM file is the active
+    key. Keys are only generated under an exclusive lock on the directory, so
+    workers starting together agree on one key; every worker re-reads the
+    directory before publishing the JWKS, for signing every RELOAD_INTERVAL
+    seconds, and on an unknown kid. Unknown kids trigger at most one re-read
+    per UNKNOWN_KID_RELOAD_INTERVAL, and a kid still unknown afterwards is
+    rejected without touching the directory for UNKNOWN_KID_TTL seconds, so
+    tokens with made-up kids cannot make every request list the directory.
+    """
+
+    # Seconds a worker keeps signing with its active key before re-reading keys_dir
+    RELOAD_INTERVAL = 10.0
+    # Minimum seconds between re-reads caused by unknown kids
+    UNKNOWN_KID_RELOAD_INTERVAL = 1.0
+    # Seconds a kid that was not found after a re-read stays rejected
+    UNKNOWN_KID_TTL = 60.0
+    MAX_UNKNOWN_KIDS = 1024
+    LOCK_FILE = ".keys.lock"
+
+    def __init__(self, algorithm: str, keys_dir: Optional[str] = None, max_keys: int = 3):
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"Unsupported signing algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.keys_dir = Path(keys_dir) if keys_dir else None
+        self.max_keys = max_keys
+        self._keys: List[SigningKey] = []  # newest first
+        self._by_kid: Dict[str, SigningKey] = {}
+        self._parsed: Dict[str, SigningKey] = {}  # by PEM file name
+        self._jwks: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._last_reload = 0.0
+        self._unknown_kids: Dict[str, float] = {}  # kid -> monotonic time it stops being rejected
+        self._last_unknown_reload = 0.0
+        self.load()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock shared by every process using keys_dir"""
+        if not self.keys_dir:
+            with self._lock:
+                yield
+            return
+
+        self.keys_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.keys_dir / self.LOCK_FILE, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_keys_dir(self) -> List[SigningKey]:
+        """Newest `max_keys` keys in keys_dir; each PEM file is parsed only once"""
+        if not self.keys_dir.is_dir():
+            return []
+
+        pem_files = sorted(self.keys_dir.glob("*.pem"), key=lambda p: (p.stat().st_mtime, p.name), reverse=True)
+        parsed = {}
+        for pem_file in pem_files[:self.max_keys]:
+            key = self._parsed.get(pem_file.name)
+            if key is None:
+                created_at = datetime.utcfromtimestamp(pem_file.stat().st_mtime)
+                key = SigningKey.from_pem(pem_file.read_bytes(), self.algorithm, created_at)
+            parsed[pem_file.name] = key
+        self._parsed = parsed
+        return list(parsed.values())
+
+    def _generate(self) -> SigningKey:
+        """Create and persist a new key; callers hold the file lock"""
+        key = SigningKey.generate(self.algorithm)
+
+        if self.keys_dir:
+            key_file = self.keys_dir / f"{key.created_at.strftime('%Y%m%d%H%M%S%f')}-{key.kid}.pem"
+            tmp_file = key_file.with_suffix(".tmp")
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                f.write(key.private_pem)
+            # Other workers never see a partially written key
+            os.replace(tmp_file, key_file)
+
+        return key
+
+    def load(self):
+        """(Re)load keys from keys_dir; the first process to find it empty generates a key"""
+        if not self.keys_dir:
+            if not self._keys:
+                with self._lock:
+                    self._set_keys([SigningKey.generate(self.algorithm)])
+            return
+
+        keys = self._read_keys_dir()
+        if not keys:
+            with self._file_lock():
+                # Another worker may have generated one while we waited
+                keys = self._read_keys_dir()
+                if not keys:
+                    key = self._generate()
+                    keys = self._read_keys_dir()
+                    print(f"🔑 JWT signing key generated: kid={key.kid} ({self.algorithm})")
+
+        with self._lock:
+            self._set_keys(keys)
+
+    def rotate(self, max_age: Optional[timedelta] = None) -> Optional[SigningKey]:
+        """
+        Generate a new active key; the oldest key beyond max_keys is retired
+
+        With `max_age` the key is only rotated when the active key is older,
+        so every worker can run the check and exactly one of them rotates.
+        """
+        with self._file_lock():
+            current = self._read_keys_dir() if self.keys_dir else self._keys
+            if max_age is not None and current and datetime.utcnow() - current[0].created_at < max_age:
+                return None
+            key = self._generate()
+            if not self.keys_dir:
+                self._set_keys([key] + self._keys)
+
+        if self.keys_dir:
+            self.load()
+        print(f"🔑 JWT signing key rotated: kid={key.kid} ({self.algorithm})")
+        return key
+
+    def _set_keys(self, keys: List[SigningKey]):
+        keys = keys[:self.max_keys]
+        self._last_reload = time.monotonic()
+        if [key.kid for key in keys] == [key.kid for key in self._keys]:
+            return
+        self._keys = keys
+        self._by_kid = {key.kid: key for key in keys}
+        self._jwks = None
+
+    @property
+    def active_key(self) -> SigningKey:
+        """Newest key, picking up rotations by other processes within RELOAD_INTERVAL"""
+        if self.keys_dir and time.monotonic() - self._last_reload > self.RELOAD_INTERVAL:
+            self.load()
+        return self._keys[0]
+
+    def get(self, kid: Optional[str]) -> Optional[SigningKey]:
+        """Get a key by kid for verification"""
+        if kid is None:
+            return None
+
+        key = self._by_kid.get(kid)
+        if key is not None or not self.keys_dir:
+            return key
+
+        # Possibly signed by a sibling worker after a rotation; re-read the
+        # directory unless this kid was just looked up or a re-read just ran
+        now = time.monotonic()
+        if self._unknown_kids.get(kid, 0.0) > now:
+            return None
+        if now - self._last_unknown_reload < self.UNKNOWN_KID_RELOAD_INTERVAL:
+            return None
+        self._last_unknown_reload = now
+        self.load()
+
+        key = self._by_kid.get(kid)
+        if key is None:
+            if len(self._unknown_kids) >= self.MAX_UNKNOWN_KIDS:
+                self._unknown_kids = {k: until for k, until in self._unknown_kids.items() if until > now}
+                if len(self._unknown_kids) >= self.MAX_UNKNOWN_KIDS:
+                    self._unknown_kids.clear()
+            self._unknown_kids[kid] = now + self.UNKNOWN_KID_TTL
+        return key
+
+    def jwks(self) -> Dict[str, Any]:
+        """Public JWK Set of every key in keys_dir, rebuilt only when the keys change"""
+        if self.keys_dir:
+            self.load()
+
+        jwks = self._jwks
+        if jwks is None:
+            with self._lock:
+                jwks = {"keys": [key.public_jwk for key in self._keys]}
+                self._jwks = jwks
+        return jwks
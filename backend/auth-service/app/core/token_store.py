@@ -0,0 +1,179 @@
+"""
+Opaque service-token stores
+
+Opaque tokens issued by /auth/service-auth are exchanged for JWTs by any
+auth-service worker or replica, so they must live in a shared store with
+native expiry. The Redis store keeps a small in-process LRU near-cache in
+front of Redis for hot service tokens and fails closed while Redis is
+unreachable; the in-memory store is meant for tests and single-process
+development and must be selected explicitly (tokens.store: memory).
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+import json
+import threading
+import time
+
+from .config import settings
+from .redis_client import RedisClient, redis_client
+
+
+class TokenStoreUnavailableError(Exception):
+    """The shared token store cannot be reached"""
+    pass
+
+
+class TokenStore(ABC):
+    """Abstract store for opaque service tokens"""
+
+    @abstractmethod
+    def put(self, opaque_token: str, token_info: Dict[str, Any], ttl_seconds: int) -> bool:
+        """Store token info until it expires"""
+        pass
+
+    @abstractmethod
+    def get(self, opaque_token: str) -> Optional[Dict[str, Any]]:
+        """Get token info, or None if unknown or expired"""
+        pass
+
+    @abstractmethod
+    def delete(self, opaque_token: str) -> bool:
+        """Revoke a token"""
+        pass
+
+
+class InMemoryTokenStore(TokenStore):
+    """Process-local token store for tests and development"""
+
+    # Expired entries are swept every this many puts
+    SWEEP_INTERVAL = 256
+
+    def __init__(self):
+        self._tokens: Dict[str, tuple] = {}
+        self._puts = 0
+        self._lock = threading.Lock()
+
+    def put(self, opaque_token: str, token_info: Dict[str, Any], ttl_seconds: int) -> bool:
+        with self._lock:
+            self._tokens[opaque_token] = (time.monotonic() + ttl_seconds, token_info)
+            self._puts += 1
+            if self._puts % self.SWEEP_INTERVAL == 0:
+                self._sweep()
+        return True
+
+    def get(self, opaque_token: str) -> Optional[Dict[str, Any]]:
+        entry = self._tokens.get(opaque_token)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self.delete(opaque_token)
+            return None
+        return entry[1]
+
+    def delete(self, opaque_token: str) -> bool:
+        with self._lock:
+            return self._tokens.pop(opaque_token, None) is not None
+
+    def _sweep(self):
+        now = time.monotonic()
+        for token in [t for t, (expires, _) in self._tokens.items() if expires <= now]:
+            del self._tokens[token]
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+
+class RedisTokenStore(TokenStore):
+    """Redis-backed token store with a short-TTL in-process LRU near-cache"""
+
+    def __init__(self, client: RedisClient, near_cache_size: int = 1024, near_cache_ttl: float = 5.0):
+        self.client = client
+        self.near_cache_size = near_cache_size
+        self.near_cache_ttl = near_cache_ttl
+        self._near_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"near_hits": 0, "redis_hits": 0, "misses": 0}
+
+    def put(self, opaque_token: str, token_info: Dict[str, Any], ttl_seconds: int) -> bool:
+        stored = self.client.set_service_token(opaque_token, self._serialize(token_info), ttl_seconds)
+        if stored:
+            self._cache_locally(opaque_token, token_info, ttl_seconds)
+        return stored
+
+    def get(self, opaque_token: str) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._near_cache.get(opaque_token)
+            if entry is not None:
+                if entry[0] > now:
+                    self._near_cache.move_to_end(opaque_token)
+                    self.stats["near_hits"] += 1
+                    return entry[1]
+                del self._near_cache[opaque_token]
+
+        if not self.client.is_connected():
+            # Unknown to this process and unverifiable: never treat as valid or invalid
+            raise TokenStoreUnavailableError("Redis token store unavailable")
+
+        data = self.client.get_service_token(opaque_token)
+        if not data:
+            if not self.client.connected:
+                # The GET itself failed to reach Redis
+                raise TokenStoreUnavailableError("Redis token store unavailable")
+            self.stats["misses"] += 1
+            return None
+
+        token_info = self._deserialize(data)
+        remaining = (token_info["expires_at"] - datetime.utcnow()).total_seconds()
+        if remaining > 0:
+            self._cache_locally(opaque_token, token_info, remaining)
+        self.stats["redis_hits"] += 1
+        return token_info
+
+    def delete(self, opaque_token: str) -> bool:
+        with self._lock:
+            self._near_cache.pop(opaque_token, None)
+        return self.client.invalidate_service_token(opaque_token)
+
+    def _cache_locally(self, opaque_token: str, token_info: Dict[str, Any], ttl_seconds: float):
+        """Keep a token in the near-cache, never past its own expiry"""
+        expires = time.monotonic() + min(self.near_cache_ttl, ttl_seconds)
+        with self._lock:
+            self._near_cache[opaque_token] = (expires, token_info)
+            self._near_cache.move_to_end(opaque_token)
+            while len(self._near_cache) > self.near_cache_size:
+                self._near_cache.popitem(last=False)
+
+    @staticmethod
+    def _serialize(token_info: Dict[str, Any]) -> str:
+        return json.dumps({**token_info, "expires_at": token_info["expires_at"].isoformat()})
+
+    @staticmethod
+    def _deserialize(data: str) -> Dict[str, Any]:
+        token_info = json.loads(data)
+        token_info["expires_at"] = datetime.fromisoformat(token_info["expires_at"])
+        return token_info
+
+
+def create_token_store() -> TokenStore:
+    """
+    Create the configured token store
+
+    Redis is used even when it is down at startup: the client reconnects
+    lazily, and until then issuing or exchanging tokens fails with 503
+    instead of silently using per-process memory, which would let a token
+    revoked on one worker stay valid on another.
+    """
+    if settings.get("tokens.store", "redis") == "memory":
+        print("⚠️ Using in-memory token store (single process only)")
+        return InMemoryTokenStore()
+
+    if not redis_client.is_connected():
+        print("⚠️ Redis unavailable, service tokens are unavailable until it reconnects")
+    return RedisTokenStore(
+        redis_client,
+        near_cache_size=settings.get("tokens.near_cache_size", 1024),
+        near_cache_ttl=settings.get("tokens.near_cache_ttl_seconds", 5.0)
+    )
@@ -12,7 +12,7 @@ class AuthDelegator:
         self.tenant_repo = tenant_repo
         self.security_manager = SecurityManager()
     
-    def validate_login_credentials(self, email: str, password: str) -> Optional[Dict[str, Any]]:
+    async def validate_login_credentials(self, email: str, password: str) -> Optional[Dict[str, Any]]:
         """Validate login credentials and return user data if valid"""
         user = self.user_repo.get_by_email(email)
         
@@ -22,8 +22,13 @@ class AuthDelegator:
         if not user.is_active:
             raise ValueError("Account is disabled")
             
-        if not self.security_manager.verify_password(password, user.hashed_password):
+        valid, new_hash = await self.security_manager.verify_password_async(password, user.hashed_password)
+        if not valid:
             return None
+        
+        # Cost factor was raised since this hash was created
+        if new_hash:
+            self.user_repo.update(user.id, {"hashed_password": new_hash})
             
         # Update last login
         self.user_repo.update_last_login(user.id)
@@ -52,7 +57,7 @@ class AuthDelegator:
             "expires_in": 30 * 60  # 30 minutes
         }
     
-    def validate_registration_data(self, email: str, password: str, name: str) -> Dict[str, Any]:
+    async def validate_registration_data(self, email: str, password: str, name: str) -> Dict[str, Any]:
         """Validate registration data and return processed data"""
         if self.user_repo.email_exists(email):
             raise ValueError("Email already registered")
@@ -65,7 +70,7 @@ class AuthDelegator:
             
         return {
             "email": email.lower().strip(),
-            "hashed_password": self.security_manager.get_password_hash(password),
+            "hashed_password": await self.security_manager.get_password_hash_async(password),
             "name": name.strip(),
             "is_active": True,
             "email_verified": False,
@@ -4,6 +4,9 @@ from app.core.database import get_db
 from app.services.auth_service import AuthService
 from app.services.user_service import UserService
 from app.services.tenant_service import TenantService
+from app.services.permission_service import PermissionService
+from app.services.audit_pipeline import AuditPipeline, get_audit_pipeline
+import logging
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../shared'))
@@ -12,9 +15,18 @@ from shared.repositories.unit_of_work import SqlAlchemyUnitOfWork
 from shared.events.config import get_event_producer
 from shared.events.producer import EventProducer
 
+logger = logging.getLogger(__name__)
+
 def get_repository_factory(db: Session = Depends(get_db)) -> RepositoryFactory:
     """Internal dependency - not exposed to API"""
-    return RepositoryFactory(db)
+    factory = RepositoryFactory(db)
+    try:
+        yield factory
+    finally:
+        stats = factory.get_cache_stats()
+        if stats and stats["lookups"]:
+            logger.debug(f"Repository identity map: {stats}")
+        factory.close()
 
 def get_unit_of_work(db: Session = Depends(get_db)) -> SqlAlchemyUnitOfWork:
     """Internal dependency for transaction management"""
@@ -24,13 +36,20 @@ async def get_event_producer_dep() -> EventProducer:
     """Get event producer for auditing and logging"""
     return await get_event_producer()
 
+async def get_audit_pipeline_dep(
+    event_producer: EventProducer = Depends(get_event_producer_dep)
+) -> AuditPipeline:
+    """Get the batched audit pipeline"""
+    return await get_audit_pipeline(event_producer)
+
 # Service dependencies - these are what the API layer should use
 async def get_auth_service(
     repo_factory: RepositoryFactory = Depends(get_repository_factory),
-    event_producer: EventProducer = Depends(get_event_producer_dep)
+    event_producer: EventProducer = Depends(get_event_producer_dep),
+    audit_pipeline: AuditPipeline = Depends(get_audit_pipeline_dep)
 ) -> AuthService:
     """Get configured auth service"""
-    return AuthService(repo_factory, event_producer)
+    return AuthService(repo_factory, event_producer, audit_pipeline)
 
 async def get_user_service(
     repo_factory: RepositoryFactory = Depends(get_repository_factory),
@@ -44,4 +63,8 @@ async def get_tenant_service(
     event_producer: EventProducer = Depends(get_event_producer_dep)
 ) -> TenantService:
     """Get configured tenant service"""
-    return TenantService(repo_factory, event_producer)
\ No newline at end of file
+    return TenantService(repo_factory, event_producer)
+
+def get_permission_service(db: Session = Depends(get_db)) -> PermissionService:
+    """Get permission service backed by the shared permission cache"""
+    return PermissionService(db)
\ No newline at end of file
@@ -12,12 +12,15 @@ class AuditLog(Base):
     __tablename__ = "audit_logs"
     
     id = Column(pg_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    tenant_id = Column(pg_UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False, index=True)
+    # NULL for events before a tenant is known (failed logins, registrations)
+    tenant_id = Column(pg_UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=True, index=True)
     subject_type = Column(Text, nullable=False)  # user, tenant, session, etc.
-    subject_id = Column(pg_UUID(as_uuid=True), nullable=True)
+    subject_id = Column(pg_UUID(as_uuid=True), nullable=True)  # NULL for system subjects
     action = Column(Text, nullable=False)  # login, logout, create, update, delete
-    event_class = Column(Text, nullable=False)  # authentication, authorization, data_access
-    severity = Column(Text, nullable=False)  # low, medium, high, critical
+    # Values of the event_class / event_severity enums in database/audit_logs.sql;
+    # AuditService maps AuditEvent types and severities onto them
+    event_class = Column(Text, nullable=False)  # security, auth, admin, config, content, billing, workflow
+    severity = Column(Text, nullable=False)  # info, warning, error
     actor_user_id = Column(pg_UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     team_id = Column(pg_UUID(as_uuid=True), nullable=True)
     workspace_id = Column(pg_UUID(as_uuid=True), nullable=True)
@@ -1,6 +1,9 @@
 from typing import Optional, List
 from sqlalchemy.orm import Session
-from shared import BaseRepository
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
+from shared.repositories.base_repository import BaseRepository
 from app.models.tenant import Tenant
 
 class TenantRepository(BaseRepository[Tenant]):
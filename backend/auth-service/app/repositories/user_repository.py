@@ -2,8 +2,8 @@ from typing import Optional, List
 from sqlalchemy.orm import Session
 import sys
 import os
-sys.path.append('/Users/mohammad_shehab/develop/openbiocure-platform-ui/backend/shared')
-from repositories.base_repository import BaseRepository
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
+from shared.repositories.base_repository import BaseRepository
 from app.models.user import User
 
 class UserRepository(BaseRepository[User]):
@@ -14,7 +14,7 @@ class UserRepository(BaseRepository[User]):
     
     def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
-        return self.db.query(User).filter(User.email == email).first()
+        return self._remember(self.db.query(User).filter(User.email == email).first())
     
     def get_by_tenant(self, tenant_id: str, skip: int = 0, limit: int = 100) -> List[User]:
         """Get users by tenant"""
@@ -37,6 +37,6 @@ class UserRepository(BaseRepository[User]):
         user = self.get_by_id(user_id)
         if user:
             user.last_login = datetime.utcnow()
-            self.db.commit()
+            self._commit()
             return True
         return False
@@ -8,6 +8,7 @@ from .auth import (
 )
 from .user import UserResponse, UserCreate, UserUpdate
 from .tenant import TenantResponse, TenantCreate
+from .permission import PermissionCheck, BulkPermissionCheckRequest, BulkPermissionCheckResponse
 
 __all__ = [
     "UserLogin",
@@ -20,5 +21,8 @@ __all__ = [
     "UserCreate", 
     "UserUpdate",
     "TenantResponse",
-    "TenantCreate"
+    "TenantCreate",
+    "PermissionCheck",
+    "BulkPermissionCheckRequest",
+    "BulkPermissionCheckResponse"
 ]
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any
+
+# Upper bound on checks resolved in one bulk request
+MAX_BULK_PERMISSION_CHECKS = 500
+
+class PermissionCheck(BaseModel):
+    """Single (resource, action, context) permission check"""
+    resource: str = Field(..., description="Resource type (e.g. publications, workspace)")
+    action: str = Field(..., description="Action to perform (e.g. read, write)")
+    context: Optional[Dict[str, Any]] = Field(default=None, description="ABAC context for this check")
+
+class BulkPermissionCheckRequest(BaseModel):
+    """Many permission checks for one user, resolved in a single pass"""
+    user_id: str = Field(..., description="User UUID")
+    checks: List[PermissionCheck] = Field(..., max_length=MAX_BULK_PERMISSION_CHECKS, description="Checks to resolve")
+
+class BulkPermissionCheckResponse(BaseModel):
+    """Bulk permission check results, in request order"""
+    user_id: str = Field(..., description="User UUID")
+    results: List[bool] = Field(..., description="has_permission for each check, aligned with the request")
+    granted: int = Field(..., description="Number of granted checks")
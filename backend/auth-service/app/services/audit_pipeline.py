@@ -0,0 +1,218 @@
+"""
+Batched, asynchronous audit-event pipeline
+
+Auth endpoints enqueue audit events without awaiting any I/O. A background
+task drains the queue in batches (on size or time thresholds) and hands each
+batch to a sink: the event producer, or a bulk INSERT into audit_logs with a
+single commit. The queue is bounded; when it is full, events are dropped and
+counted rather than slowing down logins.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../../shared'))
+from shared.events.producer import EventProducer
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.audit_service import AuditService
+
+logger = logging.getLogger(__name__)
+
+# (topic, event, enqueued_at)
+QueuedEvent = Tuple[str, Dict[str, Any], float]
+
+
+class AuditSink(ABC):
+    """Destination for batches of audit events"""
+
+    @abstractmethod
+    async def write_batch(self, batch: List[QueuedEvent]) -> int:
+        """Write a batch and return how many events were persisted"""
+        pass
+
+
+class ProducerAuditSink(AuditSink):
+    """Forward audit events to the configured event producer"""
+
+    def __init__(self, event_producer: EventProducer):
+        self.event_producer = event_producer
+
+    async def write_batch(self, batch: List[QueuedEvent]) -> int:
+        results = await asyncio.gather(
+            *(self.event_producer.publish(topic, event, key=event.get("tenant_id")) for topic, event, _ in batch),
+            return_exceptions=True
+        )
+        return sum(1 for result in results if result is True)
+
+
+class DatabaseAuditSink(AuditSink):
+    """Bulk insert audit events into audit_logs, one commit per batch"""
+
+    async def write_batch(self, batch: List[QueuedEvent]) -> int:
+        return await asyncio.to_thread(self._write, [event for _, event, _ in batch])
+
+    @staticmethod
+    def _write(events: List[Dict[str, Any]]) -> int:
+        db = SessionLocal()
+        try:
+            return AuditService(db).log_security_events_bulk(events)
+        finally:
+            db.close()
+
+
+class AuditPipeline:
+    """Non-blocking audit queue flushed in batches by a background task"""
+
+    def __init__(self, sink: AuditSink, max_queue_size: int = 10000,
+                 batch_size: int = 100, flush_interval: float = 1.0):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._metrics = {
+            "enqueued": 0,
+            "dropped": 0,
+            "written": 0,
+            "failed": 0,
+            "batches": 0,
+            "lag_ms_total": 0.0,
+            "lag_ms_max": 0.0
+        }
+
+    def start(self):
+        """Start the background flush task on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def enqueue(self, topic: str, event: Dict[str, Any]) -> bool:
+        """Queue an event without waiting; returns False if it was dropped"""
+        try:
+            self._queue.put_nowait((topic, event, time.monotonic()))
+        except asyncio.QueueFull:
+            self._metrics["dropped"] += 1
+            if self._metrics["dropped"] % 1000 == 1:
+                logger.warning(f"Audit queue full, {self._metrics['dropped']} events dropped so far")
+            return False
+
+        self._metrics["enqueued"] += 1
+        return True
+
+    async def _run(self):
+        while not self._closing:
+            batch = await self._next_batch()
+            await self._flush(batch)
+
+    async def _next_batch(self) -> List[QueuedEvent]:
+        """Wait for the first event, then collect until the batch is full or the interval passes"""
+        try:
+            batch = [await asyncio.wait_for(self._queue.get(), self.flush_interval)]
+        except asyncio.TimeoutError:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    def _drain(self) -> List[QueuedEvent]:
+        batch = []
+        while not self._queue.empty() and len(batch) < self.batch_size:
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _flush(self, batch: List[QueuedEvent]):
+        if not batch:
+            return
+
+        lag_ms = (time.monotonic() - batch[0][2]) * 1000
+        try:
+            written = await self.sink.write_batch(batch)
+        except Exception as e:
+            logger.error(f"Failed to write audit batch of {len(batch)} events: {e}")
+            written = 0
+
+        metrics = self._metrics
+        metrics["batches"] += 1
+        metrics["written"] += written
+        metrics["failed"] += len(batch) - written
+        metrics["lag_ms_total"] += lag_ms
+        metrics["lag_ms_max"] = max(metrics["lag_ms_max"], lag_ms)
+
+    async def close(self, timeout: float = 10.0):
+        """Stop the background task and flush everything still queued"""
+        self._closing = True
+
+        async def flush_remaining():
+            # Let the background task finish its current batch first
+            if self._task is not None:
+                await self._task
+                self._task = None
+            while not self._queue.empty():
+                await self._flush(self._drain())
+
+        try:
+            await asyncio.wait_for(flush_remaining(), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Audit flush timed out with {self._queue.qsize()} events left")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = self._metrics
+        batches = metrics["batches"]
+        return {
+            "queued": self._queue.qsize(),
+            "enqueued": metrics["enqueued"],
+            "dropped": metrics["dropped"],
+            "written": metrics["written"],
+            "failed": metrics["failed"],
+            "batches": batches,
+            "avg_lag_ms": round(metrics["lag_ms_total"] / batches, 2) if batches else 0.0,
+            "max_lag_ms": round(metrics["lag_ms_max"], 2)
+        }
+
+
+# Global pipeline instance (singleton pattern)
+_pipeline: Optional[AuditPipeline] = None
+
+async def get_audit_pipeline(event_producer: EventProducer) -> AuditPipeline:
+    """Get the global audit pipeline, creating it with the configured sink"""
+    global _pipeline
+    if _pipeline is None:
+        if settings.get("audit.sink", "producer") == "database":
+            sink = DatabaseAuditSink()
+        else:
+            sink = ProducerAuditSink(event_producer)
+
+        _pipeline = AuditPipeline(
+            sink,
+            max_queue_size=settings.get("audit.max_queue_size", 10000),
+            batch_size=settings.get("audit.batch_size", 100),
+            flush_interval=settings.get("audit.flush_interval_seconds", 1.0)
+        )
+        _pipeline.start()
+    return _pipeline
+
+def get_audit_metrics() -> Optional[Dict[str, Any]]:
+    """Metrics of the global pipeline, or None if it has not been created yet"""
+    return _pipeline.get_metrics() if _pipeline else None
+
+async def close_audit_pipeline():
+    """Flush and close the global audit pipeline"""
+    global _pipeline
+    if _pipeline:
+        await _pipeline.close()
+        _pipeline = None
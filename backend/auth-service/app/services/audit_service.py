@@ -1,10 +1,41 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 import uuid
 
 from ..models.audit import AuditLog
 
+# AuditEvent severities and event types mapped onto the event_severity and
+# event_class enums of database/audit_logs.sql
+DB_SEVERITIES = ("info", "warning", "error")
+DB_EVENT_CLASSES = ("security", "auth", "admin", "config", "content", "billing", "workflow")
+SEVERITY_LEVELS = {
+    "low": "info",
+    "medium": "warning",
+    "high": "error",
+    "critical": "error"
+}
+EVENT_CLASSES = {
+    "access": "security",
+    "create": "admin",
+    "update": "admin",
+    "delete": "admin"
+}
+
+def _audit_classification(event_type: str, severity: str, details: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Database event_class, severity and payload for an event; the original labels stay in the payload"""
+    event_class = EVENT_CLASSES.get(event_type, event_type)
+    level = SEVERITY_LEVELS.get(severity, severity)
+    payload = dict(details or {})
+    payload.setdefault("event_type", event_type)
+    payload.setdefault("severity", severity)
+    return {
+        "event_class": event_class if event_class in DB_EVENT_CLASSES else "security",
+        "severity": level if level in DB_SEVERITIES else "info",
+        "payload": payload
+    }
+
 class AuditService:
     """
     Audit service for comprehensive security logging
@@ -34,14 +65,12 @@ class AuditService:
             subject_type="user" if user_id else "system",
             subject_id=user_id,
             action=action,
-            event_class=event_type,
-            severity=severity,
             actor_user_id=user_id,
             request_id=correlation_id or str(uuid.uuid4()),
             source_service="auth-service",
             ip=ip_address,
             user_agent=user_agent,
-            payload=details or {}
+            **_audit_classification(event_type, severity, details)
         )
         
         self.db.add(audit_log)
@@ -50,6 +79,40 @@ class AuditService:
         
         return audit_log
     
+    def log_security_events_bulk(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Insert a batch of AuditEvent dicts with a single statement and commit
+        Events without a tenant (failed logins, registrations) are stored with
+        a NULL tenant_id; they are the ones security reviews need most
+        """
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "tenant_id": event.get("tenant_id") or None,
+                "subject_type": "user" if event.get("user_id") else "system",
+                "subject_id": event.get("user_id"),
+                "action": event["action"],
+                "actor_user_id": event.get("user_id"),
+                "request_id": event.get("correlation_id") or event.get("event_id") or str(uuid.uuid4()),
+                "source_service": event.get("service", "auth-service"),
+                "ip": event.get("ip_address"),
+                "user_agent": event.get("user_agent"),
+                **_audit_classification(event["event_type"], event.get("severity", "medium"), event.get("details"))
+            }
+            for event in events
+        ]
+        if not rows:
+            return 0
+        
+        try:
+            self.db.execute(insert(AuditLog), rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return len(rows)
+    
     async def get_tenant_audit_logs(
         self,
         tenant_id: str,
@@ -64,9 +127,9 @@ class AuditService:
         query = self.db.query(AuditLog).filter(AuditLog.tenant_id == tenant_id)
         
         if severity:
-            query = query.filter(AuditLog.severity == severity)
+            query = query.filter(AuditLog.severity == SEVERITY_LEVELS.get(severity, severity))
         
         if event_type:
-            query = query.filter(AuditLog.event_class == event_type)
+            query = query.filter(AuditLog.event_class == EVENT_CLASSES.get(event_type, event_type))
         
         return query.order_by(AuditLog.occurred_at.desc()).offset(offset).limit(limit).all()
@@ -10,23 +10,27 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../../../shared'))
 from shared.repositories.repository_factory import RepositoryFactory
 from shared.events.producer import EventProducer
 from shared.events.schemas import AuditEvent
+from app.services.audit_pipeline import AuditPipeline
 
 class AuthService:
     """Clean auth service using repository pattern with auditing"""
     
-    def __init__(self, repository_factory: RepositoryFactory, event_producer: EventProducer):
+    def __init__(self, repository_factory: RepositoryFactory, event_producer: EventProducer,
+                 audit_pipeline: AuditPipeline):
         self.user_repo = repository_factory.create_repository(UserRepository, User)
         self.tenant_repo = repository_factory.create_repository(TenantRepository, Tenant)
         self.delegator = AuthDelegator(self.user_repo, self.tenant_repo)
         self.event_producer = event_producer
+        # Audit events are queued and written in batches off the request path
+        self.audit_pipeline = audit_pipeline
     
     async def login(self, email: str, password: str, ip_address: str = None, user_agent: str = None) -> Dict[str, Any]:
         """Authenticate user and return tokens"""
         try:
-            auth_data = self.delegator.validate_login_credentials(email, password)
+            auth_data = await self.delegator.validate_login_credentials(email, password)
             if not auth_data:
                 # Audit failed login
-                await self.event_producer.publish("audit.auth", AuditEvent(
+                self.audit_pipeline.enqueue("audit.auth", AuditEvent(
                     service="auth-service",
                     action="login_failed",
                     resource_type="user",
@@ -44,7 +48,7 @@ class AuthService:
             tokens = self.delegator.create_user_tokens(user.id, tenant.id)
             
             # Audit successful login
-            await self.event_producer.publish("audit.auth", AuditEvent(
+            self.audit_pipeline.enqueue("audit.auth", AuditEvent(
                 service="auth-service",
                 tenant_id=tenant.id,
                 user_id=user.id,
@@ -70,7 +74,7 @@ class AuthService:
             }
         except Exception as e:
             # Audit system error
-            await self.event_producer.publish("audit.auth", AuditEvent(
+            self.audit_pipeline.enqueue("audit.auth", AuditEvent(
                 service="auth-service",
                 action="login_error",
                 resource_type="user",
@@ -85,7 +89,7 @@ class AuthService:
     async def register(self, email: str, password: str, name: str, user_type: str = "individual") -> Dict[str, Any]:
         """Register new user"""
         try:
-            user_data = self.delegator.validate_registration_data(email, password, name)
+            user_data = await self.delegator.validate_registration_data(email, password, name)
             tenant_id = self.delegator.determine_user_tenant(user_type)
             
             user_data.update({
@@ -97,7 +101,7 @@ class AuthService:
             tokens = self.delegator.create_user_tokens(user.id, tenant_id)
             
             # Audit user registration
-            await self.event_producer.publish("audit.auth", AuditEvent(
+            self.audit_pipeline.enqueue("audit.auth", AuditEvent(
                 service="auth-service",
                 tenant_id=tenant_id,
                 user_id=user.id,
@@ -121,7 +125,7 @@ class AuthService:
             }
         except Exception as e:
             # Audit registration failure
-            await self.event_producer.publish("audit.auth", AuditEvent(
+            self.audit_pipeline.enqueue("audit.auth", AuditEvent(
                 service="auth-service",
                 action="registration_failed",
                 resource_type="user",
@@ -136,7 +140,7 @@ class AuthService:
         result = self.delegator.create_user_tokens(user_id, tenant_id)
         
         # Audit token refresh
-        await self.event_producer.publish("audit.auth", AuditEvent(
+        self.audit_pipeline.enqueue("audit.auth", AuditEvent(
             service="auth-service",
             tenant_id=tenant_id,
             user_id=user_id,
@@ -1,11 +1,12 @@
 """
 Permission Service for RBAC + ABAC + OPA integration
 """
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, FrozenSet, List, Optional, Any, Tuple
 from sqlalchemy.orm import Session
-from app.models.permissions import Role, Permission, TenantSecurityPolicy
+from app.models.permissions import Role, Permission, TenantSecurityPolicy, UserProjectMembership
 from app.models.user import User
-from app.models.tenant import Tenant
+from app.core.permission_cache import RoleSnapshot, permission_cache
+from app.core.abac import AbacSubject, evaluate_grant
 import json
 import logging
 
@@ -21,6 +22,9 @@ class PermissionService:
         """
         Check if user has permission to perform action on resource
         
+        Decisions are served from the cached, compiled permission set of the
+        user's role, so a warm check runs no database queries.
+        
         Args:
             user: User object
             resource: Resource type (e.g., "publications", "workspace")
@@ -31,149 +35,193 @@ class PermissionService:
             bool: True if permission granted, False otherwise
         """
         try:
+            snapshot = self._get_role_snapshot(user)
+            
             # 1. Check RBAC permissions
-            rbac_allowed = self._check_rbac(user, resource, action)
+            rbac_allowed = self._check_rbac(user, snapshot, resource, action)
             if not rbac_allowed:
-                logger.info(f"RBAC denied: User {user.id} cannot {action} {resource}")
+                logger.debug(f"RBAC denied: User {user.id} cannot {action} {resource}")
                 return False
             
             # 2. Check ABAC conditions
-            abac_allowed = self._check_abac(user, resource, action, context or {})
+            abac_allowed = self._check_abac(self._build_subject(user), snapshot, resource, action, context or {})
             if not abac_allowed:
-                logger.info(f"ABAC denied: User {user.id} cannot {action} {resource} due to context")
+                logger.debug(f"ABAC denied: User {user.id} cannot {action} {resource} due to context")
                 return False
             
             # 3. Check OPA policies if configured
-            if self._has_opa_policies(user.tenant):
+            if self._has_opa_policies(user.tenant_id):
                 opa_allowed = self._check_opa(user, resource, action, context or {})
                 if not opa_allowed:
-                    logger.info(f"OPA denied: User {user.id} cannot {action} {resource}")
+                    logger.debug(f"OPA denied: User {user.id} cannot {action} {resource}")
                     return False
             
-            logger.info(f"Permission granted: User {user.id} can {action} {resource}")
+            logger.debug(f"Permission granted: User {user.id} can {action} {resource}")
             return True
             
         except Exception as e:
             logger.error(f"Error checking permission: {e}")
             return False
     
-    def _check_rbac(self, user: User, resource: str, action: str) -> bool:
+    def check_permissions_bulk(self, user: User, checks: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Check many (resource, action, context) tuples for one user in a single pass
+        
+        The role snapshot, ABAC subject and tenant OPA flag are resolved once
+        and shared by every check.
+        
+        Args:
+            user: User object
+            checks: Dicts with "resource", "action" and optional "context"
+            
+        Returns:
+            List[bool]: One decision per check, in the same order
+        """
+        try:
+            snapshot = self._get_role_snapshot(user)
+            if snapshot is None or not snapshot.is_active:
+                logger.debug(f"RBAC denied: User {user.id} has no active role")
+                return [False] * len(checks)
+            
+            subject = self._build_subject(user)
+            has_opa = None
+            results = []
+            
+            for check in checks:
+                resource = check["resource"]
+                action = check["action"]
+                context = check.get("context") or {}
+                
+                allowed = (
+                    (resource, action) in snapshot.grants
+                    and self._check_abac(subject, snapshot, resource, action, context)
+                )
+                
+                if allowed:
+                    if has_opa is None:
+                        has_opa = self._has_opa_policies(user.tenant_id)
+                    if has_opa:
+                        allowed = self._check_opa(user, resource, action, context)
+                
+                results.append(allowed)
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error checking permissions in bulk: {e}")
+            return [False] * len(checks)
+    
+    def get_user(self, user_id: str) -> Optional[User]:
+        """Get user by ID for permission checks"""
+        try:
+            return self.db.query(User).filter(User.id == user_id).first()
+        except Exception as e:
+            logger.error(f"Error loading user {user_id}: {e}")
+            return None
+    
+    def _get_role_snapshot(self, user: User) -> Optional[RoleSnapshot]:
+        """Get the compiled permission set of the user's role, loading it on a cache miss"""
+        if not user.role_id:
+            return None
+        
+        snapshot = permission_cache.get_role(user.role_id)
+        if snapshot is None:
+            # Taken before the load so a concurrent invalidation wins
+            generation = permission_cache.generation(user.role_id)
+            snapshot = self._load_role_snapshot(user.role_id)
+            if snapshot is not None:
+                permission_cache.set_role(snapshot, generation)
+        
+        return snapshot
+    
+    def _load_role_snapshot(self, role_id: str) -> Optional[RoleSnapshot]:
+        """Compile a role and all of its active permissions into a snapshot"""
+        role = self.db.query(Role).filter(Role.id == role_id).first()
+        if not role:
+            return None
+        
+        grants: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        permissions = self.db.query(Permission).filter(
+            Permission.role_id == role.id,
+            Permission.is_active == True
+        ).all()
+        
+        for permission in permissions:
+            conditions = grants.setdefault((permission.resource, permission.action), [])
+            if permission.conditions is not None:
+                conditions.append(permission.conditions)
+        
+        return RoleSnapshot(
+            role_id=str(role.id),
+            tenant_id=str(role.tenant_id),
+            is_active=bool(role.is_active),
+            grants=grants
+        )
+    
+    def _check_rbac(self, user: User, snapshot: Optional[RoleSnapshot], resource: str, action: str) -> bool:
         """Check Role-Based Access Control permissions"""
         try:
             # Get user's role and permissions
-            if not user.role:
+            if snapshot is None:
                 logger.warning(f"User {user.id} has no role assigned")
                 return False
             
             # Check if role is active
-            if not user.role.is_active:
-                logger.warning(f"User {user.id} has inactive role {user.role.name}")
+            if not snapshot.is_active:
+                logger.warning(f"User {user.id} has inactive role {snapshot.role_id}")
                 return False
             
-            # Check permissions for this role
-            permissions = self.db.query(Permission).filter(
-                Permission.role_id == user.role.id,
-                Permission.resource == resource,
-                Permission.action == action,
-                Permission.is_active == True
-            ).all()
-            
-            return len(permissions) > 0
+            return (resource, action) in snapshot.grants
             
         except Exception as e:
             logger.error(f"Error checking RBAC: {e}")
             return False
     
-    def _check_abac(self, user: User, resource: str, action: str, context: Dict[str, Any]) -> bool:
+    def _check_abac(self, subject: AbacSubject, snapshot: RoleSnapshot, resource: str, action: str, context: Dict[str, Any]) -> bool:
         """Check Attribute-Based Access Control conditions"""
         try:
-            # Get user's role permissions with conditions
-            permissions = self.db.query(Permission).filter(
-                Permission.role_id == user.role.id,
-                Permission.resource == resource,
-                Permission.action == action,
-                Permission.is_active == True,
-                Permission.conditions.isnot(None)
-            ).all()
-            
-            if not permissions:
-                # No ABAC conditions, default to allow
-                return True
-            
-            # Evaluate each permission's conditions
-            for permission in permissions:
-                if self._evaluate_conditions(user, permission.conditions, context):
-                    return True
-            
-            return False
+            # Grants without conditions compile to None and always pass
+            return evaluate_grant(snapshot.compiled.get((resource, action)), subject, context)
             
         except Exception as e:
             logger.error(f"Error checking ABAC: {e}")
             return False
     
-    def _evaluate_conditions(self, user: User, conditions: Dict[str, Any], context: Dict[str, Any]) -> bool:
-        """Evaluate ABAC conditions against user and context"""
-        try:
-            if not conditions:
-                return True
-            
-            # Example conditions structure:
-            # {
-            #     "user_tenant_match": "user.tenant_id == resource.tenant_id",
-            #     "project_membership": "user.id in resource.project.members"
-            # }
-            
-            for condition_name, condition_value in conditions.items():
-                if not self._evaluate_single_condition(user, condition_name, condition_value, context):
-                    return False
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error evaluating conditions: {e}")
-            return False
+    def _build_subject(self, user: User) -> AbacSubject:
+        """Build the ABAC subject for a user with lazily loaded project memberships"""
+        return AbacSubject(user.id, user.tenant_id, lambda: self._get_user_projects(user))
     
-    def _evaluate_single_condition(self, user: User, condition_name: str, condition_value: Any, context: Dict[str, Any]) -> bool:
-        """Evaluate a single ABAC condition"""
-        try:
-            if condition_name == "user_tenant_match":
-                return user.tenant_id == context.get("resource_tenant_id")
-            
-
-            
-            elif condition_name == "project_membership":
-                project_id = context.get("project_id")
-                if not project_id:
-                    return False
-                return any(m.project_id == project_id for m in user.project_memberships)
-            
-            elif condition_name == "resource_owner":
-                resource_owner_id = context.get("resource_owner_id")
-                return user.id == resource_owner_id
-            
-            elif condition_name == "time_based":
-                # Example: Only allow access during business hours
-                import datetime
-                now = datetime.datetime.now()
-                return 9 <= now.hour <= 17
-            
-            # Default to True for unknown conditions
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error evaluating condition {condition_name}: {e}")
-            return False
+    def _get_user_projects(self, user: User) -> FrozenSet[str]:
+        """Get the IDs of the projects a user is an active member of"""
+        project_ids = permission_cache.get_user_projects(user.id)
+        if project_ids is None:
+            generation = permission_cache.generation()
+            rows = self.db.query(UserProjectMembership.project_id).filter(
+                UserProjectMembership.user_id == user.id,
+                UserProjectMembership.is_active == True
+            ).all()
+            project_ids = frozenset(str(row.project_id) for row in rows)
+            permission_cache.set_user_projects(user.id, project_ids, generation)
+        
+        return project_ids
     
-    def _has_opa_policies(self, tenant: Tenant) -> bool:
+    def _has_opa_policies(self, tenant_id: str) -> bool:
         """Check if tenant has OPA policies configured"""
         try:
+            cached = permission_cache.get_tenant_opa(tenant_id)
+            if cached is not None:
+                return cached
+            
+            generation = permission_cache.generation()
             policies = self.db.query(TenantSecurityPolicy).filter(
-                TenantSecurityPolicy.tenant_id == tenant.id,
+                TenantSecurityPolicy.tenant_id == tenant_id,
                 TenantSecurityPolicy.policy_type == "opa",
                 TenantSecurityPolicy.is_active == True
             ).count()
             
-            return policies > 0
+            has_policies = policies > 0
+            permission_cache.set_tenant_opa(tenant_id, has_policies, generation)
+            return has_policies
             
         except Exception as e:
             logger.error(f"Error checking OPA policies: {e}")
@@ -189,7 +237,7 @@ class PermissionService:
             # 3. Return the decision
             
             # For now, return True (allow) if OPA is not fully implemented
-            logger.info(f"OPA check placeholder: User {user.id} {action} {resource}")
+            logger.debug(f"OPA check placeholder: User {user.id} {action} {resource}")
             return True
             
         except Exception as e:
@@ -234,6 +282,8 @@ class PermissionService:
             self.db.commit()
             self.db.refresh(role)
             
+            permission_cache.invalidate_role(role.id)
+            
             return role
             
         except Exception as e:
@@ -255,6 +305,8 @@ class PermissionService:
             self.db.commit()
             self.db.refresh(permission)
             
+            permission_cache.invalidate_role(role_id)
+            
             return permission
             
         except Exception as e:
@@ -262,6 +314,118 @@ class PermissionService:
             self.db.rollback()
             return None
     
+    def add_project_member(self, user_id: str, project_id: str, role: str = "member") -> Optional[UserProjectMembership]:
+        """Add a user to a project, or reactivate and update an existing membership"""
+        try:
+            membership = self.db.query(UserProjectMembership).filter(
+                UserProjectMembership.user_id == user_id,
+                UserProjectMembership.project_id == project_id
+            ).first()
+            
+            if membership:
+                membership.role = role
+                membership.is_active = True
+            else:
+                membership = UserProjectMembership(
+                    user_id=user_id,
+                    project_id=project_id,
+                    role=role
+                )
+                self.db.add(membership)
+            
+            self.db.commit()
+            self.db.refresh(membership)
+            
+            self.invalidate_user_memberships(user_id)
+            
+            return membership
+            
+        except Exception as e:
+            logger.error(f"Error adding project member: {e}")
+            self.db.rollback()
+            return None
+    
+    def remove_project_member(self, user_id: str, project_id: str) -> bool:
+        """Deactivate a user's membership in a project"""
+        try:
+            updated = self.db.query(UserProjectMembership).filter(
+                UserProjectMembership.user_id == user_id,
+                UserProjectMembership.project_id == project_id,
+                UserProjectMembership.is_active == True
+            ).update({"is_active": False})
+            self.db.commit()
+            
+            self.invalidate_user_memberships(user_id)
+            
+            return updated > 0
+            
+        except Exception as e:
+            logger.error(f"Error removing project member: {e}")
+            self.db.rollback()
+            return False
+    
+    def create_tenant_policy(self, tenant_id: str, policy_name: str, policy_type: str,
+                             policy_content: Dict[str, Any], created_by: str) -> Optional[TenantSecurityPolicy]:
+        """Add a security policy to a tenant"""
+        try:
+            policy = TenantSecurityPolicy(
+                tenant_id=tenant_id,
+                policy_name=policy_name,
+                policy_type=policy_type,
+                policy_content=policy_content,
+                created_by=created_by
+            )
+            
+            self.db.add(policy)
+            self.db.commit()
+            self.db.refresh(policy)
+            
+            self.invalidate_tenant_policies(tenant_id)
+            
+            return policy
+            
+        except Exception as e:
+            logger.error(f"Error creating tenant policy: {e}")
+            self.db.rollback()
+            return None
+    
+    def update_tenant_policy(self, policy_id: str, policy_content: Optional[Dict[str, Any]] = None,
+                             is_active: Optional[bool] = None) -> Optional[TenantSecurityPolicy]:
+        """Replace a tenant policy's content and/or (de)activate it"""
+        try:
+            policy = self.db.query(TenantSecurityPolicy).filter(TenantSecurityPolicy.id == policy_id).first()
+            if not policy:
+                return None
+            
+            if policy_content is not None:
+                policy.policy_content = policy_content
+            if is_active is not None:
+                policy.is_active = is_active
+            
+            self.db.commit()
+            self.db.refresh(policy)
+            
+            self.invalidate_tenant_policies(policy.tenant_id)
+            
+            return policy
+            
+        except Exception as e:
+            logger.error(f"Error updating tenant policy: {e}")
+            self.db.rollback()
+            return None
+    
+    def invalidate_role_permissions(self, role_id: str):
+        """Invalidate cached decisions after a role or its permissions were changed directly"""
+        permission_cache.invalidate_role(role_id)
+    
+    def invalidate_user_memberships(self, user_id: str):
+        """Invalidate cached project memberships after a membership write"""
+        permission_cache.invalidate_user(user_id)
+    
+    def invalidate_tenant_policies(self, tenant_id: str):
+        """Invalidate cached policy state after a tenant security policy write"""
+        permission_cache.invalidate_tenant(tenant_id)
+    
     def create_default_roles(self, tenant_id: str) -> bool:
         """Create default roles for a new tenant"""
         try:
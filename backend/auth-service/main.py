@@ -1,10 +1,13 @@
 import os
 import sys
 
-# Add shared directory to Python path BEFORE any other imports
-shared_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'shared'))
+# Add the backend directory (for shared.*) and the shared directory to Python path BEFORE any other imports
+backend_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+shared_path = os.path.join(backend_path, 'shared')
 sys.path.insert(0, shared_path)
+sys.path.insert(0, backend_path)
 
+import asyncio
 import json
 import uuid
 from datetime import datetime, timedelta
@@ -21,8 +24,14 @@ from app.core.config import settings
 from app.services.auth_service import AuthService
 from app.services.permission_service import PermissionService
 from app.schemas.auth import LoginRequest, RegisterRequest, TokenResponse
+from app.schemas.permission import BulkPermissionCheckRequest, BulkPermissionCheckResponse
 from app.dependencies import get_auth_service, get_permission_service
-from app.core.security import security
+from app.core.security import security as security_manager, password_hasher
+from app.core.password_hasher import HashingOverloadedError
+from app.core.token_store import create_token_store, TokenStoreUnavailableError
+from app.services.audit_pipeline import close_audit_pipeline, get_audit_metrics
+from shared.events.config import close_event_producer
+from shared.utils.database_engine import get_database_metrics
 from app.models.user import User
 from app.models.tenant import Tenant
 from app.models.permissions import Role, Permission
@@ -50,8 +59,18 @@ security = HTTPBearer()
 # Service registry configuration
 SERVICE_REGISTRY_URL = os.getenv("SERVICE_REGISTRY_URL", "http://localhost:8001")
 
-# Token store for opaque tokens (in production, use Redis)
-token_store = {}
+# Token store for opaque tokens (Redis, shared across workers; fails closed while Redis is down)
+token_store = create_token_store()
+
+# How long clients may cache the JWKS document (seconds)
+JWKS_MAX_AGE = settings.get("jwt.jwks_max_age_seconds", 300)
+
+# Lifetime of opaque service tokens
+SERVICE_TOKEN_TTL = timedelta(hours=24)
+
+# Scheduled JWT signing key rotation (0 disables)
+KEY_ROTATION_INTERVAL = timedelta(hours=settings.get("jwt.rotation_interval_hours", 720))
+KEY_ROTATION_CHECK_SECONDS = settings.get("jwt.rotation_check_seconds", 3600)
 
 def get_token(opaque_token: str) -> Optional[dict]:
     """Get token info from store"""
@@ -60,19 +79,52 @@ def get_token(opaque_token: str) -> Optional[dict]:
 # Store the token store function for access by other functions
 get_token.token_store = token_store
 
+async def rotate_signing_keys():
+    """Rotate the signing key once it is older than the interval; every worker checks, one rotates"""
+    while True:
+        try:
+            await asyncio.to_thread(security_manager.key_ring.rotate, KEY_ROTATION_INTERVAL)
+        except Exception as e:
+            print(f"Signing key rotation failed: {e}")
+        await asyncio.sleep(KEY_ROTATION_CHECK_SECONDS)
+
 @app.on_event("startup")
 async def startup_event():
     print("Auth Service starting up...")
     print(f"Service Registry URL: {SERVICE_REGISTRY_URL}")
+    app.state.key_rotation_task = None
+    if security_manager.key_ring and KEY_ROTATION_INTERVAL:
+        app.state.key_rotation_task = asyncio.create_task(rotate_signing_keys())
 
 @app.on_event("shutdown")
 async def shutdown_event():
     print("Auth Service shutting down...")
+    if app.state.key_rotation_task:
+        app.state.key_rotation_task.cancel()
+    # Flush queued audit events before the process exits
+    await close_audit_pipeline()
+    await close_event_producer()
+    password_hasher.shutdown()
 
 # Health check
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "auth-service", "timestamp": datetime.utcnow().isoformat()}
+    return {
+        "status": "healthy",
+        "service": "auth-service",
+        "timestamp": datetime.utcnow().isoformat(),
+        "password_hashing": password_hasher.get_metrics(),
+        "audit": get_audit_metrics(),
+        "database": get_database_metrics()
+    }
+
+# Public signing keys for offline JWT verification by other services
+@app.get("/.well-known/jwks.json")
+async def jwks():
+    return JSONResponse(
+        content=security_manager.get_jwks(),
+        headers={"Cache-Control": f"public, max-age={JWKS_MAX_AGE}"}
+    )
 
 # Service registry endpoints
 @app.get("/api/v1/services")
@@ -109,6 +161,8 @@ async def login(request: LoginRequest, req: Request, auth_service: AuthService =
         )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+    except HashingOverloadedError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
 
 @app.post("/api/v1/auth/register", response_model=TokenResponse)
 async def register(request: RegisterRequest, auth_service: AuthService = Depends(get_auth_service)):
@@ -116,6 +170,8 @@ async def register(request: RegisterRequest, auth_service: AuthService = Depends
         return await auth_service.register(request.email, request.password, request.name, request.type or "individual")
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except HashingOverloadedError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
 
 @app.post("/api/v1/auth/refresh")
 async def refresh_token(user_id: str, tenant_id: str, auth_service: AuthService = Depends(get_auth_service)):
@@ -151,17 +207,19 @@ async def service_auth(request: Request):
         
         # Generate opaque token for service
         opaque_token = str(uuid.uuid4())
-        expires_at = datetime.utcnow() + timedelta(hours=24)
+        expires_at = datetime.utcnow() + SERVICE_TOKEN_TTL
         
-        token_store[opaque_token] = {
+        stored = token_store.put(opaque_token, {
             "service_id": service_id,
             "scope": requested_scope,
             "expires_at": expires_at,
-            "jwt": security.create_access_token(
+            "jwt": security_manager.create_access_token(
                 data={"sub": service_id, "scope": requested_scope, "type": "service"},
-                expires_delta=timedelta(hours=24)
+                expires_delta=SERVICE_TOKEN_TTL
             )
-        }
+        }, int(SERVICE_TOKEN_TTL.total_seconds()))
+        if not stored:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Token store unavailable", headers={"Retry-After": "1"})
         
         return {
             "opaque_token": opaque_token,
@@ -169,6 +227,8 @@ async def service_auth(request: Request):
             "scope": requested_scope
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Service auth error: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Service authentication failed")
@@ -185,14 +245,17 @@ async def exchange_token(request: Request):
         if not opaque_token:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing opaque token")
         
-        # Get token info
-        token_info = token_store.get(opaque_token)
+        # Get token info; an unreachable store fails closed
+        try:
+            token_info = token_store.get(opaque_token)
+        except TokenStoreUnavailableError:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Token store unavailable", headers={"Retry-After": "1"})
         if not token_info:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
         
         # Check if token is expired
         if token_info['expires_at'] < datetime.utcnow():
-            del token_store[opaque_token]
+            token_store.delete(opaque_token)
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
         
         # Check scope
@@ -205,6 +268,8 @@ async def exchange_token(request: Request):
             "expires_at": token_info['expires_at'].isoformat()
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Token exchange error: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Token exchange failed")
@@ -214,8 +279,13 @@ async def exchange_token(request: Request):
 async def get_user_permissions(user_id: str, permission_service: PermissionService = Depends(get_permission_service)):
     """Get user permissions"""
     try:
-        permissions = await permission_service.get_user_permissions(user_id)
+        user = permission_service.get_user(user_id)
+        if not user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        permissions = permission_service.get_user_permissions(user)
         return {"user_id": user_id, "permissions": permissions}
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Failed to get user permissions: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to get permissions")
@@ -229,17 +299,47 @@ async def check_permission(
 ):
     """Check if user has permission for resource/action"""
     try:
-        has_permission = await permission_service.check_permission(user_id, resource, action)
+        user = permission_service.get_user(user_id)
+        if not user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        has_permission = permission_service.check_permission(user, resource, action)
         return {
             "user_id": user_id,
             "resource": resource,
             "action": action,
             "has_permission": has_permission
         }
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Failed to check permission: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to check permission")
 
+@app.post("/api/v1/permissions/check/bulk", response_model=BulkPermissionCheckResponse)
+async def check_permissions_bulk(
+    request: BulkPermissionCheckRequest,
+    permission_service: PermissionService = Depends(get_permission_service)
+):
+    """Check many resource/action pairs for a user in one request"""
+    try:
+        user = permission_service.get_user(request.user_id)
+        if not user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        results = permission_service.check_permissions_bulk(
+            user,
+            [check.dict() for check in request.checks]
+        )
+        return BulkPermissionCheckResponse(
+            user_id=request.user_id,
+            results=results,
+            granted=sum(results)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Failed to check permissions in bulk: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to check permissions")
+
 # Utility functions
 def validate_service_credentials(service_id: str, service_secret: str) -> bool:
     """Validate service credentials (simplified for MVP)"""
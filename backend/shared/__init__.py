@@ -0,0 +1,3 @@
+"""
+Code shared by the backend microservices (events, repositories, utils, auth)
+"""
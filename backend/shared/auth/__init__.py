@@ -0,0 +1,3 @@
+from .jwt_verifier import JWKSVerifier
+
+__all__ = ["JWKSVerifier"]
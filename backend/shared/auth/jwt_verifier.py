@@ -0,0 +1,119 @@
+from typing import Any, Dict, Optional, Sequence
+import logging
+import os
+import threading
+import time
+
+import httpx
+from jose import JWTError, jwk, jwt
+
+class JWKSVerifier:
+    """Offline JWT verification against the auth-service JWKS endpoint
+
+    Public keys are fetched once, parsed and cached by kid, so verifying a
+    token is a local signature check. The key set is re-fetched when it
+    expires or when a token carries an unknown kid (after a key rotation),
+    rate-limited by `min_refresh_interval`.
+    """
+    
+    def __init__(
+        self,
+        jwks_url: Optional[str] = None,
+        algorithms: Sequence[str] = ("ES256", "RS256"),
+        cache_ttl: int = 300,
+        min_refresh_interval: int = 10,
+        timeout: float = 5.0
+    ):
+        self.jwks_url = jwks_url or os.getenv(
+            "AUTH_JWKS_URL", "http://localhost:8000/.well-known/jwks.json"
+        )
+        self.algorithms = list(algorithms)
+        self.cache_ttl = cache_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self._keys: Dict[str, Any] = {}
+        self._fetched_at = 0.0
+        self._last_attempt = 0.0
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+    
+    def _load_jwks(self, jwks: Dict[str, Any]):
+        """Parse a JWK Set into verification keys"""
+        keys = {}
+        for key_data in jwks.get("keys", []):
+            kid = key_data.get("kid")
+            alg = key_data.get("alg")
+            if not kid or alg not in self.algorithms:
+                continue
+            try:
+                keys[kid] = jwk.construct(key_data, alg)
+            except Exception as e:
+                self.logger.warning(f"Skipping unusable JWK {kid}: {e}")
+        
+        with self._lock:
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+    
+    def _needs_refresh(self, kid: Optional[str]) -> bool:
+        now = time.monotonic()
+        if now - self._last_attempt < self.min_refresh_interval:
+            return False
+        age = now - self._fetched_at
+        if age > self.cache_ttl:
+            return True
+        return kid not in self._keys
+    
+    def refresh(self):
+        """Fetch the key set synchronously"""
+        self._last_attempt = time.monotonic()
+        try:
+            response = httpx.get(self.jwks_url, timeout=self.timeout)
+            response.raise_for_status()
+            self._load_jwks(response.json())
+        except Exception as e:
+            self.logger.error(f"Failed to fetch JWKS from {self.jwks_url}: {e}")
+    
+    async def refresh_async(self):
+        """Fetch the key set without blocking the event loop"""
+        self._last_attempt = time.monotonic()
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.get(self.jwks_url)
+                response.raise_for_status()
+            self._load_jwks(response.json())
+        except Exception as e:
+            self.logger.error(f"Failed to fetch JWKS from {self.jwks_url}: {e}")
+    
+    def _decode(self, token: str, kid: Optional[str], **options) -> Optional[Dict[str, Any]]:
+        key = self._keys.get(kid)
+        if key is None:
+            return None
+        try:
+            return jwt.decode(token, key, algorithms=self.algorithms, **options)
+        except JWTError:
+            return None
+    
+    @staticmethod
+    def _get_kid(token: str) -> Optional[str]:
+        try:
+            return jwt.get_unverified_header(token).get("kid")
+        except JWTError:
+            return None
+    
+    def verify(self, token: str, **options) -> Optional[Dict[str, Any]]:
+        """Verify a token and return its claims, or None if invalid"""
+        kid = self._get_kid(token)
+        if kid is None:
+            return None
+        if self._needs_refresh(kid):
+            self.refresh()
+        return self._decode(token, kid, **options)
+    
+    async def verify_async(self, token: str, **options) -> Optional[Dict[str, Any]]:
+        """Verify a token, fetching keys asynchronously when needed"""
+        kid = self._get_kid(token)
+        if kid is None:
+            return None
+        if self._needs_refresh(kid):
+            await self.refresh_async()
+        return self._decode(token, kid, **options)
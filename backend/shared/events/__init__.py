@@ -1,4 +1,5 @@
-from .producer import EventProducer, InMemoryEventProducer, FileEventProducer
+from .producer import EventProducer, InMemoryEventProducer, FileEventProducer, KafkaEventProducer
+from .file_log import FileEventReader
 from .schemas import AuditEvent, LogEvent
 
-__all__ = ["EventProducer", "InMemoryEventProducer", "FileEventProducer", "AuditEvent", "LogEvent"]
+__all__ = ["EventProducer", "InMemoryEventProducer", "FileEventProducer", "KafkaEventProducer", "FileEventReader", "AuditEvent", "LogEvent"]
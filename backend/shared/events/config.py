@@ -10,12 +10,25 @@ class EventConfig:
         """Get producer configuration from environment"""
         return {
             "type": os.getenv("EVENT_PRODUCER_TYPE", "memory"),  # memory, file, kafka
+            "memory_capacity": int(os.getenv("EVENT_MEMORY_CAPACITY", "10000")),
             "file_base_path": os.getenv("EVENT_FILE_PATH", "/tmp/events"),
+            "file_config": {
+                "flush_interval": float(os.getenv("EVENT_FILE_FLUSH_INTERVAL", "1.0")),
+                "buffer_bytes": int(os.getenv("EVENT_FILE_BUFFER_BYTES", "262144")),
+                "segment_max_bytes": int(os.getenv("EVENT_FILE_SEGMENT_BYTES", "67108864")),
+                "fsync_interval": float(os.environ["EVENT_FILE_FSYNC_INTERVAL"]) if os.getenv("EVENT_FILE_FSYNC_INTERVAL") else None
+            },
             "kafka_servers": os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092"),
             "kafka_config": {
                 "compression_type": os.getenv("KAFKA_COMPRESSION", "gzip"),
                 "batch_size": int(os.getenv("KAFKA_BATCH_SIZE", "16384")),
-                "linger_ms": int(os.getenv("KAFKA_LINGER_MS", "10"))
+                "linger_ms": int(os.getenv("KAFKA_LINGER_MS", "10")),
+                "acks": os.getenv("KAFKA_ACKS", "1"),  # 0, 1 or all
+                "client_id": os.getenv("KAFKA_CLIENT_ID", "openbiocure"),
+                # Idempotence forces acks=all and keeps client retries free of duplicates
+                "enable_idempotence": os.getenv("KAFKA_ENABLE_IDEMPOTENCE", "true").lower() == "true",
+                "request_timeout_ms": int(os.getenv("KAFKA_REQUEST_TIMEOUT_MS", "40000")),
+                "retry_backoff_ms": int(os.getenv("KAFKA_RETRY_BACKOFF_MS", "100"))
             }
         }
     
@@ -26,9 +39,9 @@ class EventConfig:
         producer_type = config["type"]
         
         if producer_type == "memory":
-            return InMemoryEventProducer()
+            return InMemoryEventProducer(config["memory_capacity"])
         elif producer_type == "file":
-            return FileEventProducer(config["file_base_path"])
+            return FileEventProducer(config["file_base_path"], **config["file_config"])
         elif producer_type == "kafka":
             return KafkaEventProducer(
                 config["kafka_servers"],
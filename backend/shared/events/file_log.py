@@ -0,0 +1,197 @@
+"""
+Segmented on-disk event log used by FileEventProducer
+
+Each topic is a directory of append-only JSONL segments named after the
+offset of their first record, e.g. `audit.auth/00000000000000004096.jsonl`.
+Every segment has a sparse `.index` file of "relative_offset byte_position"
+lines, so a reader can seek close to any offset without scanning the whole
+topic. Offsets are implied by line position: base offset + line number.
+"""
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+from pathlib import Path
+import asyncio
+import bisect
+import json
+import logging
+import os
+
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".index"
+OFFSET_WIDTH = 20
+
+
+def segment_path(topic_dir: Path, base_offset: int) -> Path:
+    return topic_dir / f"{base_offset:0{OFFSET_WIDTH}d}{SEGMENT_SUFFIX}"
+
+
+def index_path(segment: Path) -> Path:
+    return segment.with_suffix(INDEX_SUFFIX)
+
+
+def list_segments(topic_dir: Path) -> List[Tuple[int, Path]]:
+    """(base_offset, path) of every segment in a topic, oldest first"""
+    if not topic_dir.is_dir():
+        return []
+    segments = []
+    for path in topic_dir.glob(f"*{SEGMENT_SUFFIX}"):
+        try:
+            segments.append((int(path.stem), path))
+        except ValueError:
+            continue
+    return sorted(segments)
+
+
+def read_index(segment: Path) -> List[Tuple[int, int]]:
+    """(relative_offset, byte_position) entries of a segment's index"""
+    entries = [(0, 0)]
+    try:
+        with open(index_path(segment), "r") as f:
+            for line in f:
+                relative_offset, position = line.split()
+                entries.append((int(relative_offset), int(position)))
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+class SegmentWriter:
+    """
+    Appends records to the newest segment of one topic, rolling over at
+    `segment_max_bytes` and indexing every `index_interval` records.
+    Not thread-safe; a single flusher thread owns each writer.
+    """
+
+    def __init__(self, topic_dir: Path, segment_max_bytes: int, index_interval: int):
+        self.topic_dir = topic_dir
+        self.segment_max_bytes = segment_max_bytes
+        self.index_interval = index_interval
+        self.topic_dir.mkdir(parents=True, exist_ok=True)
+        self._recover()
+
+    def _recover(self):
+        """Open the last segment and work out the next offset from its contents"""
+        segments = list_segments(self.topic_dir)
+        if not segments:
+            self._open_segment(0)
+            return
+
+        base_offset, path = segments[-1]
+        with open(path, "r+b") as f:
+            data = f.read()
+            # Drop a record left half-written by a crash
+            complete = data.rfind(b"\n") + 1
+            if complete < len(data):
+                f.truncate(complete)
+        self._open_segment(base_offset, data.count(b"\n", 0, complete))
+
+    def _open_segment(self, base_offset: int, records: int = 0):
+        path = segment_path(self.topic_dir, base_offset)
+        self.base_offset = base_offset
+        self.records = records
+        self._segment = open(path, "ab")
+        self._index = open(index_path(path), "a")
+        self.position = self._segment.tell()
+
+    @property
+    def next_offset(self) -> int:
+        return self.base_offset + self.records
+
+    def append(self, lines: List[bytes]):
+        for line in lines:
+            if self.records and self.position + len(line) > self.segment_max_bytes:
+                self.roll()
+            if self.records and self.records % self.index_interval == 0:
+                self._index.write(f"{self.records} {self.position}\n")
+            self._segment.write(line)
+            self.position += len(line)
+            self.records += 1
+
+    def roll(self):
+        """Close the current segment and start a new one at the next offset"""
+        next_offset = self.next_offset
+        self.close()
+        self._open_segment(next_offset)
+
+    def flush(self, fsync: bool = False):
+        self._segment.flush()
+        self._index.flush()
+        if fsync:
+            os.fsync(self._segment.fileno())
+
+    def close(self):
+        self._segment.close()
+        self._index.close()
+
+
+class FileEventReader:
+    """Reads and replays topics written by FileEventProducer"""
+
+    def __init__(self, base_path: str = "/tmp/events"):
+        self.base_path = Path(base_path)
+        self.logger = logging.getLogger(__name__)
+
+    def topics(self) -> List[str]:
+        if not self.base_path.is_dir():
+            return []
+        return sorted(p.name for p in self.base_path.iterdir() if p.is_dir() and list_segments(p))
+
+    def read(self, topic: str, from_offset: int = 0) -> Iterator[Dict[str, Any]]:
+        """Yield records (with their offset) starting at from_offset"""
+        segments = list_segments(self.base_path / topic)
+        if not segments:
+            return
+
+        # Start in the last segment whose base offset is <= from_offset
+        start = max(bisect.bisect_right([base for base, _ in segments], from_offset) - 1, 0)
+        for base_offset, path in segments[start:]:
+            offset, position = base_offset, 0
+            if from_offset > base_offset:
+                index = read_index(path)
+                i = bisect.bisect_right([relative for relative, _ in index], from_offset - base_offset) - 1
+                offset, position = base_offset + index[i][0], index[i][1]
+
+            with open(path, "rb") as f:
+                f.seek(position)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # partially written tail
+                    if offset >= from_offset:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            self.logger.warning(f"Skipping corrupt record {topic}@{offset}")
+                        else:
+                            record["offset"] = offset
+                            yield record
+                    offset += 1
+
+    async def replay(self, topic: str, handler: Callable[[Dict[str, Any]], Awaitable[Any]],
+                     from_offset: int = 0, batch_size: int = 500) -> int:
+        """Feed records to an async handler, reading from disk off the event loop"""
+        records = self.read(topic, from_offset)
+
+        def next_batch():
+            batch = []
+            for record in records:
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    break
+            return batch
+
+        replayed = 0
+        while True:
+            batch = await asyncio.to_thread(next_batch)
+            if not batch:
+                return replayed
+            for record in batch:
+                await handler(record)
+            replayed += len(batch)
+
+    def end_offset(self, topic: str) -> Optional[int]:
+        """Offset the next record of a topic will get, or None if the topic is empty"""
+        segments = list_segments(self.base_path / topic)
+        if not segments:
+            return None
+        base_offset, path = segments[-1]
+        with open(path, "rb") as f:
+            return base_offset + sum(1 for _ in f)
@@ -1,10 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from collections import deque
+from typing import Dict, Any, Optional, Callable, List
+import asyncio
+import heapq
 import json
 import logging
+import time
 from datetime import datetime
 from pathlib import Path
 
+from .file_log import SegmentWriter
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json module
+    orjson = None
+
+def _serialize_event(event: Dict[str, Any]) -> bytes:
+    """Serialize an event to JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(event, default=str)
+    return json.dumps(event, default=str).encode("utf-8")
+
 class EventProducer(ABC):
     """Abstract event producer that can be implemented with different backends"""
     
@@ -19,11 +36,22 @@ class EventProducer(ABC):
         pass
 
 class InMemoryEventProducer(EventProducer):
-    """Simple in-memory producer for development/testing"""
+    """
+    Simple in-memory producer for development/testing
     
-    def __init__(self):
-        self.events = []
+    Keeps the last `capacity` events of each topic in a ring buffer, so
+    long-running processes hold a bounded amount of history. Subscribers
+    (plain or async callables) are called for every event, which lets tests
+    await events instead of polling.
+    """
+    
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
         self.logger = logging.getLogger(__name__)
+        self._topics: Dict[str, deque] = {}
+        self._subscribers: Dict[Optional[str], List[Callable]] = {}
+        self._sequence = 0
+        self._evicted = 0
     
     async def publish(self, topic: str, event: Dict[str, Any], key: Optional[str] = None) -> bool:
         """Store event in memory and log it"""
@@ -33,66 +61,355 @@ class InMemoryEventProducer(EventProducer):
             "event": event,
             "timestamp": datetime.utcnow().isoformat()
         }
-        self.events.append(event_record)
-        self.logger.info(f"Event published to {topic}: {json.dumps(event, default=str)}")
+        
+        buffer = self._topics.get(topic)
+        if buffer is None:
+            buffer = self._topics[topic] = deque(maxlen=self.capacity)
+        if len(buffer) == self.capacity:
+            self._evicted += 1
+        self._sequence += 1
+        buffer.append((self._sequence, event_record))
+        
+        # Only pay for serialization when the message will actually be logged
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f"Event published to {topic}: {json.dumps(event, default=str)}")
+        
+        for callback in self._subscribers.get(topic, []) + self._subscribers.get(None, []):
+            try:
+                result = callback(event_record)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                self.logger.error(f"Event subscriber failed for {topic}: {e}")
         return True
     
+    def subscribe(self, callback: Callable[[Dict[str, Any]], Any], topic: Optional[str] = None):
+        """Call `callback` with every event record published (to `topic`, or to any topic)"""
+        self._subscribers.setdefault(topic, []).append(callback)
+    
+    def unsubscribe(self, callback: Callable[[Dict[str, Any]], Any], topic: Optional[str] = None):
+        callbacks = self._subscribers.get(topic, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+    
     async def close(self):
         """No cleanup needed for in-memory"""
         pass
     
     def get_events(self, topic: Optional[str] = None):
-        """Get events for debugging"""
+        """Get events for debugging, oldest first"""
         if topic:
-            return [e for e in self.events if e["topic"] == topic]
-        return self.events
+            return [record for _, record in self._topics.get(topic, ())]
+        # Merge the per-topic buffers back into publish order
+        return [record for _, record in heapq.merge(*self._topics.values(), key=lambda item: item[0])]
+    
+    @property
+    def events(self):
+        return self.get_events()
+    
+    def clear(self, topic: Optional[str] = None):
+        if topic:
+            self._topics.pop(topic, None)
+        else:
+            self._topics.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "topics": {topic: len(buffer) for topic, buffer in self._topics.items()},
+            "published": self._sequence,
+            "evicted": self._evicted
+        }
 
 class FileEventProducer(EventProducer):
-    """File-based producer for simple persistent events"""
+    """
+    File-based producer for simple persistent events
+    
+    publish() only serializes the record into an in-memory buffer. A
+    background task writes buffered records to per-topic segment files (see
+    file_log.py) in a worker thread, when `buffer_bytes` is reached or every
+    `flush_interval` seconds. `fsync_interval` controls durability: None
+    leaves syncing to the OS, 0 fsyncs after every flush, N at most every N
+    seconds. Use FileEventReader to read or replay topics.
+    """
     
-    def __init__(self, base_path: str = "/tmp/events"):
+    def __init__(self, base_path: str = "/tmp/events", flush_interval: float = 1.0,
+                 buffer_bytes: int = 256 * 1024, max_buffer_bytes: int = 16 * 1024 * 1024,
+                 segment_max_bytes: int = 64 * 1024 * 1024, index_interval: int = 256,
+                 fsync_interval: Optional[float] = None):
         self.base_path = Path(base_path)
         self.base_path.mkdir(exist_ok=True)
+        self.flush_interval = flush_interval
+        self.buffer_bytes = buffer_bytes
+        self.max_buffer_bytes = max_buffer_bytes
+        self.segment_max_bytes = segment_max_bytes
+        self.index_interval = index_interval
+        self.fsync_interval = fsync_interval
         self.logger = logging.getLogger(__name__)
+        
+        self._buffers: Dict[str, list] = {}
+        self._buffered_bytes = 0
+        self._writers: Dict[str, SegmentWriter] = {}  # only touched by the flush thread
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._last_fsync = time.monotonic()
+        self._metrics = {
+            "published": 0,
+            "dropped": 0,
+            "written": 0,
+            "failed": 0,
+            "flushes": 0,
+            "flush_ms_max": 0.0
+        }
+    
+    def _ensure_flusher(self):
+        if self._task is None or self._task.done():
+            self._flush_requested = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
     
     async def publish(self, topic: str, event: Dict[str, Any], key: Optional[str] = None) -> bool:
-        """Write event to topic-specific file"""
+        """Buffer an event for the topic's log; returns False if the buffer is full"""
+        if self._closing:
+            return False
+        
+        if self._buffered_bytes >= self.max_buffer_bytes:
+            self._metrics["dropped"] += 1
+            if self._metrics["dropped"] % 1000 == 1:
+                self.logger.warning(f"Event file buffer full, {self._metrics['dropped']} events dropped so far")
+            return False
+        
         try:
-            topic_file = self.base_path / f"{topic}.jsonl"
-            event_record = {
+            line = _serialize_event({
                 "key": key,
                 "event": event,
                 "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            with open(topic_file, "a") as f:
-                f.write(json.dumps(event_record, default=str) + "\n")
-            
-            self.logger.info(f"Event written to {topic_file}: {key}")
-            return True
+            }) + b"\n"
         except Exception as e:
-            self.logger.error(f"Failed to write event to file: {e}")
+            self.logger.error(f"Failed to serialize event for {topic}: {e}")
             return False
+        
+        self._ensure_flusher()
+        self._buffers.setdefault(topic, []).append(line)
+        self._buffered_bytes += len(line)
+        self._metrics["published"] += 1
+        if self._buffered_bytes >= self.buffer_bytes:
+            self._flush_requested.set()
+        return True
+    
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+    
+    async def flush(self):
+        """Write everything buffered so far to disk"""
+        if not self._buffers:
+            return
+        
+        buffers, self._buffers, self._buffered_bytes = self._buffers, {}, 0
+        started_at = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._write_buffers, buffers)
+        except Exception as e:
+            self._metrics["failed"] += sum(len(lines) for lines in buffers.values())
+            self.logger.error(f"Failed to write events to file: {e}")
+            return
+        
+        flush_ms = (time.perf_counter() - started_at) * 1000
+        metrics = self._metrics
+        metrics["flushes"] += 1
+        metrics["written"] += sum(len(lines) for lines in buffers.values())
+        metrics["flush_ms_max"] = max(metrics["flush_ms_max"], flush_ms)
+    
+    def _write_buffers(self, buffers: Dict[str, list]):
+        """Append buffered lines to each topic's segments (runs in a worker thread)"""
+        fsync = self.fsync_interval is not None and time.monotonic() - self._last_fsync >= self.fsync_interval
+        for topic, lines in buffers.items():
+            writer = self._writers.get(topic)
+            if writer is None:
+                writer = SegmentWriter(self.base_path / topic, self.segment_max_bytes, self.index_interval)
+                self._writers[topic] = writer
+            writer.append(lines)
+            writer.flush(fsync=fsync)
+        if fsync:
+            self._last_fsync = time.monotonic()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Buffer and write metrics"""
+        return {
+            **self._metrics,
+            "flush_ms_max": round(self._metrics["flush_ms_max"], 2),
+            "buffered_bytes": self._buffered_bytes,
+            "buffered_events": sum(len(lines) for lines in self._buffers.values())
+        }
     
     async def close(self):
-        """No cleanup needed for file"""
-        pass
+        """Stop the flush task, write what is left and close segment files"""
+        self._closing = True
+        if self._task is not None:
+            self._flush_requested.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        
+        def close_writers():
+            for writer in self._writers.values():
+                writer.flush(fsync=self.fsync_interval is not None)
+                writer.close()
+            self._writers.clear()
+        
+        await asyncio.to_thread(close_writers)
 
 class KafkaEventProducer(EventProducer):
-    """Kafka producer (future implementation)"""
+    """
+    Kafka producer built on aiokafka
     
-    def __init__(self, bootstrap_servers: str, **config):
+    publish() only appends the record to the client's batch accumulator and
+    returns; delivery is confirmed in the background, so callers never wait
+    for a broker round trip. Records are keyed by tenant so each tenant's
+    events stay ordered within a partition.
+    
+    Retries are left to aiokafka: it keeps one request in flight per broker
+    and retries a failed batch before sending the next one for that
+    partition, so a retry never overtakes later records with the same key.
+    With `enable_idempotence` (which forces acks=all) the broker also drops
+    duplicates of a retried batch. The client retries every `retry_backoff_ms`
+    until `request_timeout_ms` runs out; only then is the record counted as
+    failed.
+    """
+    
+    def __init__(self, bootstrap_servers: str, compression_type: Optional[str] = "gzip",
+                 batch_size: int = 16384, linger_ms: int = 10, acks: Any = 1,
+                 client_id: str = "openbiocure", enable_idempotence: bool = True,
+                 request_timeout_ms: int = 40000, retry_backoff_ms: int = 100,
+                 producer_factory: Optional[Callable[..., Any]] = None):
         self.bootstrap_servers = bootstrap_servers
-        self.config = config
+        self.config = {
+            "compression_type": None if compression_type in (None, "", "none") else compression_type,
+            "max_batch_size": batch_size,
+            "linger_ms": linger_ms,
+            # Idempotent delivery requires acknowledgement from all replicas
+            "acks": "all" if enable_idempotence or acks == "all" else int(acks),
+            "client_id": client_id,
+            "enable_idempotence": enable_idempotence,
+            "request_timeout_ms": request_timeout_ms,
+            "retry_backoff_ms": retry_backoff_ms
+        }
+        # producer_factory lets tests substitute an in-process broker
+        self.producer_factory = producer_factory
         self.producer = None
-        # TODO: Initialize Kafka producer when aiokafka is added
+        self.logger = logging.getLogger(__name__)
+        # Created on first use so the producer can be built outside an event loop
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._in_flight = 0
+        self._in_flight_bytes = 0
+        self._metrics = {
+            "published": 0,
+            "delivered": 0,
+            "failed": 0,
+            "bytes": 0,
+            "delivery_ms_total": 0.0,
+            "delivery_ms_max": 0.0
+        }
+    
+    async def start(self):
+        """Connect to the cluster; called lazily by the first publish"""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.producer is not None:
+                return
+            
+            factory = self.producer_factory
+            if factory is None:
+                from aiokafka import AIOKafkaProducer
+                factory = AIOKafkaProducer
+            
+            producer = factory(bootstrap_servers=self.bootstrap_servers, **self.config)
+            await producer.start()
+            self.producer = producer
+            self.logger.info(f"Kafka producer connected to {self.bootstrap_servers}")
     
     async def publish(self, topic: str, event: Dict[str, Any], key: Optional[str] = None) -> bool:
-        """Publish to Kafka (placeholder for now)"""
-        # TODO: Implement when Kafka is added
-        raise NotImplementedError("Kafka producer not yet implemented")
+        """Queue an event for delivery; returns False if it could not be buffered"""
+        try:
+            if self.producer is None:
+                await self.start()
+            
+            partition_key = key if key is not None else event.get("tenant_id")
+            value = _serialize_event(event)
+            key_bytes = str(partition_key).encode("utf-8") if partition_key is not None else None
+            sent_at = time.perf_counter()
+            # send() waits only when the accumulator is full (backpressure)
+            delivery = await self.producer.send(topic, value=value, key=key_bytes)
+        except Exception as e:
+            self._metrics["failed"] += 1
+            self.logger.error(f"Failed to publish event to {topic}: {e}")
+            return False
+        
+        size = len(value)
+        delivery.add_done_callback(lambda future: self._on_delivery(future, topic, size, sent_at))
+        self._metrics["published"] += 1
+        self._metrics["bytes"] += size
+        self._in_flight += 1
+        self._in_flight_bytes += size
+        return True
+    
+    def _on_delivery(self, future: asyncio.Future, topic: str, size: int, sent_at: float):
+        if future.cancelled():
+            self._settle(topic, size, sent_at, "cancelled")
+        else:
+            self._settle(topic, size, sent_at, future.exception())
+    
+    def _settle(self, topic: str, size: int, sent_at: float, error: Any = None):
+        """Account for a record that was delivered or that the client gave up on"""
+        self._in_flight -= 1
+        self._in_flight_bytes -= size
+        
+        if error is not None:
+            self._metrics["failed"] += 1
+            self.logger.error(f"Kafka delivery to {topic} failed: {error}")
+            return
+        
+        delivery_ms = (time.perf_counter() - sent_at) * 1000
+        metrics = self._metrics
+        metrics["delivered"] += 1
+        metrics["delivery_ms_total"] += delivery_ms
+        metrics["delivery_ms_max"] = max(metrics["delivery_ms_max"], delivery_ms)
+    
+    async def flush(self):
+        """Wait until every buffered record has been delivered or failed"""
+        if self.producer is not None:
+            await self.producer.flush()
+            # Let delivery callbacks run
+            await asyncio.sleep(0)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Delivery latency and buffer metrics"""
+        metrics = self._metrics
+        delivered = metrics["delivered"]
+        return {
+            "published": metrics["published"],
+            "delivered": delivered,
+            "failed": metrics["failed"],
+            "bytes": metrics["bytes"],
+            "in_flight": self._in_flight,
+            "in_flight_bytes": self._in_flight_bytes,
+            "avg_delivery_ms": round(metrics["delivery_ms_total"] / delivered, 2) if delivered else 0.0,
+            "max_delivery_ms": round(metrics["delivery_ms_max"], 2)
+        }
     
     async def close(self):
-        """Close Kafka producer"""
-        # TODO: Implement when Kafka is added
-        pass
+        """Flush buffered records and close the Kafka producer"""
+        if self.producer is None:
+            return
+        try:
+            await self.flush()
+        finally:
+            await self.producer.stop()
+            self.producer = None
@@ -1,3 +1,4 @@
 from .base_repository import BaseRepository
+from .async_base_repository import AsyncBaseRepository
 
-__all__ = ["BaseRepository"]
+__all__ = ["BaseRepository", "AsyncBaseRepository"]
@@ -0,0 +1,79 @@
+from typing import TypeVar, Generic, List, Optional, Dict, Any
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.declarative import DeclarativeMeta
+
+from .unit_of_work import in_unit_of_work
+
+T = TypeVar('T', bound=DeclarativeMeta)
+
+class AsyncBaseRepository(Generic[T]):
+    """
+    Async counterpart of BaseRepository for services running on AsyncSession
+    
+    Sessions should be created with expire_on_commit=False: returned objects
+    are not reloaded after commit, and lazy attribute loads are not allowed
+    on an AsyncSession.
+    """
+    
+    def __init__(self, db: AsyncSession, model: type[T], auto_commit: bool = True):
+        self.db = db
+        self.model = model
+        self.auto_commit = auto_commit
+    
+    async def _commit(self):
+        """Commit, or just flush when the transaction is owned by a unit of work"""
+        if self.auto_commit and not in_unit_of_work(self.db):
+            await self.db.commit()
+        else:
+            await self.db.flush()
+    
+    async def create(self, obj_data: Dict[str, Any], refresh: bool = False) -> T:
+        """Create a new record; refresh=True reloads server-generated columns"""
+        db_obj = self.model(**obj_data)
+        self.db.add(db_obj)
+        await self._commit()
+        if refresh:
+            await self.db.refresh(db_obj)
+        return db_obj
+    
+    async def get_by_id(self, obj_id: str) -> Optional[T]:
+        """Get record by ID (served from the session identity map when loaded)"""
+        return await self.db.get(self.model, obj_id)
+    
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
+        """Get all records with pagination"""
+        result = await self.db.execute(select(self.model).offset(skip).limit(limit))
+        return list(result.scalars().all())
+    
+    async def update(self, obj_id: str, obj_data: Dict[str, Any]) -> Optional[T]:
+        """Update record by ID with a single UPDATE ... RETURNING"""
+        values = {field: value for field, value in obj_data.items() if hasattr(self.model, field)}
+        if not values:
+            return await self.get_by_id(obj_id)
+        
+        result = await self.db.execute(
+            update(self.model)
+            .where(self.model.id == obj_id)
+            .values(**values)
+            .returning(self.model)
+        )
+        db_obj = result.scalar_one_or_none()
+        await self._commit()
+        return db_obj
+    
+    async def delete(self, obj_id: str) -> bool:
+        """Delete record by ID"""
+        result = await self.db.execute(delete(self.model).where(self.model.id == obj_id))
+        await self._commit()
+        return result.rowcount > 0
+    
+    async def exists(self, obj_id: str) -> bool:
+        """Check if record exists"""
+        result = await self.db.execute(select(self.model.id).where(self.model.id == obj_id).limit(1))
+        return result.first() is not None
+    
+    async def count(self) -> int:
+        """Count all records"""
+        result = await self.db.execute(select(func.count()).select_from(self.model))
+        return result.scalar_one()
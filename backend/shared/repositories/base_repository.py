@@ -1,28 +1,150 @@
 from abc import ABC, abstractmethod
 from typing import TypeVar, Generic, List, Optional, Dict, Any
+from sqlalchemy import insert, update, inspect
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.declarative import DeclarativeMeta
 
+from .unit_of_work import in_unit_of_work
+from .identity_map import RequestIdentityMap
+
 T = TypeVar('T', bound=DeclarativeMeta)
 
 class BaseRepository(Generic[T], ABC):
-    """Base repository pattern implementation for all services"""
+    """
+    Base repository pattern implementation for all services
+    
+    Writes commit immediately unless `auto_commit` is False or the session is
+    inside a SqlAlchemyUnitOfWork block; then they only flush and the unit of
+    work commits once at the end.
+    
+    Repositories created by a RepositoryFactory share a request-scoped
+    identity map, so repeated get_by_id calls skip the SELECT.
+    """
     
-    def __init__(self, db: Session, model: type[T]):
+    identity_map: Optional[RequestIdentityMap] = None
+    
+    def __init__(self, db: Session, model: type[T], auto_commit: bool = True):
         self.db = db
         self.model = model
+        self.auto_commit = auto_commit
+    
+    def _commit(self):
+        """Commit, or just flush when the transaction is owned by a unit of work"""
+        if self.auto_commit and not in_unit_of_work(self.db):
+            self.db.commit()
+        else:
+            self.db.flush()
+    
+    def _remember(self, db_obj: Optional[T]) -> Optional[T]:
+        """Add a loaded object to the request identity map"""
+        if self.identity_map is not None and db_obj is not None:
+            self.identity_map.put(self.model, db_obj)
+        return db_obj
+    
+    def _cached(self, obj_id: Any) -> Optional[T]:
+        """Object already loaded in this request, if the identity map has it"""
+        if self.identity_map is None:
+            return None
+        return self.identity_map.get(self.model, obj_id)
     
     def create(self, obj_data: Dict[str, Any]) -> T:
         """Create a new record"""
         db_obj = self.model(**obj_data)
         self.db.add(db_obj)
-        self.db.commit()
+        self._commit()
         self.db.refresh(db_obj)
-        return db_obj
+        return self._remember(db_obj)
+    
+    def bulk_create(self, objs_data: List[Dict[str, Any]]) -> List[T]:
+        """
+        Create many records with one multi-row INSERT ... RETURNING
+        
+        When this commits (auto_commit outside a unit of work) the session
+        expires the returned objects like any other commit, so reading their
+        attributes afterwards reloads each row. Callers that need the values
+        should run inside a SqlAlchemyUnitOfWork, where only a flush happens.
+        """
+        if not objs_data:
+            return []
+        
+        db_objs = list(self.db.scalars(insert(self.model).returning(self.model), objs_data))
+        self._commit()
+        for db_obj in db_objs:
+            self._remember(db_obj)
+        return db_objs
+    
+    def bulk_update(self, objs_data: List[Dict[str, Any]]) -> int:
+        """Update many records by primary key (each dict must include it) in one executemany"""
+        if not objs_data:
+            return 0
+        
+        self.db.execute(update(self.model), objs_data)
+        
+        # Bulk UPDATE bypasses loaded objects, so drop their stale state
+        mapper = inspect(self.model)
+        for obj_data in objs_data:
+            if self.identity_map is not None:
+                self.identity_map.invalidate(self.model, obj_data["id"])
+            loaded = self.db.identity_map.get(mapper.identity_key_from_primary_key([obj_data["id"]]))
+            if loaded is not None:
+                self.db.expire(loaded)
+        
+        self._commit()
+        return len(objs_data)
+    
+    def upsert_many(
+        self,
+        objs_data: List[Dict[str, Any]],
+        conflict_columns: Optional[List[str]] = None,
+        update_columns: Optional[List[str]] = None
+    ) -> List[T]:
+        """
+        Insert or update many records with INSERT ... ON CONFLICT ... RETURNING
+        
+        Columns to overwrite default to every supplied column except the
+        conflict columns. Rows whose conflict is ignored (nothing to update)
+        are not returned.
+        """
+        if not objs_data:
+            return []
+        
+        conflict_columns = conflict_columns or ["id"]
+        if update_columns is None:
+            update_columns = [column for column in objs_data[0] if column not in conflict_columns]
+        
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            raise NotImplementedError(f"upsert_many is not supported for {dialect}")
+        
+        stmt = dialect_insert(self.model)
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_columns,
+                set_={column: stmt.excluded[column] for column in update_columns}
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+        
+        db_objs = list(self.db.scalars(
+            stmt.returning(self.model),
+            objs_data,
+            execution_options={"populate_existing": True}
+        ))
+        self._commit()
+        for db_obj in db_objs:
+            self._remember(db_obj)
+        return db_objs
     
     def get_by_id(self, obj_id: str) -> Optional[T]:
-        """Get record by ID"""
-        return self.db.query(self.model).filter(self.model.id == obj_id).first()
+        """Get record by ID, served from the request identity map when already loaded"""
+        db_obj = self._cached(obj_id)
+        if db_obj is not None:
+            return db_obj
+        return self._remember(self.db.get(self.model, obj_id))
     
     def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
         """Get all records with pagination"""
@@ -38,7 +160,7 @@ class BaseRepository(Generic[T], ABC):
             if hasattr(db_obj, field):
                 setattr(db_obj, field, value)
         
-        self.db.commit()
+        self._commit()
         self.db.refresh(db_obj)
         return db_obj
     
@@ -49,7 +171,9 @@ class BaseRepository(Generic[T], ABC):
             return False
         
         self.db.delete(db_obj)
-        self.db.commit()
+        if self.identity_map is not None:
+            self.identity_map.invalidate(self.model, obj_id)
+        self._commit()
         return True
     
     def exists(self, obj_id: str) -> bool:
@@ -0,0 +1,69 @@
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+class RequestIdentityMap:
+    """
+    Request-scoped read-through cache of rows keyed by (model, primary key)
+
+    Session.query(...).first() always goes to the database even when the row
+    is already loaded, so repeated lookups within one request cost a SELECT
+    each. Repositories created by the same RepositoryFactory share one map:
+    lookups hit it first, and writes through a repository update or
+    invalidate their entries. The map is cleared when the session rolls back.
+
+    A commit expires every loaded object, and reading an expired object
+    reloads it anyway, so expired entries count as misses and the caller runs
+    its normal query.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self._entries: Dict[Tuple[type, str], Any] = {}
+        self.hits = 0
+        self.misses = 0
+        event.listen(session, "after_rollback", self._on_rollback)
+
+    @staticmethod
+    def _key(model: type, obj_id: Any) -> Tuple[type, str]:
+        return model, str(obj_id)
+
+    def get(self, model: type, obj_id: Any) -> Optional[Any]:
+        obj = self._entries.get(self._key(model, obj_id))
+        if obj is not None:
+            state = inspect(obj)
+            # Objects that were expunged, deleted or expired by a commit are not valid hits
+            if obj in self.session and not state.deleted and not state.expired_attributes:
+                self.hits += 1
+                return obj
+        self.misses += 1
+        return None
+
+    def put(self, model: type, obj: Any):
+        if obj is not None:
+            self._entries[self._key(model, obj.id)] = obj
+
+    def invalidate(self, model: type, obj_id: Any):
+        self._entries.pop(self._key(model, obj_id), None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def _on_rollback(self, session: Session):
+        self.clear()
+
+    def close(self):
+        """Detach from the session at the end of the request"""
+        if event.contains(self.session, "after_rollback", self._on_rollback):
+            event.remove(self.session, "after_rollback", self._on_rollback)
+        self.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "lookups": lookups,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries)
+        }
@@ -1,13 +1,53 @@
-from typing import TypeVar, Type
+from typing import TypeVar, Type, Optional, Dict, Any
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from .base_repository import BaseRepository
+from .identity_map import RequestIdentityMap
 
 T = TypeVar('T')
 
 class RepositoryFactory:
-    """Factory to create repositories with injected dependencies"""
+    """
+    Factory to create repositories with injected dependencies
     
-    def __init__(self, session: Session):
+    One factory is created per request; its repositories share a
+    RequestIdentityMap unless `identity_map=False`. Call close() when the
+    request ends to detach the map from the session.
+    """
+    
+    def __init__(self, session: Session, identity_map: bool = True):
+        self._session = session
+        self.identity_map = RequestIdentityMap(session) if identity_map else None
+    
+    def create_repository(self, repository_class: Type[T], model_class=None) -> T:
+        """
+        Create a repository instance with injected session
+        
+        Repositories that fix their own model (workspace-service's take only
+        the session) are created without `model_class`.
+        """
+        if model_class is None:
+            repository = repository_class(self._session)
+        else:
+            repository = repository_class(self._session, model_class)
+        # Services import BaseRepository through different sys.path entries,
+        # so check for the attribute rather than the class
+        if hasattr(repository, "identity_map"):
+            repository.identity_map = self.identity_map
+        return repository
+    
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Identity map hit rate for this request"""
+        return self.identity_map.get_stats() if self.identity_map else None
+    
+    def close(self):
+        if self.identity_map:
+            self.identity_map.close()
+
+class AsyncRepositoryFactory:
+    """Factory to create async repositories with an injected AsyncSession"""
+    
+    def __init__(self, session: AsyncSession):
         self._session = session
     
     def create_repository(self, repository_class: Type[T], model_class) -> T:
@@ -1,7 +1,27 @@
 from typing import Protocol
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from abc import ABC, abstractmethod
 
+# Session.info key holding the nesting depth of active units of work
+UNIT_OF_WORK_DEPTH = "unit_of_work_depth"
+
+def in_unit_of_work(session) -> bool:
+    """True when repositories on this session should leave committing to a unit of work"""
+    return session.info.get(UNIT_OF_WORK_DEPTH, 0) > 0
+
+def _enter_unit_of_work(session):
+    session.info[UNIT_OF_WORK_DEPTH] = session.info.get(UNIT_OF_WORK_DEPTH, 0) + 1
+
+def _exit_unit_of_work(session) -> bool:
+    """Leave a unit of work; returns True when it was the outermost one"""
+    depth = session.info.get(UNIT_OF_WORK_DEPTH, 1) - 1
+    if depth:
+        session.info[UNIT_OF_WORK_DEPTH] = depth
+    else:
+        session.info.pop(UNIT_OF_WORK_DEPTH, None)
+    return depth == 0
+
 class UnitOfWork(ABC):
     """Unit of Work pattern to manage database transactions"""
     
@@ -25,11 +45,24 @@ class UnitOfWork(ABC):
         pass
 
 class SqlAlchemyUnitOfWork(UnitOfWork):
-    """SQLAlchemy implementation of Unit of Work"""
+    """
+    SQLAlchemy implementation of Unit of Work
+    
+    While the `with` block is open, repositories sharing the session flush
+    instead of committing; the outermost block commits (or rolls back) once.
+    """
     
     def __init__(self, session: Session):
         self._session = session
     
+    def __enter__(self):
+        _enter_unit_of_work(self._session)
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if _exit_unit_of_work(self._session):
+            super().__exit__(exc_type, exc_val, exc_tb)
+    
     def commit(self):
         self._session.commit()
     
@@ -39,3 +72,49 @@ class SqlAlchemyUnitOfWork(UnitOfWork):
     @property
     def session(self) -> Session:
         return self._session
+
+class AsyncUnitOfWork(ABC):
+    """Unit of Work pattern for async database transactions"""
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type:
+            await self.rollback()
+        else:
+            await self.commit()
+    
+    @abstractmethod
+    async def commit(self):
+        """Commit the transaction"""
+        pass
+    
+    @abstractmethod
+    async def rollback(self):
+        """Rollback the transaction"""
+        pass
+
+class SqlAlchemyAsyncUnitOfWork(AsyncUnitOfWork):
+    """SQLAlchemy AsyncSession implementation of Unit of Work"""
+    
+    def __init__(self, session: AsyncSession):
+        self._session = session
+    
+    async def __aenter__(self):
+        _enter_unit_of_work(self._session)
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if _exit_unit_of_work(self._session):
+            await super().__aexit__(exc_type, exc_val, exc_tb)
+    
+    async def commit(self):
+        await self._session.commit()
+    
+    async def rollback(self):
+        await self._session.rollback()
+    
+    @property
+    def session(self) -> AsyncSession:
+        return self._session
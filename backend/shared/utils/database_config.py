@@ -1,6 +1,6 @@
 import yaml
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from pathlib import Path
 
 class DatabaseConfig:
@@ -54,6 +54,27 @@ class DatabaseConfig:
         config = self.load_config()
         return config['database']['pool']
     
+    def get_engine_options(self) -> Dict[str, Any]:
+        """Get statement timeout, slow query threshold and statement cache settings"""
+        config = self.load_config()
+        options = dict(config['database'].get('engine', {}))
+        if os.getenv('DB_STATEMENT_TIMEOUT_MS'):
+            options['statement_timeout_ms'] = int(os.getenv('DB_STATEMENT_TIMEOUT_MS'))
+        if os.getenv('DB_SLOW_QUERY_MS'):
+            options['slow_query_ms'] = float(os.getenv('DB_SLOW_QUERY_MS'))
+        return options
+    
+    def get_replica_config(self) -> Optional[Dict[str, Any]]:
+        """Get read-replica host and port, or None when no replica is configured"""
+        config = self.load_config()
+        replica = config['database'].get('replica') or {}
+        host = os.getenv('DB_REPLICA_HOST', replica.get('host'))
+        if not host:
+            return None
+        
+        port = os.getenv('DB_REPLICA_PORT', replica.get('port', config['database']['port']))
+        return {'host': host, 'port': int(port)}
+    
     def get_ssl_config(self) -> Dict[str, Any]:
         """Get SSL configuration"""
         config = self.load_config()
@@ -0,0 +1,306 @@
+"""
+Shared SQLAlchemy engine and session factory for all microservices
+
+Gives every service the same pool sizing (from DatabaseConfig), a server-side
+statement timeout, SQLAlchemy's compiled-statement cache (plus asyncpg's
+prepared-statement cache on async URLs) and optional routing of read-only
+queries to a replica. Each engine records pool checkout wait, pool
+exhaustion and slow queries; `get_database_metrics()` exposes them for
+health endpoints so pools can be sized from data.
+"""
+from typing import Any, Dict, Optional, Tuple, Union
+import logging
+import threading
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql import Select
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL = {
+    "pool_size": 5,
+    "max_overflow": 15,
+    "pool_timeout": 30,
+    "pool_recycle": 3600
+}
+DEFAULT_STATEMENT_TIMEOUT_MS = 30000
+DEFAULT_SLOW_QUERY_MS = 500
+DEFAULT_QUERY_CACHE_SIZE = 1200
+
+
+class EngineMetrics:
+    """Pool and query telemetry for one engine"""
+
+    def __init__(self, name: str, slow_query_ms: float):
+        self.name = name
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_wait_ms_total = 0.0
+        self.checkout_wait_ms_max = 0.0
+        self.pool_exhausted = 0
+        self.queries = 0
+        self.slow_queries = 0
+        self.query_ms_max = 0.0
+
+    def record_checkout(self, wait_ms: float):
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_wait_ms_total += wait_ms
+            self.checkout_wait_ms_max = max(self.checkout_wait_ms_max, wait_ms)
+
+    def record_exhausted(self):
+        with self._lock:
+            self.pool_exhausted += 1
+
+    def record_query(self, statement: str, duration_ms: float):
+        with self._lock:
+            self.queries += 1
+            self.query_ms_max = max(self.query_ms_max, duration_ms)
+            slow = duration_ms >= self.slow_query_ms
+            if slow:
+                self.slow_queries += 1
+        if slow:
+            logger.warning(f"Slow query on {self.name} ({duration_ms:.0f} ms): {statement[:500]}")
+
+    def snapshot(self, pool) -> Dict[str, Any]:
+        checkouts = self.checkouts
+        snapshot = {
+            "checkouts": checkouts,
+            "avg_checkout_wait_ms": round(self.checkout_wait_ms_total / checkouts, 2) if checkouts else 0.0,
+            "max_checkout_wait_ms": round(self.checkout_wait_ms_max, 2),
+            "pool_exhausted": self.pool_exhausted,
+            "queries": self.queries,
+            "slow_queries": self.slow_queries,
+            "max_query_ms": round(self.query_ms_max, 2)
+        }
+        if isinstance(pool, QueuePool):
+            snapshot.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "idle": pool.checkedin()
+            })
+        return snapshot
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long callers wait for a connection"""
+
+    metrics: Optional[EngineMetrics] = None
+
+    def _do_get(self):
+        if self.metrics is None:
+            return super()._do_get()
+
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_exhausted()
+            raise
+        self.metrics.record_checkout((time.perf_counter() - started_at) * 1000)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+_engine_metrics: Dict[str, tuple] = {}
+
+
+def _attach_query_timing(engine: Engine, metrics: EngineMetrics):
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("query_started_at")
+        if started:
+            metrics.record_query(statement, (time.perf_counter() - started.pop()) * 1000)
+
+
+def create_db_engine(
+    url: str,
+    name: str = "primary",
+    pool: Optional[Dict[str, Any]] = None,
+    statement_timeout_ms: Optional[int] = DEFAULT_STATEMENT_TIMEOUT_MS,
+    slow_query_ms: float = DEFAULT_SLOW_QUERY_MS,
+    query_cache_size: int = DEFAULT_QUERY_CACHE_SIZE,
+    echo: bool = False,
+    **engine_kwargs
+) -> Union[Engine, AsyncEngine]:
+    """
+    Create an instrumented engine, an AsyncEngine for +asyncpg URLs
+
+    `pool` takes pool_size / max_overflow / pool_timeout / pool_recycle;
+    missing keys fall back to DEFAULT_POOL.
+    """
+    pool_settings = {**DEFAULT_POOL, **(pool or {})}
+    metrics = EngineMetrics(name, slow_query_ms)
+
+    connect_args = dict(engine_kwargs.pop("connect_args", {}))
+    if statement_timeout_ms and url.startswith("postgresql"):
+        if "+asyncpg" in url:
+            server_settings = connect_args.setdefault("server_settings", {})
+            server_settings.setdefault("statement_timeout", str(statement_timeout_ms))
+        else:
+            options = connect_args.get("options", "")
+            connect_args["options"] = f"{options} -c statement_timeout={statement_timeout_ms}".strip()
+    if "+asyncpg" in url:
+        connect_args.setdefault("prepared_statement_cache_size", query_cache_size)
+
+    kwargs = dict(
+        echo=echo,
+        pool_pre_ping=True,
+        query_cache_size=query_cache_size,
+        connect_args=connect_args,
+        **engine_kwargs
+    )
+    if "+asyncpg" in url:
+        # Async engines need the async-adapted pool; checkout timing is not available there
+        from sqlalchemy.ext.asyncio import create_async_engine
+        engine = create_async_engine(url, **kwargs, **pool_settings)
+        _attach_query_timing(engine.sync_engine, metrics)
+        _engine_metrics[name] = (metrics, engine.sync_engine)
+        return engine
+
+    engine = create_engine(url, poolclass=InstrumentedQueuePool, **kwargs, **pool_settings)
+    engine.pool.metrics = metrics
+    _attach_query_timing(engine, metrics)
+    _engine_metrics[name] = (metrics, engine)
+    return engine
+
+
+class RoutingSession(Session):
+    """
+    Session that sends plain SELECTs to a read replica
+
+    Locking reads (SELECT ... FOR UPDATE / FOR SHARE) always go to the
+    primary. Once the session has flushed any write it sticks to the
+    primary, so a request always reads its own writes. Set `session.info["use_primary"]`
+    to force primary reads. AsyncSession uses it as its sync_session_class
+    with the replica's sync_engine.
+    """
+
+    def __init__(self, *args, replica_bind: Engine = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica_bind = replica_bind
+        event.listen(self, "after_flush", self._on_flush)
+
+    @staticmethod
+    def _on_flush(session, flush_context):
+        session.info["use_primary"] = True
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            self.replica_bind is not None
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and not self._flushing
+            and not self.info.get("use_primary")
+        ):
+            return self.replica_bind
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+def create_session_factory(
+    engine: Union[Engine, AsyncEngine],
+    replica_engine: Optional[Union[Engine, AsyncEngine]] = None,
+    **session_kwargs
+) -> Union[sessionmaker, async_sessionmaker]:
+    """
+    Session factory bound to the primary, optionally routing reads to a replica
+
+    Async engines get an async_sessionmaker producing AsyncSessions; the
+    primary and replica must both be sync or both be async.
+    """
+    session_kwargs.setdefault("autoflush", False)
+    is_async = isinstance(engine, AsyncEngine)
+    if replica_engine is not None and isinstance(replica_engine, AsyncEngine) != is_async:
+        raise ValueError("Primary and replica engines must both be sync or both be async")
+
+    if is_async:
+        # Keep loaded attributes usable after commit without an implicit (sync) refresh
+        session_kwargs.setdefault("expire_on_commit", False)
+        if replica_engine is None:
+            return async_sessionmaker(bind=engine, **session_kwargs)
+        return async_sessionmaker(
+            bind=engine,
+            sync_session_class=RoutingSession,
+            replica_bind=replica_engine.sync_engine,
+            **session_kwargs
+        )
+
+    if replica_engine is None:
+        return sessionmaker(bind=engine, **session_kwargs)
+    return sessionmaker(bind=engine, class_=RoutingSession, replica_bind=replica_engine, **session_kwargs)
+
+
+def pool_settings_from_config(db_config) -> Dict[str, Any]:
+    """Translate DatabaseConfig's pool section into create_engine arguments"""
+    pool = db_config.get_pool_config()
+    pool_size = pool.get("min_connections", DEFAULT_POOL["pool_size"])
+    max_connections = pool.get("max_connections", pool_size + DEFAULT_POOL["max_overflow"])
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max(max_connections - pool_size, 0),
+        "pool_timeout": pool.get("pool_timeout", DEFAULT_POOL["pool_timeout"]),
+        "pool_recycle": pool.get("pool_recycle", DEFAULT_POOL["pool_recycle"])
+    }
+
+
+def create_service_database(
+    service_name: str,
+    url: Optional[str] = None,
+    pool: Optional[Dict[str, Any]] = None,
+    echo: bool = False
+) -> Tuple[Union[Engine, AsyncEngine], Union[sessionmaker, async_sessionmaker]]:
+    """
+    Build a service's engine and session factory from DatabaseConfig
+
+    `url` and `pool` override the shared config, for services that
+    configure their own connection string or pool settings; pool keys
+    that are not given keep their configured values. A +asyncpg URL
+    yields an AsyncEngine and an async_sessionmaker.
+    """
+    from .database_config import db_config
+
+    options = db_config.get_engine_options()
+    engine_options = dict(
+        pool={**pool_settings_from_config(db_config), **(pool or {})},
+        statement_timeout_ms=options.get("statement_timeout_ms", DEFAULT_STATEMENT_TIMEOUT_MS),
+        slow_query_ms=options.get("slow_query_ms", DEFAULT_SLOW_QUERY_MS),
+        query_cache_size=options.get("query_cache_size", DEFAULT_QUERY_CACHE_SIZE),
+        echo=echo
+    )
+
+    url = url or db_config.get_database_url(service_name)
+    engine = create_db_engine(url, name=service_name, **engine_options)
+
+    replica_engine = None
+    replica = db_config.get_replica_config()
+    if replica:
+        # Same credentials and database as the primary, on the replica host
+        replica_url = make_url(url).set(host=replica["host"], port=replica["port"])
+        replica_engine = create_db_engine(
+            replica_url.render_as_string(hide_password=False),
+            name=f"{service_name}_replica",
+            **engine_options
+        )
+
+    return engine, create_session_factory(engine, replica_engine)
+
+
+def get_database_metrics() -> Dict[str, Any]:
+    """Pool and query metrics of every engine created by this module"""
+    return {name: metrics.snapshot(engine.pool) for name, (metrics, engine) in _engine_metrics.items()}
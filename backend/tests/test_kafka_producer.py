@@ -0,0 +1,282 @@
+"""KafkaEventProducer against an in-process fake broker"""
+import asyncio
+import json
+from collections import defaultdict
+
+import pytest
+
+from shared.events.producer import KafkaEventProducer
+
+
+class RetriableError(Exception):
+    retriable = True
+
+
+class FakeBroker:
+    """Collects delivered batches; can fail the next N delivery attempts"""
+
+    def __init__(self):
+        self.batches = []
+        self.fail_next = 0
+        self.fail_error = RetriableError
+        self.attempts = 0
+
+    @property
+    def records(self):
+        return [record for batch in self.batches for record in batch]
+
+
+class FakeProducer:
+    """Mimics AIOKafkaProducer: batches by size or linger, acks per record
+
+    Like the real client, a retriable failure is retried in place (every
+    retry_backoff_ms until request_timeout_ms) before anything after it is
+    delivered.
+    """
+
+    def __init__(self, broker: FakeBroker, bootstrap_servers: str, max_batch_size: int, linger_ms: int,
+                 request_timeout_ms: int, retry_backoff_ms: int, **config):
+        self.broker = broker
+        self.bootstrap_servers = bootstrap_servers
+        self.max_batch_size = max_batch_size
+        self.linger = linger_ms / 1000
+        self.max_attempts = max(1, request_timeout_ms // max(retry_backoff_ms, 1))
+        self.config = config
+        self.started = False
+        self.stopped = False
+        self.sends = 0
+        self._batch = []
+        self._batch_bytes = 0
+        self._linger_handle = None
+
+    async def start(self):
+        self.started = True
+
+    async def stop(self):
+        self.stopped = True
+
+    async def send(self, topic, value=None, key=None):
+        self.sends += 1
+        future = asyncio.get_running_loop().create_future()
+        self._batch.append((topic, key, value, future))
+        self._batch_bytes += len(value)
+        if self._batch_bytes >= self.max_batch_size:
+            self._deliver()
+        elif self._linger_handle is None:
+            self._linger_handle = asyncio.get_running_loop().call_later(self.linger, self._deliver)
+        return future
+
+    def _deliver(self):
+        if self._linger_handle is not None:
+            self._linger_handle.cancel()
+            self._linger_handle = None
+        batch, self._batch, self._batch_bytes = self._batch, [], 0
+        if not batch:
+            return
+        delivered = []
+        for topic, key, value, future in batch:
+            error = self._attempt()
+            if error is None:
+                delivered.append((topic, key, json.loads(value)))
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+        if delivered:
+            self.broker.batches.append(delivered)
+
+    def _attempt(self):
+        """Try one record until it lands, fails for good or the request times out"""
+        for _ in range(self.max_attempts):
+            self.broker.attempts += 1
+            if not self.broker.fail_next:
+                return None
+            self.broker.fail_next -= 1
+            error = self.broker.fail_error("broker unavailable")
+            if not getattr(error, "retriable", False):
+                return error
+        return error
+
+    async def flush(self):
+        self._deliver()
+
+
+def make_producer(broker, **kwargs):
+    kwargs.setdefault("retry_backoff_ms", 1)
+    return KafkaEventProducer(
+        "fake:9092",
+        producer_factory=lambda **config: FakeProducer(broker, **config),
+        **kwargs
+    )
+
+
+async def test_publish_is_buffered_and_batched_by_size():
+    broker = FakeBroker()
+    producer = make_producer(broker, batch_size=1024, linger_ms=60000)
+
+    for i in range(100):
+        assert await producer.publish("audit", {"tenant_id": f"t{i % 3}", "seq": i})
+
+    # Full batches were sent, the remainder is still buffered
+    await asyncio.sleep(0)
+    assert 1 < len(broker.batches) < 100
+    assert producer.get_metrics()["in_flight"] == 100 - len(broker.records)
+
+    await producer.flush()
+    await asyncio.sleep(0)
+
+    metrics = producer.get_metrics()
+    assert len(broker.records) == 100
+    assert metrics["delivered"] == 100
+    assert metrics["in_flight"] == 0
+    assert metrics["in_flight_bytes"] == 0
+
+
+async def test_records_keyed_by_tenant_keep_order():
+    broker = FakeBroker()
+    producer = make_producer(broker, linger_ms=1)
+
+    for i in range(30):
+        await producer.publish("audit", {"tenant_id": f"t{i % 3}", "seq": i})
+    await producer.close()
+
+    by_key = defaultdict(list)
+    for topic, key, event in broker.records:
+        by_key[key].append(event["seq"])
+    assert set(by_key) == {b"t0", b"t1", b"t2"}
+    assert all(seqs == sorted(seqs) for seqs in by_key.values())
+
+
+async def test_linger_sends_partial_batch():
+    broker = FakeBroker()
+    producer = make_producer(broker, linger_ms=5)
+
+    await producer.publish("audit", {"tenant_id": "t1"})
+    assert broker.records == []
+
+    await asyncio.sleep(0.05)
+    assert len(broker.records) == 1
+    await producer.close()
+
+
+async def test_retriable_delivery_failure_is_retried_by_the_client():
+    broker = FakeBroker()
+    broker.fail_next = 2
+    producer = make_producer(broker)
+
+    assert await producer.publish("audit", {"tenant_id": "t1", "seq": 1})
+    await producer.flush()
+
+    metrics = producer.get_metrics()
+    assert [event["seq"] for _, _, event in broker.records] == [1]
+    assert broker.attempts == 3
+    assert producer.producer.sends == 1
+    assert metrics["delivered"] == 1
+    assert metrics["failed"] == 0
+    assert metrics["in_flight"] == 0
+    await producer.close()
+
+
+async def test_order_per_key_survives_delivery_failures():
+    broker = FakeBroker()
+    producer = make_producer(broker, batch_size=256, linger_ms=60000)
+
+    for i in range(60):
+        if i in (7, 31):
+            broker.fail_next = 3
+        await producer.publish("audit", {"tenant_id": f"t{i % 3}", "seq": i})
+    await producer.close()
+
+    # Every record lands exactly once and in publish order per tenant; the
+    # producer itself never re-sends, so a retry cannot overtake later records
+    by_key = defaultdict(list)
+    for topic, key, event in broker.records:
+        by_key[key].append(event["seq"])
+    assert sorted(seq for seqs in by_key.values() for seq in seqs) == list(range(60))
+    assert all(seqs == sorted(seqs) for seqs in by_key.values())
+    assert producer.get_metrics()["failed"] == 0
+
+
+async def test_client_retries_are_bounded_by_request_timeout():
+    broker = FakeBroker()
+    broker.fail_next = 10
+    producer = make_producer(broker, request_timeout_ms=3)
+
+    await producer.publish("audit", {"tenant_id": "t1"})
+    await producer.publish("audit", {"tenant_id": "t1", "seq": 2})
+    await producer.flush()
+
+    metrics = producer.get_metrics()
+    assert broker.attempts == 6
+    assert broker.records == []
+    assert metrics["failed"] == 2
+    assert metrics["in_flight"] == 0
+    await producer.close()
+
+
+async def test_non_retriable_failure_is_not_retried():
+    broker = FakeBroker()
+    broker.fail_next = 1
+    broker.fail_error = ValueError
+    producer = make_producer(broker)
+
+    await producer.publish("audit", {"tenant_id": "t1"})
+    await producer.flush()
+
+    metrics = producer.get_metrics()
+    assert broker.attempts == 1
+    assert metrics["failed"] == 1
+    await producer.close()
+
+
+async def test_close_flushes_buffered_records():
+    broker = FakeBroker()
+    producer = make_producer(broker, linger_ms=60000)
+
+    for i in range(10):
+        await producer.publish("audit", {"tenant_id": "t1", "seq": i})
+    assert broker.records == []
+    fake = producer.producer
+
+    await producer.close()
+
+    assert [event["seq"] for _, _, event in broker.records] == list(range(10))
+    assert fake.stopped
+    assert producer.producer is None
+    assert producer.get_metrics()["delivered"] == 10
+
+
+async def test_producer_settings_are_passed_to_client():
+    broker = FakeBroker()
+    producer = make_producer(broker, compression_type="none", acks="all", batch_size=2048, linger_ms=7)
+
+    await producer.publish("audit", {"tenant_id": "t1"})
+
+    fake = producer.producer
+    assert fake.max_batch_size == 2048
+    assert fake.linger == pytest.approx(0.007)
+    assert fake.config["compression_type"] is None
+    assert fake.config["acks"] == "all"
+    assert fake.config["enable_idempotence"] is True
+    await producer.close()
+
+
+async def test_idempotence_forces_acks_all():
+    broker = FakeBroker()
+    idempotent = make_producer(broker, acks=1)
+    plain = make_producer(broker, acks=1, enable_idempotence=False)
+
+    assert idempotent.config["acks"] == "all"
+    assert plain.config["acks"] == 1
+    assert plain.config["enable_idempotence"] is False
+
+
+def test_producer_can_be_created_outside_event_loop():
+    broker = FakeBroker()
+    producer = make_producer(broker)
+
+    async def publish_and_close():
+        assert await producer.publish("audit", {"tenant_id": "t1"})
+        await producer.close()
+
+    asyncio.run(publish_and_close())
+    assert len(broker.records) == 1
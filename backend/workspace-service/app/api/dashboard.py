@@ -7,6 +7,7 @@ from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, timedelta
 
+from app.core.auth import get_current_user
 from app.schemas.dashboard import (
     DashboardResponse,
     QuickStatsResponse,
@@ -20,15 +21,6 @@ from app.schemas.dashboard import (
 router = APIRouter()
 
 
-# Mock dependency for getting current user
-async def get_current_user() -> dict:
-    return {
-        "user_id": UUID("550e8400-e29b-41d4-a716-446655440000"),
-        "tenant_id": UUID("550e8400-e29b-41d4-a716-446655440001"),
-        "email": "scholar@example.com"
-    }
-
-
 @router.get("/", response_model=DashboardResponse)
 async def get_dashboard(
     time_period: str = "30d",
@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, s
 from typing import List, Optional
 from uuid import UUID
 
+from app.core.auth import get_current_user
 from app.services.document_service import DocumentService
 from app.schemas.document import (
     DocumentResponse,
@@ -19,15 +20,6 @@ from app.schemas.document import (
 router = APIRouter()
 
 
-# Mock dependency for getting current user - would be replaced with actual auth
-async def get_current_user() -> dict:
-    return {
-        "user_id": UUID("550e8400-e29b-41d4-a716-446655440000"),
-        "tenant_id": UUID("550e8400-e29b-41d4-a716-446655440001"),
-        "email": "scholar@example.com"
-    }
-
-
 @router.post("/", response_model=DocumentUploadResponse)
 async def upload_document(
     file: UploadFile = File(...),
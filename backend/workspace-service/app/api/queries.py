@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List, Optional
 from uuid import UUID
 
+from app.core.auth import get_current_user
 from app.services.query_service import QueryService
 from app.schemas.query import (
     QueryCreate,
@@ -20,15 +21,6 @@ from app.schemas.query import (
 router = APIRouter()
 
 
-# Mock dependency for getting current user
-async def get_current_user() -> dict:
-    return {
-        "user_id": UUID("550e8400-e29b-41d4-a716-446655440000"),
-        "tenant_id": UUID("550e8400-e29b-41d4-a716-446655440001"),
-        "email": "scholar@example.com"
-    }
-
-
 @router.post("/", response_model=QueryResponse)
 async def create_query(
     query_data: QueryCreate,
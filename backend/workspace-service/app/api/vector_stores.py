@@ -3,29 +3,39 @@ Vector store management API endpoints.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
 from typing import List, Optional
-from uuid import UUID
+import logging
+import time
 
+from app.core.auth import get_current_user
+from app.core.config import get_settings
+from app.core.database import get_db
+from app.core.embedding_cache import get_embedding_cache
+from app.core.embedding_engine import get_embedding_engine
+from app.repositories.vector_store_repository import (
+    VectorStoreRepository,
+    DocumentVectorRepository,
+    HydrationMode
+)
 from app.schemas.vector_store import (
     VectorStoreResponse,
     VectorStoreStatsResponse,
     VectorStoreHealthCheckResponse,
     VectorSearchRequest,
     VectorSearchResponse,
+    VectorSearchResult,
+    DocumentVectorResponse,
+    VectorMetadataResponse,
     VectorIndexingRequest,
     VectorIndexingResponse
 )
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
 
+settings = get_settings()
 
-# Mock dependency for getting current user
-async def get_current_user() -> dict:
-    return {
-        "user_id": UUID("550e8400-e29b-41d4-a716-446655440000"),
-        "tenant_id": UUID("550e8400-e29b-41d4-a716-446655440001"),
-        "email": "scholar@example.com"
-    }
+router = APIRouter()
 
 
 @router.get("/stats", response_model=List[VectorStoreStatsResponse])
@@ -130,7 +140,8 @@ async def get_vector_stores_health(
 @router.post("/search", response_model=VectorSearchResponse)
 async def search_vectors(
     search_request: VectorSearchRequest,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """
     Search for similar vectors across accessible stores.
@@ -139,89 +150,64 @@ async def search_vectors(
     and debugging purposes. For normal research queries, use the query API.
     """
     try:
+        started = time.perf_counter()
+        
         # Determine accessible stores if not specified
-        store_ids = search_request.store_ids or [
+        candidate_ids = search_request.store_ids or [
             f"ws:{user['user_id']}",  # Private store
             f"global:{user['tenant_id']}"  # Global store
         ]
+        # Other users' private stores are never searchable
+        candidate_ids = [
+            store_id for store_id in candidate_ids
+            if not store_id.startswith("ws:") or store_id == f"ws:{user['user_id']}"
+        ]
+        store_ids = VectorStoreRepository(db).filter_active_store_ids(candidate_ids, user['tenant_id'])
         
-        # Mock search results
-        from app.schemas.vector_store import VectorSearchResult, DocumentVectorResponse
-        from datetime import datetime
+        query_vector = await get_embedding_cache().get_or_compute(
+            search_request.query, get_embedding_engine().embed_one
+        )
         
-        mock_results = [
-            VectorSearchResult(
-                document_vector=DocumentVectorResponse(
-                    id=UUID("550e8400-e29b-41d4-a716-446655440050"),
-                    vector_store_id=f"ws:{user['user_id']}",
-                    document_id=UUID("550e8400-e29b-41d4-a716-446655440030"),
-                    document_version_id=UUID("550e8400-e29b-41d4-a716-446655440031"),
-                    chunk_id="doc1_chunk_1",
-                    chunk_index=1,
-                    content="Cancer immunotherapy has revolutionized treatment approaches...",
-                    elasticsearch_doc_id="doc1_chunk_1",
-                    embedding_hash="abc123",
-                    word_count=89,
-                    char_count=456,
-                    page_number=1,
-                    section_title="Introduction",
-                    extraction_method="direct",
-                    processing_version="1.0",
-                    quality_score=0.95,
-                    query_count=5,
-                    citation_count=3,
-                    avg_relevance_score=0.87,
-                    last_retrieved=datetime.utcnow(),
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
-                ),
-                similarity_score=0.89,
-                rank=1,
-                metadata=None
+        similar_vectors = await DocumentVectorRepository(db).search_similar(
+            store_ids=store_ids,
+            query_vector=query_vector,
+            limit=search_request.limit,
+            similarity_threshold=(
+                search_request.similarity_threshold
+                if search_request.similarity_threshold is not None
+                else settings.similarity_threshold
             ),
+            filters=search_request.filters,
+            query_text=search_request.query,
+            retrieval_mode=search_request.retrieval_mode,
+            hydration=HydrationMode.FULL
+        )
+        
+        results = [
             VectorSearchResult(
-                document_vector=DocumentVectorResponse(
-                    id=UUID("550e8400-e29b-41d4-a716-446655440051"),
-                    vector_store_id=f"global:{user['tenant_id']}",
-                    document_id=UUID("550e8400-e29b-41d4-a716-446655440032"),
-                    document_version_id=UUID("550e8400-e29b-41d4-a716-446655440033"),
-                    chunk_id="global_doc2_chunk_1",
-                    chunk_index=1,
-                    content="Recent advances in CAR-T cell therapy show promising results...",
-                    elasticsearch_doc_id="global_doc2_chunk_1",
-                    embedding_hash="def456",
-                    word_count=76,
-                    char_count=387,
-                    page_number=2,
-                    section_title="Results",
-                    extraction_method="direct",
-                    processing_version="1.0",
-                    quality_score=0.92,
-                    query_count=12,
-                    citation_count=8,
-                    avg_relevance_score=0.83,
-                    last_retrieved=datetime.utcnow(),
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
-                ),
-                similarity_score=0.82,
-                rank=2,
-                metadata=None
+                document_vector=DocumentVectorResponse.from_orm(vector),
+                similarity_score=score,
+                rank=rank,
+                metadata=(
+                    VectorMetadataResponse.from_orm(vector.metadata)
+                    if search_request.include_metadata and vector.metadata is not None
+                    else None
+                )
             )
+            for rank, (vector, score) in enumerate(similar_vectors, start=1)
         ]
         
-        response = VectorSearchResponse(
+        return VectorSearchResponse(
             query=search_request.query,
-            results=mock_results[:search_request.limit],
-            total_found=len(mock_results),
-            search_time=0.23,
+            results=results,
+            total_found=len(results),
+            search_time=time.perf_counter() - started,
             stores_searched=store_ids,
             filters_applied=search_request.filters or {}
         )
         
-        return response
-        
     except Exception as e:
+        logger.error(f"Vector search failed: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Vector search failed"
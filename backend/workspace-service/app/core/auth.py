@@ -0,0 +1,62 @@
+"""
+Request authentication for workspace service.
+
+Access tokens issued by auth-service are verified locally against the
+public keys it publishes at /.well-known/jwks.json, so authenticating a
+request needs no call to auth-service.
+"""
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from typing import Optional
+from uuid import UUID
+import sys
+import os
+
+from app.core.config import get_settings
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
+from shared.auth import JWKSVerifier
+
+settings = get_settings()
+
+bearer_scheme = HTTPBearer()
+
+_jwks_verifier: Optional[JWKSVerifier] = None
+
+
+def get_jwks_verifier() -> JWKSVerifier:
+    """Get the application-wide JWKS verifier."""
+    global _jwks_verifier
+    
+    if _jwks_verifier is None:
+        _jwks_verifier = JWKSVerifier(
+            jwks_url=settings.auth_jwks_url or f"{settings.auth_service_url.rstrip('/')}/.well-known/jwks.json",
+            cache_ttl=settings.auth_jwks_cache_ttl
+        )
+    
+    return _jwks_verifier
+
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)) -> dict:
+    """Authenticated user from a bearer access token issued by auth-service."""
+    claims = await get_jwks_verifier().verify_async(credentials.credentials)
+    if not claims or claims.get("type") != "access" or not claims.get("tenant_id"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    
+    try:
+        return {
+            "user_id": UUID(claims["sub"]),
+            "tenant_id": UUID(claims["tenant_id"]),
+            "email": claims.get("email")
+        }
+    except (KeyError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token subject",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
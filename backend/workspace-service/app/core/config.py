@@ -28,6 +28,12 @@ class Settings(BaseSettings):
     # Vector Store Configuration
     elasticsearch_url: str = Field(..., env="ELASTICSEARCH_URL")
     elasticsearch_index_prefix: str = Field(default="openbiocure", env="ELASTICSEARCH_INDEX_PREFIX")
+    elasticsearch_connections_per_node: int = Field(default=25, env="ELASTICSEARCH_CONNECTIONS_PER_NODE")
+    elasticsearch_request_timeout: float = Field(default=30.0, env="ELASTICSEARCH_REQUEST_TIMEOUT")
+    elasticsearch_max_retries: int = Field(default=3, env="ELASTICSEARCH_MAX_RETRIES")
+    elasticsearch_http_compress: bool = Field(default=True, env="ELASTICSEARCH_HTTP_COMPRESS")
+    elasticsearch_sniff: bool = Field(default=False, env="ELASTICSEARCH_SNIFF")
+    elasticsearch_sniff_interval: float = Field(default=60.0, env="ELASTICSEARCH_SNIFF_INTERVAL")
     
     # File Storage Configuration
     minio_endpoint: str = Field(..., env="MINIO_ENDPOINT")
@@ -39,6 +45,13 @@ class Settings(BaseSettings):
     # Cache Configuration
     redis_url: str = Field(..., env="REDIS_URL")
     cache_ttl: int = Field(default=3600, env="CACHE_TTL")  # 1 hour
+    embedding_cache_size: int = Field(default=10000, env="EMBEDDING_CACHE_SIZE")  # In-process entries
+    embedding_cache_redis: bool = Field(default=True, env="EMBEDDING_CACHE_REDIS")
+    embedding_cache_dtype: str = Field(default="float16", env="EMBEDDING_CACHE_DTYPE")  # float16 or float32
+    retrieval_cache_enabled: bool = Field(default=True, env="RETRIEVAL_CACHE_ENABLED")
+    retrieval_cache_size: int = Field(default=2000, env="RETRIEVAL_CACHE_SIZE")  # In-process entries
+    retrieval_cache_stats_interval: int = Field(default=60, env="RETRIEVAL_CACHE_STATS_INTERVAL")  # Seconds
+    store_registry_ttl: int = Field(default=300, env="STORE_REGISTRY_TTL")  # Seconds; 0 disables
     
     # Event Bus Configuration
     kafka_bootstrap_servers: str = Field(..., env="KAFKA_BOOTSTRAP_SERVERS")
@@ -46,6 +59,12 @@ class Settings(BaseSettings):
     
     # AI/ML Configuration
     embeddings_model: str = Field(default="sentence-transformers/all-MiniLM-L6-v2", env="EMBEDDINGS_MODEL")
+    embeddings_backend: str = Field(default="torch", env="EMBEDDINGS_BACKEND")  # torch or onnx
+    embeddings_onnx_path: Optional[str] = Field(default=None, env="EMBEDDINGS_ONNX_PATH")
+    embedding_workers: int = Field(default=2, env="EMBEDDING_WORKERS")  # Worker processes
+    embedding_threads_per_worker: int = Field(default=2, env="EMBEDDING_THREADS_PER_WORKER")
+    embedding_max_batch_size: int = Field(default=32, env="EMBEDDING_MAX_BATCH_SIZE")
+    embedding_max_wait_ms: float = Field(default=5.0, env="EMBEDDING_MAX_WAIT_MS")
     openai_api_key: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
     anthropic_api_key: Optional[str] = Field(default=None, env="ANTHROPIC_API_KEY")
     max_chunk_size: int = Field(default=1000, env="MAX_CHUNK_SIZE")
@@ -61,6 +80,8 @@ class Settings(BaseSettings):
     secret_key: str = Field(..., env="SECRET_KEY")
     algorithm: str = Field(default="HS256", env="ALGORITHM")
     access_token_expire_minutes: int = Field(default=30, env="ACCESS_TOKEN_EXPIRE_MINUTES")
+    auth_jwks_url: Optional[str] = Field(default=None, env="AUTH_JWKS_URL")  # Defaults to auth-service's JWKS
+    auth_jwks_cache_ttl: int = Field(default=300, env="AUTH_JWKS_CACHE_TTL")  # Seconds
     
     # Processing Configuration
     max_file_size: int = Field(default=100 * 1024 * 1024, env="MAX_FILE_SIZE")  # 100MB
@@ -76,6 +97,32 @@ class Settings(BaseSettings):
     max_results_limit: int = Field(default=100, env="MAX_RESULTS_LIMIT")
     similarity_threshold: float = Field(default=0.7, env="SIMILARITY_THRESHOLD")
     
+    # Vector Search Configuration
+    knn_num_candidates_factor: int = Field(default=10, env="KNN_NUM_CANDIDATES_FACTOR")
+    knn_min_num_candidates: int = Field(default=100, env="KNN_MIN_NUM_CANDIDATES")
+    knn_max_num_candidates: int = Field(default=10000, env="KNN_MAX_NUM_CANDIDATES")
+    exact_search_max_docs: int = Field(default=5000, env="EXACT_SEARCH_MAX_DOCS")
+    index_doc_count_ttl: int = Field(default=300, env="INDEX_DOC_COUNT_TTL")  # 5 minutes
+    
+    # Scatter/Gather Search Configuration
+    scatter_gather_enabled: bool = Field(default=True, env="SCATTER_GATHER_ENABLED")
+    store_search_timeout_ms: int = Field(default=500, env="STORE_SEARCH_TIMEOUT_MS")  # Per-store deadline
+    store_latency_ewma_alpha: float = Field(default=0.2, env="STORE_LATENCY_EWMA_ALPHA")
+    store_latency_stats_interval: int = Field(default=60, env="STORE_LATENCY_STATS_INTERVAL")  # Seconds
+    
+    # Hybrid Retrieval Configuration
+    hybrid_fusion: str = Field(default="rrf", env="HYBRID_FUSION")  # rrf or weighted
+    search_hydration: str = Field(default="lean", env="SEARCH_HYDRATION")  # full, lean or es
+    hybrid_vector_weight: float = Field(default=0.5, env="HYBRID_VECTOR_WEIGHT")
+    hybrid_rank_window: int = Field(default=50, env="HYBRID_RANK_WINDOW")
+    rrf_rank_constant: int = Field(default=60, env="RRF_RANK_CONSTANT")
+    
+    # Bulk Indexing Configuration
+    bulk_chunk_size: int = Field(default=500, env="BULK_CHUNK_SIZE")  # Actions per _bulk request
+    bulk_max_chunk_bytes: int = Field(default=10 * 1024 * 1024, env="BULK_MAX_CHUNK_BYTES")  # 10MB
+    bulk_concurrency: int = Field(default=4, env="BULK_CONCURRENCY")
+    bulk_refresh_disable_threshold: int = Field(default=5000, env="BULK_REFRESH_DISABLE_THRESHOLD")
+    
     # Monitoring Configuration
     enable_metrics: bool = Field(default=True, env="ENABLE_METRICS")
     metrics_port: int = Field(default=8005, env="METRICS_PORT")
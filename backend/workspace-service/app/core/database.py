@@ -2,32 +2,35 @@
 Database configuration and session management for workspace service.
 """
 
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import MetaData
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import Session
 from typing import Generator
 import logging
+import sys
+import os
 
 from app.core.config import get_settings
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
+from shared.utils.database_engine import create_service_database
+
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
-# Create database engine
-engine = create_engine(
-    settings.database_url,
-    poolclass=QueuePool,
-    pool_size=settings.database_pool_size,
-    max_overflow=settings.database_pool_overflow,
-    pool_pre_ping=True,
+# Create database engine and session factory; the pool size stays
+# configurable through DATABASE_POOL_SIZE / DATABASE_POOL_OVERFLOW
+engine, SessionLocal = create_service_database(
+    "main",
+    url=settings.database_url,
+    pool={
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_pool_overflow,
+    },
     echo=settings.debug,
 )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 # Create declarative base
 Base = declarative_base()
 
@@ -0,0 +1,217 @@
+"""
+Two-tier cache for query embeddings.
+
+Embeddings are keyed by (model name, hash of the normalised query text).
+An in-process LRU answers repeated queries without any I/O; a shared Redis
+tier stores compact float16/float32 bytes so every replica benefits from
+embeddings computed elsewhere. Both tiers expire entries after
+settings.cache_ttl seconds.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import hashlib
+import logging
+import time
+import unicodedata
+
+import numpy as np
+
+from app.core.config import get_settings
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+def normalize_query(text: str) -> str:
+    """Case-fold and collapse whitespace so trivially different queries share an entry."""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+class QueryEmbeddingCache:
+    """LRU + Redis cache of query embeddings with hit-rate metrics."""
+
+    def __init__(
+        self,
+        model_name: str,
+        max_entries: int = 10000,
+        ttl: int = 3600,
+        redis_url: Optional[str] = None,
+        dtype: str = "float16"
+    ):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.redis_url = redis_url
+        self.dtype = np.dtype(dtype)
+        self._local: "OrderedDict[str, Tuple[float, np.ndarray]]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._redis = None
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.redis_errors = 0
+
+    def _key(self, text: str) -> str:
+        digest = hashlib.sha256(normalize_query(text).encode("utf-8")).hexdigest()
+        return f"embedding:{self.model_name}:{digest}"
+
+    def _get_redis(self):
+        if self._redis is None and self.redis_url and aioredis is not None:
+            self._redis = aioredis.from_url(self.redis_url)
+        return self._redis
+
+    def _get_local(self, key: str) -> Optional[np.ndarray]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, embedding = entry
+        if expires_at < time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return embedding
+
+    def _put_local(self, key: str, embedding: np.ndarray):
+        self._local[key] = (time.monotonic() + self.ttl, embedding)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def _get_remote(self, key: str) -> Optional[np.ndarray]:
+        client = self._get_redis()
+        if client is None:
+            return None
+        try:
+            payload = await client.get(key)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Embedding cache read failed: {e}")
+            return None
+        if payload is None:
+            return None
+        return np.frombuffer(payload, dtype=self.dtype).astype(np.float32)
+
+    async def _put_remote(self, key: str, embedding: np.ndarray):
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            await client.set(key, np.asarray(embedding, dtype=self.dtype).tobytes(), ex=self.ttl)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    async def get(self, text: str) -> Optional[np.ndarray]:
+        """Cached embedding for a query, or None."""
+        key = self._key(text)
+        embedding = self._get_local(key)
+        if embedding is not None:
+            self.local_hits += 1
+            return embedding
+
+        embedding = await self._get_remote(key)
+        if embedding is not None:
+            self.redis_hits += 1
+            self._put_local(key, embedding)
+            return embedding
+
+        self.misses += 1
+        return None
+
+    async def set(self, text: str, embedding: np.ndarray):
+        key = self._key(text)
+        embedding = np.asarray(embedding, dtype=np.float32)
+        self._put_local(key, embedding)
+        await self._put_remote(key, embedding)
+
+    async def get_or_compute(
+        self,
+        text: str,
+        compute: Callable[[str], Awaitable[np.ndarray]]
+    ) -> np.ndarray:
+        """
+        Return the cached embedding or compute and store it.
+
+        Concurrent misses for the same query share a single computation.
+        """
+        embedding = await self.get(text)
+        if embedding is not None:
+            return embedding
+
+        key = self._key(text)
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            embedding = np.asarray(await compute(text), dtype=np.float32)
+            await self.set(text, embedding)
+            future.set_result(embedding)
+            return embedding
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark retrieved so an unawaited future doesn't log
+            future.exception()
+            raise
+        finally:
+            del self._pending[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.local_hits + self.redis_hits
+        lookups = hits + self.misses
+        return {
+            "model": self.model_name,
+            "lookups": lookups,
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "local_entries": len(self._local),
+            "redis_errors": self.redis_errors
+        }
+
+    async def close(self):
+        if self._redis is not None:
+            try:
+                await self._redis.close()
+            except Exception as e:
+                logger.error(f"Failed to close embedding cache Redis connection: {e}")
+            finally:
+                self._redis = None
+
+
+_embedding_cache: Optional[QueryEmbeddingCache] = None
+
+
+def get_embedding_cache() -> QueryEmbeddingCache:
+    """Get the application-wide query embedding cache."""
+    global _embedding_cache
+
+    if _embedding_cache is None:
+        _embedding_cache = QueryEmbeddingCache(
+            model_name=settings.embeddings_model,
+            max_entries=settings.embedding_cache_size,
+            ttl=settings.cache_ttl,
+            redis_url=settings.redis_url if settings.embedding_cache_redis else None,
+            dtype=settings.embedding_cache_dtype
+        )
+
+    return _embedding_cache
+
+
+async def close_embedding_cache() -> None:
+    global _embedding_cache
+
+    if _embedding_cache is not None:
+        await _embedding_cache.close()
+        _embedding_cache = None
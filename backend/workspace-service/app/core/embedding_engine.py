@@ -0,0 +1,307 @@
+"""
+CPU embedding engine with dynamic micro-batching.
+
+The model runs in a pool of worker processes (torch via sentence-transformers,
+or ONNX Runtime), so encoding never blocks the event loop and scales across
+cores. Concurrent `embed` calls are coalesced into one batch until either
+`max_batch_size` texts are queued or the oldest has waited `max_wait_ms`,
+which keeps single-query latency low while batching under load. If a worker
+dies (e.g. killed for memory), the pool is replaced and the batch retried once.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import bisect
+import logging
+import multiprocessing
+import time
+
+import numpy as np
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+# Worker process state; each process loads its own copy of the model
+_worker_model = None
+
+
+def _worker_init(model_name: str, backend: str, onnx_path: Optional[str], threads: int):
+    global _worker_model
+
+    if backend == "onnx":
+        _worker_model = _OnnxEncoder(model_name, onnx_path, threads)
+    else:
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        torch.set_num_threads(threads)
+        _worker_model = SentenceTransformer(model_name, device="cpu")
+
+
+def _worker_encode(texts: List[str]) -> np.ndarray:
+    if isinstance(_worker_model, _OnnxEncoder):
+        return _worker_model.encode(texts)
+    embeddings = _worker_model.encode(texts, batch_size=len(texts), normalize_embeddings=True, convert_to_numpy=True)
+    return embeddings.astype(np.float32, copy=False)
+
+
+class _OnnxEncoder:
+    """Mean-pooled, L2-normalised sentence embeddings from an exported ONNX model."""
+
+    def __init__(self, model_name: str, onnx_path: Optional[str], threads: int):
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        if not onnx_path:
+            raise ValueError("EMBEDDINGS_ONNX_PATH is required for the onnx backend")
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        tokens = self.tokenizer(texts, padding=True, truncation=True, return_tensors="np")
+        inputs = {name: value.astype(np.int64) for name, value in tokens.items() if name in self.input_names}
+        token_embeddings = self.session.run(None, inputs)[0]
+
+        mask = tokens["attention_mask"][..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative counts per upper bound, like Prometheus)."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets + ["+Inf"], self.counts):
+            running += count
+            cumulative[str(bound)] = running
+        return {
+            "count": self.count,
+            "avg": round(self.sum / self.count, 3) if self.count else 0.0,
+            "buckets": cumulative
+        }
+
+
+class EmbeddingEngine:
+    """Embeds text on CPU worker processes, coalescing concurrent requests into micro-batches."""
+
+    def __init__(
+        self,
+        model_name: str,
+        backend: str = "torch",
+        workers: int = 2,
+        threads_per_worker: int = 2,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        onnx_path: Optional[str] = None
+    ):
+        self.model_name = model_name
+        self.backend = backend
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.onnx_path = onnx_path
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._batches: set = set()
+        self._start_lock = asyncio.Lock()
+        self.restarts = 0
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32, 64, 128])
+        self.batch_latency_ms = Histogram([5, 10, 25, 50, 100, 250, 500, 1000])
+        self.request_latency_ms = Histogram([5, 10, 25, 50, 100, 250, 500, 1000])
+
+    async def start(self):
+        """Spawn the worker processes and load the model in each of them."""
+        async with self._start_lock:
+            if self._executor is None:
+                await self._start()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            # Spawned workers don't inherit the event loop, sockets or locks
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_worker_init,
+            initargs=(self.model_name, self.backend, self.onnx_path, self.threads_per_worker)
+        )
+
+    async def _start(self):
+        self._executor = self._new_executor()
+        self._queue = asyncio.Queue()
+        self._in_flight = asyncio.Semaphore(self.workers)
+        self._batcher = asyncio.create_task(self._run_batcher())
+
+        # Warm every worker so the first real requests don't pay for model loading
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.gather(*(
+                loop.run_in_executor(self._executor, _worker_encode, ["warm up"]) for _ in range(self.workers)
+            ))
+        except BaseException:
+            # Leave the engine stopped so the next start()/embed() retries from scratch
+            await self.close()
+            raise
+        logger.info(f"Embedding engine started: {self.model_name} ({self.backend}, {self.workers} workers)")
+
+    def _replace_executor(self, broken: ProcessPoolExecutor):
+        """Swap a broken pool for a fresh one (once, however many batches saw it break)."""
+        if self._executor is broken:
+            logger.error("Embedding worker process died; restarting the worker pool")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+            self.restarts += 1
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts; returns a float32 array of shape (len(texts), dims)."""
+        if self._executor is None:
+            await self.start()
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._queue.put_nowait((text, future))
+            futures.append(future)
+
+        embeddings = np.stack(await asyncio.gather(*futures))
+        self.request_latency_ms.observe((time.perf_counter() - started) * 1000)
+        return embeddings
+
+    async def embed_one(self, text: str) -> np.ndarray:
+        """Embed a single text; returns a float32 vector."""
+        return (await self.embed([text]))[0]
+
+    async def _next_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run_batcher(self):
+        while True:
+            batch = await self._next_batch()
+            # Wait for a free worker, so the batch keeps growing meanwhile
+            await self._in_flight.acquire()
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            task = asyncio.create_task(self._encode_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _encode_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        started = time.perf_counter()
+        texts = [text for text, _ in batch]
+        loop = asyncio.get_running_loop()
+        try:
+            executor = self._executor
+            try:
+                embeddings = await loop.run_in_executor(executor, _worker_encode, texts)
+            except BrokenProcessPool:
+                self._replace_executor(executor)
+                embeddings = await loop.run_in_executor(self._executor, _worker_encode, texts)
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(batch)} failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._in_flight.release()
+
+        self.batch_sizes.observe(len(batch))
+        self.batch_latency_ms.observe((time.perf_counter() - started) * 1000)
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.model_name,
+            "backend": self.backend,
+            "workers": self.workers,
+            "running": self._executor is not None,
+            "restarts": self.restarts,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batch_size": self.batch_sizes.snapshot(),
+            "batch_latency_ms": self.batch_latency_ms.snapshot(),
+            "request_latency_ms": self.request_latency_ms.snapshot()
+        }
+
+    async def close(self):
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+_embedding_engine: Optional[EmbeddingEngine] = None
+
+
+def get_embedding_engine() -> EmbeddingEngine:
+    """Get the application-wide embedding engine."""
+    global _embedding_engine
+
+    if _embedding_engine is None:
+        _embedding_engine = EmbeddingEngine(
+            model_name=settings.embeddings_model,
+            backend=settings.embeddings_backend,
+            workers=settings.embedding_workers,
+            threads_per_worker=settings.embedding_threads_per_worker,
+            max_batch_size=settings.embedding_max_batch_size,
+            max_wait_ms=settings.embedding_max_wait_ms,
+            onnx_path=settings.embeddings_onnx_path
+        )
+
+    return _embedding_engine
+
+
+async def close_embedding_engine() -> None:
+    global _embedding_engine
+
+    if _embedding_engine is not None:
+        await _embedding_engine.close()
+        _embedding_engine = None
@@ -0,0 +1,249 @@
+"""
+Cache of first-stage retrieval results.
+
+Entries are keyed by the queried stores, the query vector (quantised to
+float16 so numerically identical embeddings share a key), the search
+parameters and each store's generation. Indexing or deleting vectors bumps
+the store's generation, which makes every cached result for that store
+unreachable without having to find and delete them. Generations live in
+Redis so all replicas see an invalidation immediately; results are kept in
+an in-process LRU and in Redis. Per-store hit/lookup counters are summed in
+Redis too, so reported hit rates cover every replica.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+import time
+
+import numpy as np
+
+from app.core.config import get_settings
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class RetrievalCache:
+    """Generation-invalidated LRU + Redis cache of search results with per-store hit rates."""
+
+    def __init__(self, max_entries: int = 2000, redis_url: Optional[str] = None):
+        self.max_entries = max_entries
+        self.redis_url = redis_url
+        self._local: "OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        # Fallback generations when Redis is unavailable (this process only)
+        self._generations: Dict[str, int] = {}
+        self._store_stats: Dict[str, List[int]] = {}
+        # Counts not yet added to the Redis totals
+        self._pending_stats: Dict[str, List[int]] = {}
+        self._last_collect = time.monotonic()
+        self._redis = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.redis_errors = 0
+
+    def _get_redis(self):
+        if self._redis is None and self.redis_url and aioredis is not None:
+            self._redis = aioredis.from_url(self.redis_url)
+        return self._redis
+
+    @staticmethod
+    def _generation_key(store_id: str) -> str:
+        return f"retrieval:generation:{store_id}"
+
+    @staticmethod
+    def _stats_key(store_id: str) -> str:
+        return f"retrieval:stats:{store_id}"
+
+    async def _get_generations(self, store_ids: Sequence[str]) -> List[int]:
+        client = self._get_redis()
+        if client is not None:
+            try:
+                values = await client.mget([self._generation_key(store_id) for store_id in store_ids])
+                return [int(value or 0) for value in values]
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Retrieval cache generation read failed: {e}")
+        return [self._generations.get(store_id, 0) for store_id in store_ids]
+
+    async def invalidate_store(self, store_id: str):
+        """Bump a store's generation after its index changed."""
+        self.invalidations += 1
+        self._generations[store_id] = self._generations.get(store_id, 0) + 1
+        client = self._get_redis()
+        if client is not None:
+            try:
+                await client.incr(self._generation_key(store_id))
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Retrieval cache invalidation failed for {store_id}: {e}")
+
+    @staticmethod
+    def _make_key(
+        store_ids: Sequence[str],
+        generations: Sequence[int],
+        query_vector: Any,
+        params: Dict[str, Any]
+    ) -> str:
+        digest = hashlib.sha256()
+        digest.update(json.dumps(list(zip(store_ids, generations))).encode("utf-8"))
+        digest.update(np.asarray(query_vector, dtype=np.float16).tobytes())
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+        return f"retrieval:results:{digest.hexdigest()}"
+
+    def _record(self, store_ids: Sequence[str], hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        for store_id in store_ids:
+            for counters in (self._store_stats, self._pending_stats):
+                stats = counters.setdefault(store_id, [0, 0])
+                stats[0] += hit
+                stats[1] += 1
+
+    async def get(
+        self,
+        store_ids: Sequence[str],
+        query_vector: Any,
+        params: Dict[str, Any]
+    ) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+        """Return (cache key, cached results or None) for a search."""
+        store_ids = sorted(store_ids)
+        key = self._make_key(store_ids, await self._get_generations(store_ids), query_vector, params)
+
+        results = None
+        entry = self._local.get(key)
+        if entry is not None:
+            if entry[0] >= time.monotonic():
+                self._local.move_to_end(key)
+                results = entry[1]
+            else:
+                del self._local[key]
+
+        if results is None:
+            client = self._get_redis()
+            if client is not None:
+                try:
+                    payload = await client.get(key)
+                    if payload is not None:
+                        results = json.loads(payload)
+                        ttl = await client.ttl(key)
+                        self._put_local(key, results, ttl if ttl and ttl > 0 else 1)
+                except Exception as e:
+                    self.redis_errors += 1
+                    logger.warning(f"Retrieval cache read failed: {e}")
+
+        self._record(store_ids, results is not None)
+        return key, results
+
+    def _put_local(self, key: str, results: List[Dict[str, Any]], ttl: int):
+        self._local[key] = (time.monotonic() + ttl, results)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def set(self, key: str, results: List[Dict[str, Any]], ttl: int):
+        self._put_local(key, results, ttl)
+        client = self._get_redis()
+        if client is not None:
+            try:
+                await client.set(key, json.dumps(results, default=str), ex=ttl)
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Retrieval cache write failed: {e}")
+
+    async def collect_hit_rates(self, min_interval: float) -> Dict[str, float]:
+        """
+        Per-store hit rates, at most once every `min_interval` seconds.
+
+        This process's new counts are added to the Redis totals first, and
+        the rates are computed from those totals (all replicas). Without
+        Redis they cover this process only.
+        """
+        now = time.monotonic()
+        if now - self._last_collect < min_interval:
+            return {}
+        self._last_collect = now
+
+        client = self._get_redis()
+        if client is not None and self._store_stats:
+            pending, self._pending_stats = self._pending_stats, {}
+            store_ids = list(self._store_stats)
+            try:
+                pipe = client.pipeline(transaction=False)
+                for store_id, (hits, lookups) in pending.items():
+                    pipe.hincrby(self._stats_key(store_id), "hits", hits)
+                    pipe.hincrby(self._stats_key(store_id), "lookups", lookups)
+                for store_id in store_ids:
+                    pipe.hmget(self._stats_key(store_id), "hits", "lookups")
+                totals = (await pipe.execute())[-len(store_ids):]
+                return {
+                    store_id: int(hits) / int(lookups)
+                    for store_id, (hits, lookups) in zip(store_ids, totals)
+                    if lookups and int(lookups)
+                }
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Retrieval cache stats sync failed: {e}")
+                # Keep the counts for the next sync
+                for store_id, (hits, lookups) in pending.items():
+                    stats = self._pending_stats.setdefault(store_id, [0, 0])
+                    stats[0] += hits
+                    stats[1] += lookups
+
+        return {store_id: hits / lookups for store_id, (hits, lookups) in self._store_stats.items() if lookups}
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "lookups": lookups,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "local_entries": len(self._local),
+            "invalidations": self.invalidations,
+            "redis_errors": self.redis_errors
+        }
+
+    async def close(self):
+        if self._redis is not None:
+            try:
+                await self._redis.close()
+            except Exception as e:
+                logger.error(f"Failed to close retrieval cache Redis connection: {e}")
+            finally:
+                self._redis = None
+
+
+_retrieval_cache: Optional[RetrievalCache] = None
+
+
+def get_retrieval_cache() -> RetrievalCache:
+    """Get the application-wide retrieval result cache."""
+    global _retrieval_cache
+
+    if _retrieval_cache is None:
+        _retrieval_cache = RetrievalCache(
+            max_entries=settings.retrieval_cache_size,
+            redis_url=settings.redis_url
+        )
+
+    return _retrieval_cache
+
+
+async def close_retrieval_cache() -> None:
+    global _retrieval_cache
+
+    if _retrieval_cache is not None:
+        await _retrieval_cache.close()
+        _retrieval_cache = None
@@ -0,0 +1,65 @@
+"""
+Elasticsearch client management for workspace service.
+"""
+
+from typing import Optional
+import logging
+
+from app.core.config import get_settings
+
+try:
+    from elasticsearch import AsyncElasticsearch
+except ImportError:
+    AsyncElasticsearch = None
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# One client for the lifetime of the application; it owns the HTTP
+# connection pool, so creating one per request would defeat keep-alive
+_client: Optional["AsyncElasticsearch"] = None
+
+
+def get_es_client() -> "AsyncElasticsearch":
+    """
+    Get the shared AsyncElasticsearch client, creating it on first use.
+
+    Returns:
+        AsyncElasticsearch: Application-wide client
+    """
+    global _client
+
+    if _client is None:
+        if AsyncElasticsearch is None:
+            raise ImportError("Elasticsearch not installed. Run: pip install elasticsearch[async]")
+
+        _client = AsyncElasticsearch(
+            settings.elasticsearch_url.split(","),
+            connections_per_node=settings.elasticsearch_connections_per_node,
+            request_timeout=settings.elasticsearch_request_timeout,
+            max_retries=settings.elasticsearch_max_retries,
+            retry_on_timeout=True,
+            http_compress=settings.elasticsearch_http_compress,
+            # Sniffing discovers data nodes directly; leave it off behind a load balancer
+            sniff_on_start=settings.elasticsearch_sniff,
+            sniff_on_node_failure=settings.elasticsearch_sniff,
+            min_delay_between_sniffing=settings.elasticsearch_sniff_interval
+        )
+        logger.info("Elasticsearch client created")
+
+    return _client
+
+
+async def close_es_client() -> None:
+    """Close the shared client and its connections."""
+    global _client
+
+    if _client is not None:
+        try:
+            await _client.close()
+            logger.info("Elasticsearch connections closed")
+        except Exception as e:
+            logger.error(f"Failed to close Elasticsearch connections: {e}")
+        finally:
+            _client = None
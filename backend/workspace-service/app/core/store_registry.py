@@ -0,0 +1,81 @@
+"""
+In-process registry of active vector stores per tenant.
+
+Query routing only needs to know which candidate store ids exist and are
+active. The registry caches that set for each tenant, so routing a MULTI
+scope query costs at most one query per tenant per TTL instead of one
+primary-key lookup per store. VectorStoreRepository invalidates a tenant
+whenever one of its stores is created, deleted, updated or changes health;
+other replicas pick the change up when their entry expires.
+"""
+
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+import threading
+import time
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class StoreRegistry:
+    """TTL cache of active store ids keyed by tenant."""
+
+    def __init__(self, ttl: int = 300):
+        self.ttl = ttl
+        self._tenants: Dict[str, Tuple[float, FrozenSet[str]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, tenant_id: Any) -> Optional[FrozenSet[str]]:
+        with self._lock:
+            entry = self._tenants.get(str(tenant_id))
+            if entry is not None and entry[0] >= time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, tenant_id: Any, store_ids) -> FrozenSet[str]:
+        store_ids = frozenset(store_ids)
+        with self._lock:
+            self._tenants[str(tenant_id)] = (time.monotonic() + self.ttl, store_ids)
+        return store_ids
+
+    def invalidate(self, tenant_id: Optional[Any] = None):
+        """Forget one tenant's stores, or every tenant's when tenant_id is None."""
+        with self._lock:
+            self.invalidations += 1
+            if tenant_id is None:
+                self._tenants.clear()
+            else:
+                self._tenants.pop(str(tenant_id), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "tenants": len(self._tenants),
+            "lookups": lookups,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations
+        }
+
+
+_store_registry: Optional[StoreRegistry] = None
+
+
+def get_store_registry() -> StoreRegistry:
+    """Get the application-wide store registry."""
+    global _store_registry
+
+    if _store_registry is None:
+        _store_registry = StoreRegistry(ttl=settings.store_registry_ttl)
+
+    return _store_registry
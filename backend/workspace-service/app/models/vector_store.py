@@ -19,6 +19,18 @@ class VectorStoreType(str, Enum):
     GLOBAL = "global"        # global:tenantId - Tenant-wide knowledge
 
 
+class RetrievalMode(str, Enum):
+    """First-stage retrieval strategy for a vector store."""
+    VECTOR = "vector"        # kNN over embeddings only
+    HYBRID = "hybrid"        # kNN fused with BM25 over chunk content
+
+
+class FusionMethod(str, Enum):
+    """How hybrid retrieval combines vector and lexical rankings."""
+    RRF = "rrf"              # Reciprocal rank fusion
+    WEIGHTED = "weighted"    # Weighted sum of normalised scores
+
+
 class VectorStoreHealth(str, Enum):
     """Vector store health status."""
     HEALTHY = "healthy"
@@ -62,6 +74,7 @@ class VectorStore(Base):
     chunk_size = Column(Integer, default=1000)
     chunk_overlap = Column(Integer, default=100)
     similarity_threshold = Column(Float, default=0.7)
+    retrieval_mode = Column(String, default=RetrievalMode.VECTOR)  # RetrievalMode enum
     
     # Index management
     elasticsearch_index = Column(String, nullable=False)  # Actual ES index name
@@ -202,7 +215,7 @@ class VectorSearchIndex(Base):
     id = Column(pg_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Index configuration
-    vector_store_id = Column(String, ForeignKey("vector_stores.id"), nullable=False, index=True)
+    vector_store_id = Column(String, ForeignKey("vector_stores.id"), nullable=False, unique=True, index=True)
     index_name = Column(String, nullable=False)
     index_type = Column(String, default="similarity")  # similarity, keyword, hybrid
     
@@ -6,7 +6,7 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
 
-from backend.shared.repositories.base_repository import BaseRepository
+from shared.repositories.base_repository import BaseRepository
 from app.models.document import Document, DocumentVersion, DocumentPermission, DocumentAnalytics
 from app.models.document import DocumentStatus, DocumentType
 from sqlalchemy.orm import Session, joinedload
@@ -122,8 +122,12 @@ class DocumentRepository(BaseRepository[Document]):
         return documents, total_count
     
     def get_by_id_with_tenant(self, document_id: UUID, tenant_id: UUID) -> Optional[Document]:
-        """Get document by ID with tenant isolation."""
-        return (
+        """Get document by ID with tenant isolation, reusing it if already loaded this request."""
+        document = self._cached(document_id)
+        if document is not None:
+            return document if str(document.tenant_id) == str(tenant_id) else None
+        
+        return self._remember(
             self.db.query(Document)
             .filter(
                 and_(
@@ -149,7 +153,7 @@ class DocumentRepository(BaseRepository[Document]):
             .filter(Document.id == document_id)
             .update(update_data)
         )
-        self.db.commit()
+        self._commit()
         return result > 0
     
     def get_shared_documents(self, user_id: UUID, tenant_id: UUID) -> List[Document]:
@@ -275,7 +279,7 @@ class DocumentVersionRepository(BaseRepository[DocumentVersion]):
             'version_count': next_version
         })
         
-        self.db.commit()
+        self._commit()
         self.db.refresh(new_version)
         return new_version
     
@@ -290,7 +294,7 @@ class DocumentVersionRepository(BaseRepository[DocumentVersion]):
             .filter(DocumentVersion.id == version_id)
             .update(update_data)
         )
-        self.db.commit()
+        self._commit()
         return result > 0
     
     def get_pending_embeddings(self, limit: int = 50) -> List[DocumentVersion]:
@@ -351,7 +355,7 @@ class DocumentPermissionRepository(BaseRepository[DocumentPermission]):
         )
         
         self.db.add(permission)
-        self.db.commit()
+        self._commit()
         self.db.refresh(permission)
         return permission
     
@@ -367,7 +371,7 @@ class DocumentPermissionRepository(BaseRepository[DocumentPermission]):
             )
             .update({'is_active': False})
         )
-        self.db.commit()
+        self._commit()
         return result > 0
     
     def check_project_access(self, document_id: UUID, project_id: UUID) -> Optional[DocumentPermission]:
@@ -410,5 +414,5 @@ class DocumentPermissionRepository(BaseRepository[DocumentPermission]):
             .filter(DocumentPermission.id == permission_id)
             .update(update_data)
         )
-        self.db.commit()
+        self._commit()
         return result > 0
@@ -6,7 +6,7 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
 
-from backend.shared.repositories.base_repository import BaseRepository
+from shared.repositories.base_repository import BaseRepository
 from app.models.query import Query, Conversation, Citation, SavedSearch
 from app.models.query import QueryScope, QueryStatus
 from sqlalchemy.orm import Session, joinedload
@@ -150,7 +150,7 @@ class QueryRepository(BaseRepository[Query]):
             .filter(Query.id == query_id)
             .update(update_data)
         )
-        self.db.commit()
+        self._commit()
         return result > 0
     
     def update_answer(
@@ -173,7 +173,7 @@ class QueryRepository(BaseRepository[Query]):
             .filter(Query.id == query_id)
             .update(update_data)
         )
-        self.db.commit()
+        self._commit()
         return result > 0
     
     def get_pending_queries(self, limit: int = 50) -> List[Query]:
@@ -343,7 +343,7 @@ class ConversationRepository(BaseRepository[Conversation]):
             .filter(Conversation.id == conversation_id)
             .update({'last_activity': datetime.utcnow()})
         )
-        self.db.commit()
+        self._commit()
         return result > 0
     
     def increment_query_count(self, conversation_id: UUID) -> bool:
@@ -351,7 +351,7 @@ class ConversationRepository(BaseRepository[Conversation]):
         conversation = self.get_by_id(conversation_id)
         if conversation:
             conversation.query_count += 1
-            self.db.commit()
+            self._commit()
             return True
         return False
     
@@ -398,19 +398,8 @@ class CitationRepository(BaseRepository[Citation]):
         )
     
     def create_citations(self, query_id: UUID, citations_data: List[Dict[str, Any]]) -> List[Citation]:
-        """Create multiple citations for a query."""
-        citations = []
-        for data in citations_data:
-            data['query_id'] = query_id
-            citation = Citation(**data)
-            self.db.add(citation)
-            citations.append(citation)
-        
-        self.db.commit()
-        for citation in citations:
-            self.db.refresh(citation)
-        
-        return citations
+        """Create multiple citations for a query in one INSERT ... RETURNING."""
+        return self.bulk_create([{**data, 'query_id': query_id} for data in citations_data])
     
     def mark_clicked(self, citation_id: UUID) -> bool:
         """Mark citation as clicked by user."""
@@ -419,7 +408,7 @@ class CitationRepository(BaseRepository[Citation]):
             .filter(Citation.id == citation_id)
             .update({'clicked': True})
         )
-        self.db.commit()
+        self._commit()
         return result > 0
     
     def rate_citation(self, citation_id: UUID, rating: int) -> bool:
@@ -429,7 +418,7 @@ class CitationRepository(BaseRepository[Citation]):
             .filter(Citation.id == citation_id)
             .update({'helpful_rating': rating})
         )
-        self.db.commit()
+        self._commit()
         return result > 0
     
     def get_document_citation_stats(self, document_id: UUID) -> Dict[str, Any]:
@@ -536,7 +525,7 @@ class SavedSearchRepository(BaseRepository[SavedSearch]):
                 elif search.auto_run_frequency == "monthly":
                     search.next_run = datetime.utcnow() + timedelta(days=30)
             
-            self.db.commit()
+            self._commit()
             return True
         return False
     
@@ -6,38 +6,173 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
 
-from backend.shared.repositories.base_repository import BaseRepository
-from app.models.vector_store import VectorStore, DocumentVector, VectorMetadata, VectorStoreAnalytics
-from app.models.vector_store import VectorStoreType, VectorStoreHealth
+from shared.repositories.base_repository import BaseRepository
+from app.models.vector_store import VectorStore, DocumentVector, VectorMetadata, VectorStoreAnalytics, VectorSearchIndex
+from app.models.vector_store import VectorStoreType, VectorStoreHealth, RetrievalMode, FusionMethod
 from app.core.config import get_settings
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc, asc, func
-from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy.orm import Session, joinedload, load_only
+from sqlalchemy import and_, or_, desc, asc, func, update
+from typing import List, Optional, Dict, Any, Tuple, Union, FrozenSet, Set, Callable, Awaitable
 from uuid import UUID
 from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from enum import Enum
+import asyncio
+import heapq
+import itertools
 import logging
 import json
+import time
+
+from app.core.search_client import get_es_client
+from app.core.retrieval_cache import RetrievalCache, get_retrieval_cache
+from app.core.embedding_engine import EmbeddingEngine, get_embedding_engine
+from app.core.store_registry import StoreRegistry, get_store_registry
 
 try:
-    from elasticsearch import Elasticsearch
+    from elasticsearch import AsyncElasticsearch, helpers
     from elasticsearch.exceptions import NotFoundError, ConflictError
 except ImportError:
-    Elasticsearch = None
+    AsyncElasticsearch = None
+    helpers = None
     NotFoundError = Exception
     ConflictError = Exception
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Only what retrieval consumers display; embeddings and bulky chunk metadata stay in ES
+SEARCH_SOURCE_FIELDS = [
+    "chunk_id",
+    "content",
+    "document_id",
+    "document_version_id",
+    "metadata.page_number",
+    "metadata.section_title"
+]
+
+
+class HydrationMode(str, Enum):
+    """How search hits are turned into result objects."""
+    FULL = "full"    # DocumentVector rows with their metadata
+    LEAN = "lean"    # Display fields from ES, identifiers from a load_only DB query
+    ES = "es"        # Elasticsearch _source only, no database access
+
+
+@dataclass
+class RetrievedChunk:
+    """Lightweight search hit exposing the DocumentVector attributes retrieval needs."""
+    chunk_id: str
+    vector_store_id: str
+    document_id: Optional[UUID]
+    document_version_id: Optional[UUID]
+    content: str
+    page_number: Optional[int] = None
+    section_title: Optional[str] = None
+    id: Optional[UUID] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ScatterReport:
+    """Per-store outcome of a scatter/gather search."""
+    latencies: Dict[str, float] = field(default_factory=dict)  # Seconds
+    timed_out: Set[str] = field(default_factory=set)
+    failed: Set[str] = field(default_factory=set)
+    
+    @property
+    def degraded(self) -> bool:
+        """True when results are partial because some stores did not answer."""
+        return bool(self.timed_out or self.failed)
+    
+    def record(self, store_id: str, latency: float):
+        # Hybrid searches hit each store twice; keep the slower leg
+        self.latencies[store_id] = max(latency, self.latencies.get(store_id, 0.0))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "degraded": self.degraded,
+            "stores_timed_out": sorted(self.timed_out),
+            "stores_failed": sorted(self.failed),
+            "store_latency_ms": {
+                store_id: round(latency * 1000, 1) for store_id, latency in self.latencies.items()
+            }
+        }
+
+
+def reciprocal_rank_fusion(
+    vector_results: List[Dict[str, Any]],
+    lexical_results: List[Dict[str, Any]],
+    vector_weight: float = 0.5,
+    rank_constant: int = 60
+) -> List[Dict[str, Any]]:
+    """
+    Fuse two ranked result lists by weighted reciprocal rank.
+    
+    Only ranks matter, so BM25 and cosine scores need no calibration.
+    Fused scores are scaled so a chunk ranked first by both lists scores 1.0.
+    """
+    weights = (vector_weight, 1.0 - vector_weight)
+    fused: Dict[str, Dict[str, Any]] = {}
+    scores: Dict[str, float] = {}
+    for results, weight in zip((vector_results, lexical_results), weights):
+        for rank, result in enumerate(results, 1):
+            chunk_id = result["chunk_id"]
+            fused.setdefault(chunk_id, result)
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + weight / (rank_constant + rank)
+    
+    best = sum(weights) / (rank_constant + 1)
+    ranked = [{**fused[chunk_id], "similarity_score": score / best} for chunk_id, score in scores.items()]
+    ranked.sort(key=lambda x: x["similarity_score"], reverse=True)
+    return ranked
+
+
+def weighted_score_fusion(
+    vector_results: List[Dict[str, Any]],
+    lexical_results: List[Dict[str, Any]],
+    vector_weight: float = 0.5
+) -> List[Dict[str, Any]]:
+    """
+    Fuse two result lists by a weighted sum of their scores.
+    
+    Cosine similarity is used as is; BM25 scores are divided by the best
+    lexical score of the query so both fall in [0, 1].
+    """
+    max_lexical = max((result["lexical_score"] for result in lexical_results), default=0.0)
+    fused: Dict[str, Dict[str, Any]] = {}
+    scores: Dict[str, float] = {}
+    for result in vector_results:
+        fused[result["chunk_id"]] = result
+        scores[result["chunk_id"]] = vector_weight * max(result["similarity_score"], 0.0)
+    for result in lexical_results:
+        chunk_id = result["chunk_id"]
+        fused.setdefault(chunk_id, result)
+        if max_lexical > 0:
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + (1.0 - vector_weight) * result["lexical_score"] / max_lexical
+    
+    ranked = [{**fused[chunk_id], "similarity_score": score} for chunk_id, score in scores.items()]
+    ranked.sort(key=lambda x: x["similarity_score"], reverse=True)
+    return ranked
+
 
 class ElasticsearchRepository:
-    """Repository for Elasticsearch vector operations with tenant isolation."""
+    """
+    Repository for Elasticsearch vector operations with tenant isolation.
     
-    def __init__(self):
-        if Elasticsearch is None:
-            raise ImportError("Elasticsearch not installed. Run: pip install elasticsearch")
-        
-        self.es = Elasticsearch([settings.elasticsearch_url])
+    All calls go through the application-wide AsyncElasticsearch client, so
+    repositories are cheap to create per request and concurrent queries
+    share pooled connections instead of blocking the event loop.
+    """
+    
+    # Index document counts, shared across requests: (count, fetched_at)
+    _doc_counts: Dict[str, Tuple[int, float]] = {}
+    
+    # Moving average of per-store search latency in seconds, shared across requests
+    _store_latencies: Dict[str, float] = {}
+    _latencies_collected_at: float = time.monotonic()
+    
+    def __init__(self, es: Optional["AsyncElasticsearch"] = None):
+        self.es = es or get_es_client()
         self.index_prefix = settings.elasticsearch_index_prefix
     
     def _get_index_name(self, store_id: str) -> str:
@@ -46,7 +181,7 @@ class ElasticsearchRepository:
         safe_store_id = store_id.replace(":", "_")
         return f"{self.index_prefix}_{safe_store_id}"
     
-    def create_index(self, store_id: str, mapping: Optional[Dict] = None) -> bool:
+    async def create_index(self, store_id: str, mapping: Optional[Dict] = None) -> bool:
         """Create Elasticsearch index for a vector store."""
         index_name = self._get_index_name(store_id)
         
@@ -103,7 +238,7 @@ class ElasticsearchRepository:
         final_mapping = mapping or default_mapping
         
         try:
-            response = self.es.indices.create(
+            response = await self.es.indices.create(
                 index=index_name,
                 body=final_mapping,
                 ignore=400  # Ignore if index already exists
@@ -114,19 +249,19 @@ class ElasticsearchRepository:
             logger.error(f"Failed to create index {index_name}: {e}")
             return False
     
-    def delete_index(self, store_id: str) -> bool:
+    async def delete_index(self, store_id: str) -> bool:
         """Delete Elasticsearch index for a vector store."""
         index_name = self._get_index_name(store_id)
         
         try:
-            self.es.indices.delete(index=index_name, ignore=[404])
+            await self.es.indices.delete(index=index_name, ignore=[404])
             logger.info(f"Deleted Elasticsearch index: {index_name}")
             return True
         except Exception as e:
             logger.error(f"Failed to delete index {index_name}: {e}")
             return False
     
-    def index_document_vector(
+    async def index_document_vector(
         self, 
         store_id: str, 
         chunk_id: str,
@@ -149,7 +284,7 @@ class ElasticsearchRepository:
         }
         
         try:
-            response = self.es.index(
+            response = await self.es.index(
                 index=index_name,
                 id=chunk_id,
                 body=doc
@@ -160,83 +295,445 @@ class ElasticsearchRepository:
             logger.error(f"Failed to index vector {chunk_id}: {e}")
             return False
     
-    def search_vectors(
+    def _bulk_actions(self, index_name: str, vectors: List[Dict[str, Any]]):
+        """Yield _bulk index actions; each vector has chunk_id, content, embedding and metadata."""
+        now = datetime.utcnow().isoformat()
+        for vector in vectors:
+            metadata = vector.get("metadata", {})
+            yield {
+                "_op_type": "index",
+                "_index": index_name,
+                "_id": vector["chunk_id"],
+                "_source": {
+                    "document_id": metadata.get("document_id"),
+                    "document_version_id": metadata.get("document_version_id"),
+                    "chunk_id": vector["chunk_id"],
+                    "content": vector["content"],
+                    "embedding": vector["embedding"],
+                    "metadata": metadata,
+                    "created_at": now,
+                    "updated_at": now
+                }
+            }
+    
+    async def bulk_index_vectors(
+        self,
+        store_id: str,
+        vectors: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        refresh: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Index many document vectors through the _bulk endpoint.
+        
+        Vectors are sent in _bulk requests of `chunk_size`, with up to
+        `concurrency` requests in flight at once. Loads larger than
+        settings.bulk_refresh_disable_threshold run with the index refresh
+        interval disabled and restore it afterwards. Failures are reported
+        per vector instead of aborting the load.
+        """
+        index_name = self._get_index_name(store_id)
+        chunk_size = chunk_size or settings.bulk_chunk_size
+        concurrency = concurrency or settings.bulk_concurrency
+        report = {"indexed": 0, "failed": 0, "errors": [], "elapsed_seconds": 0.0, "chunks_per_second": 0.0}
+        if not vectors:
+            return report
+        
+        restore_refresh = None
+        if len(vectors) > settings.bulk_refresh_disable_threshold:
+            restore_refresh = await self._disable_refresh(index_name)
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def send(chunk: List[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
+            async with semaphore:
+                return await helpers.async_bulk(
+                    self.es,
+                    self._bulk_actions(index_name, chunk),
+                    chunk_size=chunk_size,
+                    max_chunk_bytes=settings.bulk_max_chunk_bytes,
+                    raise_on_error=False,
+                    raise_on_exception=False
+                )
+        
+        started = time.perf_counter()
+        try:
+            chunks = [vectors[i:i + chunk_size] for i in range(0, len(vectors), chunk_size)]
+            for indexed, errors in await asyncio.gather(*(send(chunk) for chunk in chunks)):
+                report["indexed"] += indexed
+                report["failed"] += len(errors)
+                for item in errors:
+                    details = item.get("index", item)
+                    report["errors"].append({"chunk_id": details.get("_id"), "error": details.get("error")})
+        finally:
+            if restore_refresh is not None:
+                await self._restore_refresh(index_name, restore_refresh, refresh)
+            elif refresh:
+                await self.es.indices.refresh(index=index_name, ignore=[404])
+        
+        elapsed = time.perf_counter() - started
+        report["elapsed_seconds"] = round(elapsed, 3)
+        report["chunks_per_second"] = round(report["indexed"] / elapsed, 1) if elapsed > 0 else 0.0
+        
+        if report["failed"]:
+            logger.warning(f"Bulk indexing into {index_name}: {report['failed']} of {len(vectors)} vectors failed")
+        logger.info(
+            f"Bulk indexed {report['indexed']} vectors in {index_name} "
+            f"({report['chunks_per_second']} chunks/sec)"
+        )
+        return report
+    
+    async def _disable_refresh(self, index_name: str) -> Optional[Dict[str, Any]]:
+        """Turn off periodic refresh for a large load; returns the setting to restore."""
+        try:
+            current = await self.es.indices.get_settings(index=index_name, name="index.refresh_interval")
+            previous = current.get(index_name, {}).get("settings", {}).get("index", {}).get("refresh_interval")
+            await self.es.indices.put_settings(index=index_name, body={"index": {"refresh_interval": "-1"}})
+            # A None value resets the index to the cluster default
+            return {"refresh_interval": previous}
+        except Exception as e:
+            logger.warning(f"Could not disable refresh on {index_name}: {e}")
+            return None
+    
+    async def _restore_refresh(self, index_name: str, previous: Dict[str, Any], refresh: bool):
+        """Put back the refresh interval saved by _disable_refresh."""
+        try:
+            await self.es.indices.put_settings(index=index_name, body={"index": previous})
+            if refresh:
+                await self.es.indices.refresh(index=index_name)
+        except Exception as e:
+            logger.error(f"Failed to restore refresh interval on {index_name}: {e}")
+    
+    def _build_filter_clauses(self, filters: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Translate metadata filters into Elasticsearch filter clauses."""
+        filter_clauses = []
+        for key, value in (filters or {}).items():
+            if isinstance(value, list):
+                filter_clauses.append({"terms": {f"metadata.{key}": value}})
+            else:
+                filter_clauses.append({"term": {f"metadata.{key}": value}})
+        return filter_clauses
+    
+    async def _get_doc_counts(self, index_names: List[str]) -> Dict[str, int]:
+        """Document count per index, cached for settings.index_doc_count_ttl seconds."""
+        now = time.monotonic()
+        stale = [
+            name for name in index_names
+            if name not in self._doc_counts or now - self._doc_counts[name][1] > settings.index_doc_count_ttl
+        ]
+        if stale:
+            try:
+                stats = await self.es.indices.stats(index=",".join(stale), metric="docs", ignore=[404])
+                indices = stats.get("indices", {})
+                for name in stale:
+                    count = indices.get(name, {}).get("primaries", {}).get("docs", {}).get("count", 0)
+                    self._doc_counts[name] = (count, now)
+            except Exception as e:
+                logger.warning(f"Failed to get document counts, using kNN for all indexes: {e}")
+        
+        return {name: self._doc_counts[name][0] for name in index_names if name in self._doc_counts}
+    
+    def _num_candidates(self, k: int) -> int:
+        """HNSW candidates per shard: a multiple of k, kept within configured bounds."""
+        candidates = max(k * settings.knn_num_candidates_factor, settings.knn_min_num_candidates)
+        return max(min(candidates, settings.knn_max_num_candidates), k)
+    
+    def _knn_query(
+        self,
+        query_vector: List[float],
+        k: int,
+        num_candidates: int,
+        similarity_threshold: Optional[float],
+        filter_clauses: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Approximate (HNSW) kNN search body; filters are applied during graph traversal."""
+        knn = {
+            "field": "embedding",
+            "query_vector": query_vector,
+            "k": k,
+            "num_candidates": num_candidates
+        }
+        if similarity_threshold is not None:
+            # For cosine fields this is the raw cosine similarity
+            knn["similarity"] = similarity_threshold
+        if filter_clauses:
+            knn["filter"] = filter_clauses
+        
+        return {"size": k, "knn": knn, "_source": SEARCH_SOURCE_FIELDS}
+    
+    def _exact_query(
+        self,
+        query_vector: List[float],
+        limit: int,
+        similarity_threshold: Optional[float],
+        filter_clauses: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Brute-force cosine scoring; only worthwhile for small indexes."""
+        script_score = {
+            "query": {"bool": {"filter": filter_clauses}} if filter_clauses else {"match_all": {}},
+            "script": {
+                # Shifted into the same [0, 1] range as kNN cosine scores
+                "source": "(cosineSimilarity(params.query_vector, 'embedding') + 1.0) / 2.0",
+                "params": {"query_vector": query_vector}
+            }
+        }
+        if similarity_threshold is not None:
+            script_score["min_score"] = (similarity_threshold + 1.0) / 2.0
+        
+        return {"size": limit, "query": {"script_score": script_score}, "_source": SEARCH_SOURCE_FIELDS}
+    
+    def _lexical_query(
+        self,
+        query_text: str,
+        limit: int,
+        filter_clauses: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """BM25 match on chunk content with the same metadata filters as vector search."""
+        return {
+            "size": limit,
+            "query": {
+                "bool": {
+                    "must": [{"match": {"content": query_text}}],
+                    "filter": filter_clauses
+                }
+            },
+            "_source": SEARCH_SOURCE_FIELDS
+        }
+    
+    async def _run_search(
+        self,
+        index_names: List[str],
+        body: Dict[str, Any],
+        index_to_store: Dict[str, str],
+        lexical: bool = False,
+        raise_errors: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Run one search over several indexes and map hits back to their stores."""
+        try:
+            response = await self.es.search(
+                index=",".join(index_names),
+                body=body,
+                ignore_unavailable=True
+            )
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.error(f"Failed to search indexes {index_names}: {e}")
+            return []
+        
+        results = []
+        for hit in response.get("hits", {}).get("hits", []):
+            source = hit["_source"]
+            result = {
+                "chunk_id": hit["_id"],
+                "content": source["content"],
+                "metadata": source.get("metadata", {}),
+                "document_id": source["document_id"],
+                "document_version_id": source["document_version_id"],
+                "store_id": index_to_store.get(hit["_index"])
+            }
+            if lexical:
+                result["lexical_score"] = hit["_score"]
+            else:
+                # Cosine scores come back as (1 + cosine) / 2
+                result["similarity_score"] = 2.0 * hit["_score"] - 1.0
+            results.append(result)
+        return results
+    
+    async def search_vectors(
         self,
         store_ids: List[str],
         query_vector: List[float],
         limit: int = 10,
         similarity_threshold: float = 0.7,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        num_candidates: Optional[int] = None,
+        exact: Optional[bool] = None,
+        raise_errors: bool = False
     ) -> List[Dict[str, Any]]:
-        """Search for similar vectors across multiple stores."""
+        """
+        Search for similar vectors across multiple stores.
+        
+        Uses approximate HNSW kNN with metadata filters as pre-filters, so
+        latency stays flat as stores grow. Indexes with at most
+        settings.exact_search_max_docs documents are scored exactly instead,
+        where brute force is cheap and recall is perfect. `exact` forces
+        either path for every index; `num_candidates` overrides the
+        per-shard candidate count (higher means better recall, more latency).
+        Search errors are logged and yield no hits unless `raise_errors` is set.
+        """
         if not store_ids:
             return []
+        if hasattr(query_vector, "tolist"):
+            # NumPy embeddings are sent as plain JSON floats
+            query_vector = query_vector.tolist()
         
-        index_names = [self._get_index_name(store_id) for store_id in store_ids]
+        index_to_store = {self._get_index_name(store_id): store_id for store_id in store_ids}
+        index_names = list(index_to_store)
+        filter_clauses = self._build_filter_clauses(filters)
         
-        # Build the query
-        query = {
-            "size": limit,
-            "query": {
-                "script_score": {
-                    "query": {"match_all": {}},
-                    "script": {
-                        "source": "cosineSimilarity(params.query_vector, 'embedding') + 1.0",
-                        "params": {"query_vector": query_vector}
-                    },
-                    "min_score": similarity_threshold + 1.0  # Adjust for script_score offset
-                }
-            },
-            "sort": [
-                {"_score": {"order": "desc"}}
+        if exact is None:
+            doc_counts = await self._get_doc_counts(index_names)
+            exact_indexes = [
+                name for name in index_names
+                if name in doc_counts and doc_counts[name] <= settings.exact_search_max_docs
             ]
-        }
+        else:
+            exact_indexes = index_names if exact else []
+        knn_indexes = [name for name in index_names if name not in exact_indexes]
         
-        # Add filters if provided
-        if filters:
-            filter_clauses = []
-            for field, value in filters.items():
-                if isinstance(value, list):
-                    filter_clauses.append({"terms": {f"metadata.{field}": value}})
-                else:
-                    filter_clauses.append({"term": {f"metadata.{field}": value}})
-            
-            if filter_clauses:
-                query["query"]["script_score"]["query"] = {
-                    "bool": {"filter": filter_clauses}
-                }
+        searches = []
+        if knn_indexes:
+            body = self._knn_query(
+                query_vector,
+                k=limit,
+                num_candidates=num_candidates or self._num_candidates(limit),
+                similarity_threshold=similarity_threshold,
+                filter_clauses=filter_clauses
+            )
+            searches.append(self._run_search(knn_indexes, body, index_to_store, raise_errors=raise_errors))
+        if exact_indexes:
+            body = self._exact_query(query_vector, limit, similarity_threshold, filter_clauses)
+            searches.append(self._run_search(exact_indexes, body, index_to_store, raise_errors=raise_errors))
         
-        results = []
-        
-        for index_name in index_names:
-            try:
-                response = self.es.search(
-                    index=index_name,
-                    body=query,
-                    ignore=[404]
-                )
-                
-                for hit in response.get("hits", {}).get("hits", []):
-                    result = {
-                        "chunk_id": hit["_id"],
-                        "content": hit["_source"]["content"],
-                        "similarity_score": hit["_score"] - 1.0,  # Remove script_score offset
-                        "metadata": hit["_source"]["metadata"],
-                        "document_id": hit["_source"]["document_id"],
-                        "document_version_id": hit["_source"]["document_version_id"],
-                        "store_id": next(sid for sid in store_ids if self._get_index_name(sid) == index_name)
-                    }
-                    results.append(result)
-                    
-            except Exception as e:
-                logger.error(f"Failed to search index {index_name}: {e}")
-                continue
+        results = [result for hits in await asyncio.gather(*searches) for result in hits]
         
         # Sort all results by similarity score and limit
         results.sort(key=lambda x: x["similarity_score"], reverse=True)
         return results[:limit]
     
-    def delete_document_vectors(self, store_id: str, document_id: UUID) -> bool:
+    async def search_lexical(
+        self,
+        store_ids: List[str],
+        query_text: str,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        raise_errors: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Full-text (BM25) search over chunk content across multiple stores."""
+        if not store_ids or not query_text:
+            return []
+        
+        index_to_store = {self._get_index_name(store_id): store_id for store_id in store_ids}
+        body = self._lexical_query(query_text, limit, self._build_filter_clauses(filters))
+        return await self._run_search(
+            list(index_to_store), body, index_to_store, lexical=True, raise_errors=raise_errors
+        )
+    
+    async def scatter_search(
+        self,
+        store_ids: List[str],
+        search_store: Callable[[str], Awaitable[List[Dict[str, Any]]]],
+        limit: int,
+        score_key: str = "similarity_score",
+        timeout: Optional[float] = None,
+        report: Optional[ScatterReport] = None
+    ) -> Tuple[List[Dict[str, Any]], ScatterReport]:
+        """
+        Search every store's index concurrently and merge the top `limit` hits.
+        
+        `search_store(store_id)` must return that store's hits sorted by
+        `score_key` and raise on failure. Stores that miss the deadline
+        (`timeout` seconds, default settings.store_search_timeout_ms) or
+        fail contribute no hits and are listed in the report, so one slow
+        index degrades the results instead of stalling the whole query.
+        """
+        if timeout is None:
+            timeout = settings.store_search_timeout_ms / 1000
+        if report is None:
+            report = ScatterReport()
+        
+        async def gather_store(store_id: str) -> List[Dict[str, Any]]:
+            started = time.perf_counter()
+            try:
+                return await asyncio.wait_for(search_store(store_id), timeout)
+            except asyncio.TimeoutError:
+                report.timed_out.add(store_id)
+                logger.warning(f"Search of store {store_id} missed its {timeout:.3f}s deadline")
+                return []
+            except Exception as e:
+                report.failed.add(store_id)
+                logger.error(f"Search of store {store_id} failed: {e}")
+                return []
+            finally:
+                latency = time.perf_counter() - started
+                report.record(store_id, latency)
+                self._record_store_latency(store_id, latency)
+        
+        per_store = await asyncio.gather(*(gather_store(store_id) for store_id in store_ids))
+        
+        # Each store's hits are already ranked, so a k-way heap merge yields the global top k
+        merged = heapq.merge(*per_store, key=lambda result: result[score_key], reverse=True)
+        return list(itertools.islice(merged, limit)), report
+    
+    def _record_store_latency(self, store_id: str, latency: float):
+        alpha = settings.store_latency_ewma_alpha
+        average = self._store_latencies.get(store_id)
+        self._store_latencies[store_id] = latency if average is None else (1 - alpha) * average + alpha * latency
+    
+    @classmethod
+    def collect_store_latencies(cls, min_interval: float) -> Dict[str, float]:
+        """Moving-average search latency per store, at most once every `min_interval` seconds."""
+        now = time.monotonic()
+        if now - cls._latencies_collected_at < min_interval:
+            return {}
+        cls._latencies_collected_at = now
+        return dict(cls._store_latencies)
+    
+    async def benchmark_search(
+        self,
+        store_ids: List[str],
+        query_vectors: List[List[float]],
+        limit: int = 10,
+        num_candidates: Optional[List[int]] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Compare approximate kNN against exact scoring on real queries.
+        
+        Exact results are the ground truth; for each num_candidates setting
+        reports recall@limit and latency percentiles, to tune
+        knn_num_candidates_factor per deployment.
+        """
+        def percentile(values: List[float], pct: float) -> float:
+            ordered = sorted(values)
+            return round(ordered[min(int(len(ordered) * pct), len(ordered) - 1)], 2) if ordered else 0.0
+        
+        async def timed_search(**kwargs) -> Tuple[List[Dict[str, Any]], float]:
+            started = time.perf_counter()
+            hits = await self.search_vectors(store_ids, limit=limit, similarity_threshold=None, filters=filters, **kwargs)
+            return hits, (time.perf_counter() - started) * 1000
+        
+        exact_ids, exact_latency = [], []
+        for query_vector in query_vectors:
+            hits, elapsed_ms = await timed_search(query_vector=query_vector, exact=True)
+            exact_ids.append({hit["chunk_id"] for hit in hits})
+            exact_latency.append(elapsed_ms)
+        
+        report = {
+            "queries": len(query_vectors),
+            "limit": limit,
+            "exact": {"p50_ms": percentile(exact_latency, 0.5), "p95_ms": percentile(exact_latency, 0.95)},
+            "knn": []
+        }
+        for candidates in num_candidates or [self._num_candidates(limit)]:
+            recalls, latency = [], []
+            for query_vector, expected in zip(query_vectors, exact_ids):
+                hits, elapsed_ms = await timed_search(query_vector=query_vector, exact=False, num_candidates=candidates)
+                latency.append(elapsed_ms)
+                if expected:
+                    recalls.append(len(expected & {hit["chunk_id"] for hit in hits}) / len(expected))
+            report["knn"].append({
+                "num_candidates": candidates,
+                "recall": round(sum(recalls) / len(recalls), 4) if recalls else 1.0,
+                "p50_ms": percentile(latency, 0.5),
+                "p95_ms": percentile(latency, 0.95)
+            })
+        
+        return report
+    
+    async def delete_document_vectors(self, store_id: str, document_id: UUID) -> bool:
         """Delete all vectors for a document from the store."""
         index_name = self._get_index_name(store_id)
         
@@ -247,7 +744,7 @@ class ElasticsearchRepository:
         }
         
         try:
-            response = self.es.delete_by_query(
+            response = await self.es.delete_by_query(
                 index=index_name,
                 body=query,
                 ignore=[404]
@@ -259,12 +756,12 @@ class ElasticsearchRepository:
             logger.error(f"Failed to delete vectors for document {document_id}: {e}")
             return False
     
-    def get_index_stats(self, store_id: str) -> Dict[str, Any]:
+    async def get_index_stats(self, store_id: str) -> Dict[str, Any]:
         """Get statistics for an Elasticsearch index."""
         index_name = self._get_index_name(store_id)
         
         try:
-            stats = self.es.indices.stats(index=index_name, ignore=[404])
+            stats = await self.es.indices.stats(index=index_name, ignore=[404])
             if index_name in stats.get("indices", {}):
                 index_stats = stats["indices"][index_name]
                 return {
@@ -278,13 +775,13 @@ class ElasticsearchRepository:
             logger.error(f"Failed to get stats for index {index_name}: {e}")
             return {"document_count": 0, "size_in_bytes": 0, "health": "error"}
     
-    def health_check(self, store_id: str) -> Dict[str, Any]:
+    async def health_check(self, store_id: str) -> Dict[str, Any]:
         """Check health of an Elasticsearch index."""
         index_name = self._get_index_name(store_id)
         
         try:
-            health = self.es.cluster.health(index=index_name, wait_for_status="yellow", timeout="30s")
-            exists = self.es.indices.exists(index=index_name)
+            health = await self.es.cluster.health(index=index_name, wait_for_status="yellow", timeout="30s")
+            exists = await self.es.indices.exists(index=index_name)
             
             return {
                 "exists": exists,
@@ -308,11 +805,18 @@ class ElasticsearchRepository:
 class VectorStoreRepository(BaseRepository[VectorStore]):
     """Repository for vector store metadata management."""
     
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        retrieval_cache: Optional[RetrievalCache] = None,
+        store_registry: Optional[StoreRegistry] = None
+    ):
         super().__init__(db, VectorStore)
         self.es_repo = ElasticsearchRepository()
+        self.retrieval_cache = retrieval_cache or get_retrieval_cache()
+        self.store_registry = store_registry or get_store_registry()
     
-    def create_store(
+    async def create_store(
         self, 
         store_type: VectorStoreType, 
         namespace: str, 
@@ -332,7 +836,7 @@ class VectorStoreRepository(BaseRepository[VectorStore]):
             raise ValueError(f"Invalid store type: {store_type}")
         
         # Create Elasticsearch index
-        index_created = self.es_repo.create_index(store_id)
+        index_created = await self.es_repo.create_index(store_id)
         if not index_created:
             raise RuntimeError(f"Failed to create Elasticsearch index for store {store_id}")
         
@@ -353,12 +857,71 @@ class VectorStoreRepository(BaseRepository[VectorStore]):
         
         store = VectorStore(**store_data)
         self.db.add(store)
-        self.db.commit()
+        self._commit()
         self.db.refresh(store)
+        self.store_registry.invalidate(tenant_id)
         
         logger.info(f"Created vector store: {store_id}")
         return store
     
+    def update(self, obj_id: str, obj_data: Dict[str, Any]) -> Optional[VectorStore]:
+        """Update a store; may change is_active, so the tenant's routing entry is refreshed."""
+        store = super().update(obj_id, obj_data)
+        if store:
+            self.store_registry.invalidate(store.tenant_id)
+        return store
+    
+    def delete(self, obj_id: str) -> bool:
+        """Delete a store record (tenant unknown after the fact, so the whole registry is refreshed)."""
+        deleted = super().delete(obj_id)
+        if deleted:
+            self.store_registry.invalidate()
+        return deleted
+    
+    def get_active_store_ids(self, tenant_id: UUID) -> FrozenSet[str]:
+        """IDs of a tenant's active stores, from the store registry when cached."""
+        store_ids = self.store_registry.get(tenant_id)
+        if store_ids is None:
+            rows = (
+                self.db.query(VectorStore.id)
+                .filter(
+                    and_(
+                        VectorStore.tenant_id == tenant_id,
+                        VectorStore.is_active == True
+                    )
+                )
+                .all()
+            )
+            store_ids = self.store_registry.put(tenant_id, (store_id for (store_id,) in rows))
+        return store_ids
+    
+    def filter_active_store_ids(self, store_ids: List[str], tenant_id: UUID) -> List[str]:
+        """
+        Keep the candidate stores that exist, belong to the tenant and are active.
+        
+        Uses the registry when enabled, otherwise one IN query for all candidates.
+        """
+        if not store_ids:
+            return []
+        
+        if self.store_registry.enabled:
+            active = self.get_active_store_ids(tenant_id)
+        else:
+            rows = (
+                self.db.query(VectorStore.id)
+                .filter(
+                    and_(
+                        VectorStore.id.in_(store_ids),
+                        VectorStore.tenant_id == tenant_id,
+                        VectorStore.is_active == True
+                    )
+                )
+                .all()
+            )
+            active = {store_id for (store_id,) in rows}
+        
+        return [store_id for store_id in store_ids if store_id in active]
+    
     def get_by_tenant_id(self, tenant_id: UUID) -> List[VectorStore]:
         """Get all vector stores for a tenant."""
         return (
@@ -417,44 +980,50 @@ class VectorStoreRepository(BaseRepository[VectorStore]):
             .all()
         )
     
-    def update_stats(self, store_id: str) -> bool:
+    async def update_stats(self, store_id: str) -> bool:
         """Update vector store statistics from Elasticsearch."""
         store = self.get_by_id(store_id)
         if not store:
             return False
         
         # Get stats from Elasticsearch
-        es_stats = self.es_repo.get_index_stats(store_id)
+        es_stats = await self.es_repo.get_index_stats(store_id)
         
         # Update database record
         store.vector_count = es_stats.get('document_count', 0)
         store.last_health_check = datetime.utcnow()
+        previous_health = store.health
         
         if es_stats.get('health') == 'healthy':
             store.health = VectorStoreHealth.HEALTHY
         else:
             store.health = VectorStoreHealth.DEGRADED
         
-        self.db.commit()
+        self._commit()
+        if store.health != previous_health:
+            self.store_registry.invalidate(store.tenant_id)
         return True
     
-    def perform_health_check(self, store_id: str) -> Dict[str, Any]:
+    async def perform_health_check(self, store_id: str) -> Dict[str, Any]:
         """Perform comprehensive health check on a vector store."""
         store = self.get_by_id(store_id)
         if not store:
             return {"healthy": False, "error": "Store not found"}
         
         # Check Elasticsearch index health
-        es_health = self.es_repo.health_check(store_id)
+        es_health = await self.es_repo.health_check(store_id)
         
         # Update store health status
+        previous_health = store.health
         if es_health.get('healthy', False):
             store.health = VectorStoreHealth.HEALTHY
         else:
             store.health = VectorStoreHealth.UNHEALTHY
         
         store.last_health_check = datetime.utcnow()
-        self.db.commit()
+        self._commit()
+        if store.health != previous_health:
+            self.store_registry.invalidate(store.tenant_id)
         
         # Get document vector count from database
         vector_count = (
@@ -472,18 +1041,21 @@ class VectorStoreRepository(BaseRepository[VectorStore]):
             "last_check": store.last_health_check
         }
     
-    def delete_store(self, store_id: str) -> bool:
+    async def delete_store(self, store_id: str) -> bool:
         """Delete a vector store and its Elasticsearch index."""
         store = self.get_by_id(store_id)
         if not store:
             return False
         
         # Delete Elasticsearch index
-        es_deleted = self.es_repo.delete_index(store_id)
+        es_deleted = await self.es_repo.delete_index(store_id)
+        await self.retrieval_cache.invalidate_store(store_id)
         
         # Delete database records
+        tenant_id = store.tenant_id
         self.db.delete(store)
-        self.db.commit()
+        self._commit()
+        self.store_registry.invalidate(tenant_id)
         
         logger.info(f"Deleted vector store: {store_id} (ES: {es_deleted})")
         return True
@@ -492,22 +1064,44 @@ class VectorStoreRepository(BaseRepository[VectorStore]):
 class DocumentVectorRepository(BaseRepository[DocumentVector]):
     """Repository for document vector management."""
     
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        retrieval_cache: Optional[RetrievalCache] = None,
+        embedding_engine: Optional[EmbeddingEngine] = None
+    ):
         super().__init__(db, DocumentVector)
         self.es_repo = ElasticsearchRepository()
+        self.retrieval_cache = retrieval_cache or get_retrieval_cache()
+        self.embedding_engine = embedding_engine or get_embedding_engine()
+        # Per-store outcome of the last scatter/gather search_similar call
+        self.last_search_report: Optional[ScatterReport] = None
     
-    def create_vectors(
+    async def create_vectors(
         self,
         store_id: str,
         document_id: UUID,
         document_version_id: UUID,
         chunks: List[Dict[str, Any]]
     ) -> List[DocumentVector]:
-        """Create document vectors and index them in Elasticsearch."""
-        vectors = []
+        """
+        Create document vectors and index them in Elasticsearch.
+        
+        Chunks without an 'embedding' are embedded here, in micro-batches on
+        the embedding engine's worker processes.
+        """
+        missing = [i for i, chunk_data in enumerate(chunks) if chunk_data.get('embedding') is None]
+        if missing:
+            embeddings = await self.embedding_engine.embed([chunks[i]['content'] for i in missing])
+            chunks = list(chunks)
+            for i, embedding in zip(missing, embeddings):
+                chunks[i] = {**chunks[i], 'embedding': embedding.tolist()}
+        
+        vectors_data = []
+        es_vectors = []
         
         for i, chunk_data in enumerate(chunks):
-            # Create database record
+            # Database record
             vector_data = {
                 'vector_store_id': store_id,
                 'document_id': document_id,
@@ -522,11 +1116,9 @@ class DocumentVectorRepository(BaseRepository[DocumentVector]):
                 'section_title': chunk_data.get('section_title')
             }
             
-            vector = DocumentVector(**vector_data)
-            self.db.add(vector)
-            vectors.append(vector)
+            vectors_data.append(vector_data)
             
-            # Index in Elasticsearch
+            # Elasticsearch document
             metadata = {
                 'document_id': str(document_id),
                 'document_version_id': str(document_version_id),
@@ -535,17 +1127,21 @@ class DocumentVectorRepository(BaseRepository[DocumentVector]):
                 **chunk_data.get('metadata', {})
             }
             
-            self.es_repo.index_document_vector(
-                store_id=store_id,
-                chunk_id=vector.chunk_id,
-                content=chunk_data['content'],
-                embedding=chunk_data['embedding'],
-                metadata=metadata
-            )
+            es_vectors.append({
+                'chunk_id': vector_data['chunk_id'],
+                'content': chunk_data['content'],
+                'embedding': chunk_data['embedding'],
+                'metadata': metadata
+            })
         
-        self.db.commit()
-        for vector in vectors:
-            self.db.refresh(vector)
+        vectors = self.bulk_create(vectors_data)
+        report = await self.es_repo.bulk_index_vectors(store_id, es_vectors)
+        await self.retrieval_cache.invalidate_store(store_id)
+        if report['failed']:
+            logger.error(
+                f"Failed to index {report['failed']} of {len(es_vectors)} vectors for document {document_id}: "
+                f"{report['errors'][:5]}"
+            )
         
         logger.info(f"Created {len(vectors)} vectors for document {document_id}")
         return vectors
@@ -571,7 +1167,7 @@ class DocumentVectorRepository(BaseRepository[DocumentVector]):
             .all()
         )
     
-    def delete_document_vectors(self, document_id: UUID) -> bool:
+    async def delete_document_vectors(self, document_id: UUID) -> bool:
         """Delete all vectors for a document from database and Elasticsearch."""
         # Get all vectors for the document
         vectors = self.get_by_document_id(document_id)
@@ -583,7 +1179,8 @@ class DocumentVectorRepository(BaseRepository[DocumentVector]):
         
         # Delete from Elasticsearch
         for store_id in stores_to_clean:
-            self.es_repo.delete_document_vectors(store_id, document_id)
+            await self.es_repo.delete_document_vectors(store_id, document_id)
+            await self.retrieval_cache.invalidate_store(store_id)
         
         # Delete from database
         deleted_count = (
@@ -592,31 +1189,336 @@ class DocumentVectorRepository(BaseRepository[DocumentVector]):
             .delete()
         )
         
-        self.db.commit()
+        self._commit()
         logger.info(f"Deleted {deleted_count} vectors for document {document_id}")
         return deleted_count > 0
     
-    def search_similar(
+    def _get_store_configs(self, store_ids: List[str]) -> List[Any]:
+        """Retrieval and cache settings of the queried stores, in one query."""
+        return (
+            self.db.query(
+                VectorStore.id,
+                VectorStore.retrieval_mode,
+                VectorStore.cache_enabled,
+                VectorStore.cache_ttl
+            )
+            .filter(VectorStore.id.in_(store_ids))
+            .all()
+        )
+    
+    def _write_telemetry(self, statement: Any, params: Optional[List[Dict[str, Any]]] = None):
+        """
+        Run a telemetry write in its own short transaction on the primary.
+        
+        The stats are drained from their collectors before the write, and
+        search requests often never commit the request session, so these
+        writes cannot wait for the request's commit. Failures are logged;
+        telemetry never fails a search.
+        """
+        try:
+            with Session(bind=self.db.get_bind()) as session, session.begin():
+                session.execute(statement, params)
+        except Exception as e:
+            logger.warning(f"Failed to write search telemetry: {e}")
+    
+    async def _write_cache_hit_rates(self):
+        """
+        Periodically copy per-store cache hit rates to VectorSearchIndex.
+        
+        The rates are fleet-wide (aggregated in Redis), and rows are upserted
+        on the unique vector_store_id (database/vector_search_indexes_unique_store.sql
+        adds it to existing databases), so concurrent replicas neither insert
+        duplicates nor overwrite each other with local rates.
+        """
+        hit_rates = await self.retrieval_cache.collect_hit_rates(settings.retrieval_cache_stats_interval)
+        if not hit_rates:
+            return
+        
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            logger.debug(f"Skipping cache hit rate write: upsert not supported for {dialect}")
+            return
+        
+        stmt = dialect_insert(VectorSearchIndex).values([
+            {
+                "vector_store_id": store_id,
+                "index_name": self.es_repo._get_index_name(store_id),
+                "cache_hit_rate": hit_rate
+            }
+            for store_id, hit_rate in sorted(hit_rates.items())
+        ])
+        self._write_telemetry(stmt.on_conflict_do_update(
+            index_elements=[VectorSearchIndex.vector_store_id],
+            set_={"cache_hit_rate": stmt.excluded.cache_hit_rate, "updated_at": func.now()}
+        ))
+    
+    def _write_store_latencies(self):
+        """
+        Periodically copy moving-average search latencies to VectorStore.avg_query_time.
+        
+        Written in a short transaction of its own, like the cache hit rates;
+        writing on every query would hold row locks on hot stores.
+        """
+        latencies = self.es_repo.collect_store_latencies(settings.store_latency_stats_interval)
+        if not latencies:
+            return
+        
+        # Bulk UPDATE by primary key, one executemany for all stores
+        self._write_telemetry(update(VectorStore), [
+            {"id": store_id, "avg_query_time": latency}
+            for store_id, latency in sorted(latencies.items())
+        ])
+    
+    async def _vector_search(
+        self,
+        store_ids: List[str],
+        query_vector: List[float],
+        limit: int,
+        similarity_threshold: float,
+        filters: Optional[Dict[str, Any]],
+        report: Optional[ScatterReport] = None
+    ) -> List[Dict[str, Any]]:
+        """kNN search as one multi-index query, or scattered per store when a report is given."""
+        if report is None:
+            return await self.es_repo.search_vectors(
+                store_ids=store_ids,
+                query_vector=query_vector,
+                limit=limit,
+                similarity_threshold=similarity_threshold,
+                filters=filters
+            )
+        
+        results, _ = await self.es_repo.scatter_search(
+            store_ids,
+            lambda store_id: self.es_repo.search_vectors(
+                store_ids=[store_id],
+                query_vector=query_vector,
+                limit=limit,
+                similarity_threshold=similarity_threshold,
+                filters=filters,
+                raise_errors=True
+            ),
+            limit,
+            report=report
+        )
+        return results
+    
+    async def _lexical_search(
+        self,
+        store_ids: List[str],
+        query_text: str,
+        limit: int,
+        filters: Optional[Dict[str, Any]],
+        report: Optional[ScatterReport] = None
+    ) -> List[Dict[str, Any]]:
+        """BM25 search as one multi-index query, or scattered per store when a report is given."""
+        if report is None:
+            return await self.es_repo.search_lexical(store_ids, query_text, limit=limit, filters=filters)
+        
+        results, _ = await self.es_repo.scatter_search(
+            store_ids,
+            lambda store_id: self.es_repo.search_lexical(
+                [store_id], query_text, limit=limit, filters=filters, raise_errors=True
+            ),
+            limit,
+            score_key="lexical_score",
+            report=report
+        )
+        return results
+    
+    async def _hybrid_search(
+        self,
+        store_ids: List[str],
+        query_vector: List[float],
+        query_text: str,
+        limit: int,
+        similarity_threshold: float,
+        filters: Optional[Dict[str, Any]],
+        fusion: FusionMethod,
+        report: Optional[ScatterReport] = None
+    ) -> List[Dict[str, Any]]:
+        """Run kNN and BM25 retrieval concurrently and fuse their rankings."""
+        window = max(limit, settings.hybrid_rank_window)
+        vector_results, lexical_results = await asyncio.gather(
+            self._vector_search(store_ids, query_vector, window, similarity_threshold, filters, report),
+            self._lexical_search(store_ids, query_text, window, filters, report)
+        )
+        
+        if fusion == FusionMethod.WEIGHTED:
+            fused = weighted_score_fusion(vector_results, lexical_results, settings.hybrid_vector_weight)
+        else:
+            fused = reciprocal_rank_fusion(
+                vector_results, lexical_results, settings.hybrid_vector_weight, settings.rrf_rank_constant
+            )
+        return fused[:limit]
+    
+    async def search_similar(
         self,
         store_ids: List[str],
         query_vector: List[float],
         limit: int = 10,
         similarity_threshold: float = 0.7,
-        filters: Optional[Dict[str, Any]] = None
-    ) -> List[Tuple[DocumentVector, float]]:
-        """Search for similar vectors and return with database objects."""
-        # Search in Elasticsearch
-        es_results = self.es_repo.search_vectors(
-            store_ids=store_ids,
-            query_vector=query_vector,
-            limit=limit,
-            similarity_threshold=similarity_threshold,
-            filters=filters
+        filters: Optional[Dict[str, Any]] = None,
+        query_text: Optional[str] = None,
+        retrieval_mode: Optional[RetrievalMode] = None,
+        fusion: Optional[FusionMethod] = None,
+        hydration: Optional[HydrationMode] = None,
+        scatter: Optional[bool] = None
+    ) -> List[Tuple[Union[DocumentVector, RetrievedChunk], float]]:
+        """
+        Search for similar vectors and return with database objects.
+        
+        In hybrid mode (per query via `retrieval_mode`, otherwise from the
+        stores' configuration) BM25 matches on `query_text` are fused with
+        the kNN results, and scores are fused relevance in [0, 1] rather
+        than cosine similarity.
+        
+        `hydration` (default settings.search_hydration) selects the result
+        objects: RetrievedChunk hits built from ES _source with a
+        load_only identifier query (lean) or no DB access at all (es), or
+        full DocumentVector rows with metadata.
+        
+        With `scatter` (default settings.scatter_gather_enabled) stores are
+        searched concurrently, each under its own deadline, and the merged
+        results may be partial; self.last_search_report records which
+        stores missed the deadline and per-store latencies.
+        """
+        self.last_search_report = None
+        if not store_ids:
+            return []
+        
+        store_configs = self._get_store_configs(store_ids)
+        if query_text and retrieval_mode is None:
+            # Hybrid when any of the queried stores is configured for it
+            hybrid = any(config.retrieval_mode == RetrievalMode.HYBRID for config in store_configs)
+            retrieval_mode = RetrievalMode.HYBRID if hybrid else RetrievalMode.VECTOR
+        hybrid = bool(query_text) and retrieval_mode == RetrievalMode.HYBRID
+        fusion = fusion or settings.hybrid_fusion
+        
+        # Cached results are used only when every queried store allows it
+        use_cache = (
+            settings.retrieval_cache_enabled
+            and len(store_configs) == len(set(store_ids))
+            and all(config.cache_enabled for config in store_configs)
         )
+        es_results = None
+        if use_cache:
+            cache_key, es_results = await self.retrieval_cache.get(
+                store_ids,
+                query_vector,
+                {
+                    "limit": limit,
+                    "similarity_threshold": similarity_threshold,
+                    "filters": filters,
+                    "mode": "hybrid" if hybrid else "vector",
+                    "fusion": FusionMethod(fusion).value if hybrid else None,
+                    "query_text": query_text if hybrid else None
+                }
+            )
+        
+        # Search in Elasticsearch
+        if es_results is None:
+            if scatter is None:
+                scatter = settings.scatter_gather_enabled
+            report = ScatterReport() if scatter and len(store_ids) > 1 else None
+            
+            if hybrid:
+                es_results = await self._hybrid_search(
+                    store_ids,
+                    query_vector,
+                    query_text,
+                    limit,
+                    similarity_threshold,
+                    filters,
+                    fusion,
+                    report
+                )
+            else:
+                es_results = await self._vector_search(
+                    store_ids,
+                    query_vector,
+                    limit,
+                    similarity_threshold,
+                    filters,
+                    report
+                )
+            
+            if report is not None:
+                self.last_search_report = report
+                self._write_store_latencies()
+            
+            # Partial results must not outlive the slow store that caused them
+            if use_cache and not (report and report.degraded):
+                ttl = min(config.cache_ttl or settings.cache_ttl for config in store_configs)
+                await self.retrieval_cache.set(cache_key, es_results, ttl)
+        
+        if use_cache:
+            await self._write_cache_hit_rates()
         
         if not es_results:
             return []
         
+        hydration = hydration or settings.search_hydration
+        if hydration == HydrationMode.FULL:
+            return self._hydrate_full(es_results)
+        if hydration == HydrationMode.ES:
+            return [(self._chunk_from_hit(es_result), es_result['similarity_score']) for es_result in es_results]
+        return self._hydrate_lean(es_results)
+    
+    @staticmethod
+    def _chunk_from_hit(es_result: Dict[str, Any], row: Optional[Any] = None) -> RetrievedChunk:
+        metadata = es_result.get('metadata') or {}
+        document_id = es_result.get('document_id')
+        document_version_id = es_result.get('document_version_id')
+        return RetrievedChunk(
+            chunk_id=es_result['chunk_id'],
+            vector_store_id=row.vector_store_id if row else es_result['store_id'],
+            document_id=row.document_id if row else (UUID(document_id) if document_id else None),
+            document_version_id=(
+                row.document_version_id if row
+                else (UUID(document_version_id) if document_version_id else None)
+            ),
+            content=es_result['content'],
+            page_number=metadata.get('page_number'),
+            section_title=metadata.get('section_title'),
+            id=row.id if row else None,
+            metadata=metadata
+        )
+    
+    def _hydrate_lean(self, es_results: List[Dict[str, Any]]) -> List[Tuple[RetrievedChunk, float]]:
+        """
+        Build hits from ES _source, loading only identifier columns from the DB.
+        
+        The DB query still drops hits whose rows were deleted but not yet
+        removed from the index.
+        """
+        chunk_ids = [result['chunk_id'] for result in es_results]
+        rows = (
+            self.db.query(DocumentVector)
+            .options(load_only(
+                DocumentVector.id,
+                DocumentVector.chunk_id,
+                DocumentVector.vector_store_id,
+                DocumentVector.document_id,
+                DocumentVector.document_version_id
+            ))
+            .filter(DocumentVector.chunk_id.in_(chunk_ids))
+            .all()
+        )
+        row_map = {row.chunk_id: row for row in rows}
+        
+        return [
+            (self._chunk_from_hit(es_result, row_map[es_result['chunk_id']]), es_result['similarity_score'])
+            for es_result in es_results
+            if es_result['chunk_id'] in row_map
+        ]
+    
+    def _hydrate_full(self, es_results: List[Dict[str, Any]]) -> List[Tuple[DocumentVector, float]]:
+        """Load complete DocumentVector rows (and their metadata) for the hits."""
         # Get chunk IDs
         chunk_ids = [result['chunk_id'] for result in es_results]
         
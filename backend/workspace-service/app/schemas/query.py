@@ -9,6 +9,7 @@ from uuid import UUID
 from enum import Enum
 
 from app.models.query import QueryScope, QueryStatus
+from app.models.vector_store import RetrievalMode
 
 
 class QueryCreate(BaseModel):
@@ -18,6 +19,7 @@ class QueryCreate(BaseModel):
     scope_ids: Optional[List[UUID]] = Field(default_factory=list, description="Project IDs for project scope")
     conversation_id: Optional[UUID] = Field(None, description="Conversation context")
     language: str = Field("en", description="Query language")
+    retrieval_mode: Optional[RetrievalMode] = Field(None, description="Override the stores' retrieval mode")
     
     @validator('scope_ids')
     def validate_scope_ids(cls, v, values):
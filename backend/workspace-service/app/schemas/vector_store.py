@@ -7,7 +7,7 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
 
-from app.models.vector_store import VectorStoreType, VectorStoreHealth
+from app.models.vector_store import VectorStoreType, VectorStoreHealth, RetrievalMode
 
 
 class VectorStoreResponse(BaseModel):
@@ -34,6 +34,7 @@ class VectorStoreResponse(BaseModel):
     chunk_size: int
     chunk_overlap: int
     similarity_threshold: float
+    retrieval_mode: str
     
     # Index info
     elasticsearch_index: str
@@ -145,6 +146,7 @@ class VectorSearchRequest(BaseModel):
     store_ids: Optional[List[str]] = Field(None, description="Specific stores to search")
     limit: int = Field(10, ge=1, le=100)
     similarity_threshold: Optional[float] = Field(None, ge=0.0, le=1.0)
+    retrieval_mode: Optional[RetrievalMode] = Field(None, description="Override the stores' retrieval mode")
     include_metadata: bool = Field(True, description="Include vector metadata")
     filters: Optional[Dict[str, Any]] = Field(None, description="Additional filters")
 
@@ -9,6 +9,8 @@ import logging
 import asyncio
 import time
 
+import numpy as np
+
 from app.repositories.query_repository import (
     QueryRepository, 
     ConversationRepository, 
@@ -17,6 +19,7 @@ from app.repositories.query_repository import (
 )
 from app.repositories.vector_store_repository import VectorStoreRepository, DocumentVectorRepository
 from app.models.query import Query, QueryScope, QueryStatus
+from app.models.vector_store import RetrievalMode
 from app.schemas.query import (
     QueryCreate, 
     QueryResponse, 
@@ -25,6 +28,8 @@ from app.schemas.query import (
     CitationResponse
 )
 from app.core.config import get_settings
+from app.core.embedding_cache import QueryEmbeddingCache, get_embedding_cache
+from app.core.embedding_engine import EmbeddingEngine, get_embedding_engine
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
@@ -40,10 +45,14 @@ class RAGOrchestrator:
     def __init__(
         self,
         vector_store_repo: VectorStoreRepository,
-        document_vector_repo: DocumentVectorRepository
+        document_vector_repo: DocumentVectorRepository,
+        embedding_cache: Optional[QueryEmbeddingCache] = None,
+        embedding_engine: Optional[EmbeddingEngine] = None
     ):
         self.vector_store_repo = vector_store_repo
         self.document_vector_repo = document_vector_repo
+        self.embedding_cache = embedding_cache or get_embedding_cache()
+        self.embedding_engine = embedding_engine or get_embedding_engine()
     
     async def process_query(
         self,
@@ -52,7 +61,8 @@ class RAGOrchestrator:
         tenant_id: UUID,
         scope: QueryScope,
         scope_ids: Optional[List[UUID]] = None,
-        conversation_id: Optional[UUID] = None
+        conversation_id: Optional[UUID] = None,
+        retrieval_mode: Optional[RetrievalMode] = None
     ) -> Dict[str, Any]:
         """
         Process a natural language query with RAG orchestration.
@@ -64,6 +74,7 @@ class RAGOrchestrator:
             scope: Query scope (private, project, global, multi)
             scope_ids: Project IDs for project scope
             conversation_id: Conversation context
+            retrieval_mode: Vector or hybrid retrieval; defaults to the stores' setting
         
         Returns:
             Dict containing answer, citations, and processing metadata
@@ -95,14 +106,25 @@ class RAGOrchestrator:
             
             # 3. Retrieve relevant documents
             retrieval_start = time.time()
-            similar_vectors = self.document_vector_repo.search_similar(
+            similar_vectors = await self.document_vector_repo.search_similar(
                 store_ids=store_ids,
                 query_vector=query_vector,
                 limit=settings.max_results_limit,
-                similarity_threshold=settings.similarity_threshold
+                similarity_threshold=settings.similarity_threshold,
+                query_text=query,
+                retrieval_mode=retrieval_mode
             )
             retrieval_time = time.time() - retrieval_start
             
+            # Stores that missed their search deadline leave the results partial
+            search_report = self.document_vector_repo.last_search_report
+            retrieval_report = search_report.to_dict() if search_report else {'degraded': False}
+            if retrieval_report['degraded']:
+                logger.warning(
+                    f"Partial retrieval: timed out {retrieval_report['stores_timed_out']}, "
+                    f"failed {retrieval_report['stores_failed']}"
+                )
+            
             if not similar_vectors:
                 return {
                     'answer': "I couldn't find any relevant documents to answer your question.",
@@ -111,7 +133,9 @@ class RAGOrchestrator:
                     'retrieval_time': retrieval_time,
                     'synthesis_time': 0.0,
                     'processing_time': time.time() - start_time,
-                    'vector_stores_queried': store_ids
+                    'vector_stores_queried': store_ids,
+                    'degraded': retrieval_report['degraded'],
+                    'service_responses': {'vector-store': retrieval_report}
                 }
             
             # 4. Re-rank results for better relevance
@@ -140,6 +164,8 @@ class RAGOrchestrator:
                 'processing_time': total_time,
                 'vector_stores_queried': store_ids,
                 'services_called': ['vector-store', 'llm-service'],
+                'service_responses': {'vector-store': retrieval_report},
+                'degraded': retrieval_report['degraded'],
                 'cited_documents_count': len(set(v[0].document_id for v in ranked_vectors[:10]))
             }
             
@@ -197,25 +223,17 @@ class RAGOrchestrator:
             # Global tenant store
             store_ids.append(f"global:{tenant_id}")
         
-        # Verify stores exist and are healthy
-        verified_stores = []
-        for store_id in store_ids:
-            store = self.vector_store_repo.get_by_id(store_id)
-            if store and store.is_active:
-                verified_stores.append(store_id)
-        
-        return verified_stores
+        # Verify stores exist, belong to the tenant and are active
+        return self.vector_store_repo.filter_active_store_ids(store_ids, tenant_id)
+    
+    async def _generate_query_embedding(self, query: str) -> np.ndarray:
+        """Generate embedding for the query text, served from the embedding cache when possible."""
+        return await self.embedding_cache.get_or_compute(query, self._embed_query)
     
-    async def _generate_query_embedding(self, query: str) -> List[float]:
-        """Generate embedding for the query text."""
-        # This would use sentence-transformers or OpenAI embeddings
-        # For now, return a mock embedding
+    async def _embed_query(self, query: str) -> np.ndarray:
+        """Run the embedding model on the query text."""
         logger.debug(f"Generating embedding for query: {query[:50]}...")
-        
-        # Mock embedding with 384 dimensions (sentence-transformers/all-MiniLM-L6-v2)
-        import random
-        embedding = [random.random() for _ in range(384)]
-        return embedding
+        return await self.embedding_engine.embed_one(query)
     
     async def _rerank_results(
         self, 
@@ -378,7 +396,8 @@ class QueryService:
                 tenant_id=tenant_id,
                 scope=query_data.scope,
                 scope_ids=query_data.scope_ids,
-                conversation_id=query_data.conversation_id
+                conversation_id=query_data.conversation_id,
+                retrieval_mode=query_data.retrieval_mode
             )
             
             # Update query with results
@@ -390,6 +409,7 @@ class QueryService:
             query.total_time = result.get('processing_time', 0.0)
             query.vector_stores_queried = result.get('vector_stores_queried', [])
             query.services_called = result.get('services_called', [])
+            query.service_responses = result.get('service_responses', {})
             query.cited_documents_count = result.get('cited_documents_count', 0)
             
             # Create citations
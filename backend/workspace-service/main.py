@@ -12,19 +12,20 @@ import logging
 import sys
 import os
 
-# Add the backend directory to Python path
+# Add the service and backend directories to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
 from app.core.config import get_settings
 from app.core.database import init_db, close_db, get_db
+from app.core.search_client import close_es_client
+from app.core.embedding_cache import get_embedding_cache, close_embedding_cache
+from app.core.embedding_engine import get_embedding_engine, close_embedding_engine
+from app.core.retrieval_cache import get_retrieval_cache, close_retrieval_cache
+from app.core.store_registry import get_store_registry
+from shared.utils.database_engine import get_database_metrics
 from app.api import documents, queries, dashboard, vector_stores
 from app.services import DocumentService, QueryService, RAGOrchestrator, VectorService
-from app.repositories import (
-    DocumentRepository, 
-    QueryRepository, 
-    VectorStoreRepository,
-    DocumentVectorRepository
-)
 
 # Configure logging
 logging.basicConfig(
@@ -51,6 +52,9 @@ async def lifespan(app: FastAPI):
         init_db()
         logger.info("Database initialized")
         
+        # Load the embedding model in its worker processes
+        await get_embedding_engine().start()
+        
         # Initialize vector stores and other resources
         # await initialize_vector_stores()
         
@@ -64,6 +68,10 @@ async def lifespan(app: FastAPI):
     finally:
         # Shutdown
         logger.info("Shutting down Workspace Service...")
+        await close_es_client()
+        await close_embedding_cache()
+        await close_embedding_engine()
+        await close_retrieval_cache()
         close_db()
         logger.info("Workspace Service shutdown complete")
 
@@ -129,7 +137,12 @@ async def health_check():
         "status": "healthy",
         "service": "workspace-service",
         "version": "1.0.0",
-        "timestamp": "2024-01-01T00:00:00Z"
+        "timestamp": "2024-01-01T00:00:00Z",
+        "database": get_database_metrics(),
+        "embedding_cache": get_embedding_cache().get_stats(),
+        "embedding_engine": get_embedding_engine().get_stats(),
+        "retrieval_cache": get_retrieval_cache().get_stats(),
+        "store_registry": get_store_registry().get_stats()
     }
 
 
@@ -171,18 +184,26 @@ app.include_router(
 
 # Dependency injection for services
 def get_document_service(db = Depends(get_db)) -> DocumentService:
-    """Get document service instance."""
+    """Get document service instance; its repositories share one request identity map."""
     from app.repositories.document_repository import (
         DocumentRepository, 
         DocumentVersionRepository, 
         DocumentPermissionRepository
     )
+    from shared.repositories.repository_factory import RepositoryFactory
     
-    doc_repo = DocumentRepository(db)
-    version_repo = DocumentVersionRepository(db)
-    permission_repo = DocumentPermissionRepository(db)
+    repo_factory = RepositoryFactory(db)
+    doc_repo = repo_factory.create_repository(DocumentRepository)
+    version_repo = repo_factory.create_repository(DocumentVersionRepository)
+    permission_repo = repo_factory.create_repository(DocumentPermissionRepository)
     
-    return DocumentService(db, doc_repo, version_repo, permission_repo)
+    try:
+        yield DocumentService(db, doc_repo, version_repo, permission_repo)
+    finally:
+        stats = repo_factory.get_cache_stats()
+        if stats and stats["lookups"]:
+            logger.debug(f"Repository identity map: {stats}")
+        repo_factory.close()
 
 
 def get_query_service(db = Depends(get_db)) -> QueryService:
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark approximate kNN against exact search on live vector stores.
+
+Embeds sample queries with the service's embedding engine and reports
+recall@limit and latency percentiles per num_candidates setting, to tune
+KNN_NUM_CANDIDATES_FACTOR for a deployment.
+
+Usage:
+    python scripts/benchmark_search.py --store ws:<user_id> --store global:<tenant_id> \\
+        --query "CAR-T cell therapy" --queries-file queries.txt \\
+        --limit 10 --candidates 50 --candidates 100 --candidates 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Add the service and backend directories to Python path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from app.core.embedding_engine import get_embedding_engine, close_embedding_engine
+from app.core.search_client import close_es_client
+from app.repositories.vector_store_repository import ElasticsearchRepository
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare approximate kNN with exact search on real queries")
+    parser.add_argument("--store", dest="stores", action="append", required=True,
+                        help="Vector store ID to search (repeatable)")
+    parser.add_argument("--query", dest="queries", action="append", default=[],
+                        help="Sample query text (repeatable)")
+    parser.add_argument("--queries-file", help="File with one sample query per line")
+    parser.add_argument("--limit", type=int, default=10, help="Results per query (recall@limit)")
+    parser.add_argument("--candidates", type=int, action="append",
+                        help="num_candidates setting to test (repeatable; default from KNN_NUM_CANDIDATES_FACTOR)")
+    parser.add_argument("--filters", type=json.loads, help="Metadata filters as a JSON object")
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> dict:
+    queries = list(args.queries)
+    if args.queries_file:
+        with open(args.queries_file) as f:
+            queries.extend(line.strip() for line in f if line.strip())
+    if not queries:
+        raise SystemExit("❌ Provide at least one --query or a --queries-file")
+
+    engine = get_embedding_engine()
+    try:
+        query_vectors = (await engine.embed(queries)).tolist()
+        return await ElasticsearchRepository().benchmark_search(
+            args.stores,
+            query_vectors,
+            limit=args.limit,
+            num_candidates=args.candidates,
+            filters=args.filters
+        )
+    finally:
+        await close_embedding_engine()
+        await close_es_client()
+
+
+def main():
+    report = asyncio.run(run(parse_args()))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
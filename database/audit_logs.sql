@@ -3,9 +3,9 @@ CREATE TYPE event_severity AS ENUM ('info','warning','error');
 
 CREATE TABLE audit_logs (
   id               uuid PRIMARY KEY DEFAULT gen_random_uuid(),
-  tenant_id        uuid NOT NULL REFERENCES tenants(id),
+  tenant_id        uuid REFERENCES tenants(id),  -- NULL before a tenant is known (failed logins, registrations)
   subject_type     text NOT NULL,          -- 'user','team','workspace','publication',...
-  subject_id       uuid NOT NULL,
+  subject_id       uuid,                   -- NULL for system subjects (events without a user)
   action           text NOT NULL,          -- 'created','updated','deleted','user_added',...
   event_class      event_class NOT NULL,
   severity         event_severity NOT NULL DEFAULT 'info',
@@ -30,6 +30,7 @@ CREATE INDEX audit_tenant_time_idx    ON audit_logs_2025_08 (tenant_id, occurred
 CREATE INDEX audit_subject_idx        ON audit_logs_2025_08 (subject_type, subject_id, occurred_at DESC);
 CREATE INDEX audit_team_time_idx      ON audit_logs_2025_08 (team_id, occurred_at DESC)      WHERE team_id IS NOT NULL;
 CREATE INDEX audit_workspace_time_idx ON audit_logs_2025_08 (workspace_id, occurred_at DESC) WHERE workspace_id IS NOT NULL;
+CREATE INDEX audit_no_tenant_time_idx ON audit_logs_2025_08 (occurred_at DESC)               WHERE tenant_id IS NULL;
 -- Optional ad hoc
 -- CREATE INDEX audit_payload_gin ON audit_logs_2025_08 USING GIN (payload jsonb_path_ops);
 
@@ -0,0 +1,23 @@
+-- One vector_search_indexes row per vector store.
+--
+-- The workspace service upserts fleet-wide cache hit rates with
+-- INSERT ... ON CONFLICT (vector_store_id), which needs a unique index on
+-- vector_store_id. create_all only builds it for new tables; existing
+-- databases have the plain ix_vector_search_indexes_vector_store_id index,
+-- and possibly duplicate rows written by concurrent replicas, so apply this
+-- once before deploying.
+
+BEGIN;
+
+-- Keep the most recently updated row of each store
+DELETE FROM vector_search_indexes older
+USING vector_search_indexes newer
+WHERE older.vector_store_id = newer.vector_store_id
+  AND (COALESCE(older.updated_at, older.created_at), older.id)
+    < (COALESCE(newer.updated_at, newer.created_at), newer.id);
+
+DROP INDEX IF EXISTS ix_vector_search_indexes_vector_store_id;
+CREATE UNIQUE INDEX ix_vector_search_indexes_vector_store_id
+  ON vector_search_indexes (vector_store_id);
+
+COMMIT;